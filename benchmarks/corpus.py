@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: corpus.py (Synthetic Benchmark Corpora)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Deterministic English-like texts for benchmarking, generated from templates so no data
+has to be downloaded. The same seed always gives the same corpus.
+"""
+import random
+
+NAMES = ("Lee", "Maria", "Seoul", "Paris", "Google", "the United Nations", "Pennsylvania", "Kim", "Amazon", "Tokyo")
+NOUNS = ("fisherman", "boat", "crab", "season", "water", "temperature", "student", "teacher", "book", "city",
+         "river", "market", "report", "engine", "garden", "village", "scientist", "winter", "harbor", "idea")
+VERBS = ("carried", "watched", "found", "reached", "changed", "explained", "followed", "described", "built",
+         "measured", "opened", "crossed", "studied", "sold", "moved")
+ADJECTIVES = ("small", "cold", "important", "quiet", "productive", "ancient", "difficult", "bright",
+              "seasoned", "remarkable", "narrow", "heavy")
+ADVERBS = ("silently", "quickly", "suddenly", "carefully", "finally", "rarely", "usually")
+PREPOSITIONS = ("in", "near", "across", "after", "before", "under", "during")
+CONNECTIVES = ("because", "although", "while", "when", "since")
+
+TEMPLATES = (
+    "The {adj} {noun} {verb} the {noun2} {prep} {name}.",
+    "{name} {adv} {verb} a {adj} {noun} {prep} the {noun2}.",
+    "{conn_cap} the {noun} {verb} the {noun2}, {name} {adv} {verb2} the {adj} {noun3}.",
+    "A {adj} {noun} from {name} {verb} {num} {noun2}s {prep} the {adj2} {noun3}.",
+    "It was a {adj} {noun}, and the {noun2} {verb} {adv} {prep} the {noun3}.",
+)
+
+# (name, sentences per text) of the length levels benchmarked
+LENGTHS = (("short", 3), ("medium", 20), ("long", 100))
+
+# number of texts per corpus benchmarked
+COUNTS = (10, 100, 1000)
+
+
+def make_sentence(rnd):
+    template = rnd.choice(TEMPLATES)
+    conn = rnd.choice(CONNECTIVES)
+    return template.format(
+        adj=rnd.choice(ADJECTIVES), adj2=rnd.choice(ADJECTIVES),
+        noun=rnd.choice(NOUNS), noun2=rnd.choice(NOUNS), noun3=rnd.choice(NOUNS),
+        verb=rnd.choice(VERBS), verb2=rnd.choice(VERBS),
+        adv=rnd.choice(ADVERBS), prep=rnd.choice(PREPOSITIONS), name=rnd.choice(NAMES),
+        conn_cap=conn[0].upper() + conn[1:], num=rnd.randint(2, 40))
+
+
+def make_text(n_sent, seed=0):
+    rnd = random.Random(seed)
+    return " ".join(make_sentence(rnd) for i in range(n_sent))
+
+
+def make_corpus(n_docs, n_sent, seed=0):
+    """n_docs texts of n_sent sentences each."""
+    return [make_text(n_sent, seed=seed * 1000003 + i) for i in range(n_docs)]
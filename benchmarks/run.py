@@ -0,0 +1,166 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: run.py (Benchmark Suite)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+usage:
+    python benchmarks/run.py [--quick] [--groups TraF,POSF] [--workers 4] [--out bench-results.json]
+
+Runs on CPU only and offline, over the synthetic corpora of benchmarks/corpus.py:
+- single: per-stage and per-subgroup latency of pass_text, one text at a time
+- end_to_end: extractor.extract, one text at a time
+- batch: extractor.extract_many, docs/sec for each corpus size
+- parallel: parallel.extract, docs/sec for each corpus size (worker start-up included)
+Subgroups whose models cannot be loaded here (e.g. SuPar needs a download) are skipped
+and listed with the reason. Results are written as JSON.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+
+# run from a checkout without installing
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import corpus
+import lingfeat
+from lingfeat import extractor, parallel, schema
+
+
+def summarize(seconds):
+    ordered = sorted(seconds)
+    return {
+        "mean": 1000 * statistics.mean(ordered),
+        "median": 1000 * statistics.median(ordered),
+        "p95": 1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "n": len(ordered),
+    }
+
+
+def available_groups(groups):
+    """(subgroups that run here, subgroup -> reason skipped, subgroup -> seconds to load its models)"""
+    runnable, skipped, load_seconds = [], {}, {}
+    probe = corpus.make_text(3, seed=7)
+    for group in groups:
+        start = time.perf_counter()
+        try:
+            extractor.warmup([group])
+            extractor.extract(probe, groups=[group])
+        except Exception as e:
+            skipped[group] = "{}: {}".format(type(e).__name__, e)
+            continue
+        load_seconds[group] = time.perf_counter() - start
+        runnable.append(group)
+    return runnable, skipped, load_seconds
+
+
+def bench_single(groups, texts):
+    """Latency of each stage and subgroup method of pass_text over texts."""
+    timings = {}
+    def timed(name, function):
+        start = time.perf_counter()
+        function()
+        timings.setdefault(name, []).append(time.perf_counter() - start)
+
+    parses = "PhrF" in groups or "TrSF" in groups
+    for text in texts:
+        start = time.perf_counter()
+        LingFeat = extractor.pass_text(text)
+        timings.setdefault("spacy", []).append(time.perf_counter() - start)
+        timed("scan", LingFeat.scan)
+        timed("preprocess", LingFeat.preprocess)
+        if parses:
+            timed("supar", LingFeat.parse)
+        for group in groups:
+            timed(group, getattr(LingFeat, group + "_"))
+    return {name: summarize(seconds) for name, seconds in timings.items()}
+
+
+def bench_end_to_end(groups, texts):
+    seconds = []
+    for text in texts:
+        start = time.perf_counter()
+        extractor.extract(text, groups=groups)
+        seconds.append(time.perf_counter() - start)
+    return summarize(seconds)
+
+
+def throughput(function, n_docs):
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    return {"n_docs": n_docs, "seconds": seconds, "docs_per_sec": n_docs / seconds if seconds else None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LingFeat benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="small corpora only, for a smoke run")
+    parser.add_argument("--groups", help="comma separated subgroups (default: all)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="worker processes for the parallel path, 0 to skip it (default: up to 4)")
+    parser.add_argument("--single-docs", type=int, default=10, help="texts per length on the single-text paths (default: 10)")
+    parser.add_argument("--out", default="bench-results.json", help="JSON results file (default: bench-results.json)")
+    args = parser.parse_args(argv)
+
+    groups = args.groups.split(",") if args.groups else list(schema.FEATURE_GROUPS)
+    lengths = corpus.LENGTHS[:2] if args.quick else corpus.LENGTHS
+    counts = corpus.COUNTS[:2] if args.quick else corpus.COUNTS
+
+    report = {
+        "lingfeat_version": lingfeat.__version__,
+        "schema_version": schema.SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {"quick": args.quick, "workers": args.workers, "single_docs": args.single_docs,
+                   "lengths": dict(lengths), "counts": list(counts)},
+        "single": [], "end_to_end": [], "batch": [], "parallel": [],
+    }
+
+    groups, report["skipped"], report["model_load_seconds"] = available_groups(groups)
+    report["groups"] = groups
+    for group, reason in report["skipped"].items():
+        print("skipped {}: {}".format(group, reason))
+    if not groups:
+        print("no subgroup can run here")
+
+    for length, n_sent in lengths:
+        if not groups:
+            break
+        texts = corpus.make_corpus(args.single_docs, n_sent, seed=1)
+        for name, latency in bench_single(groups, texts).items():
+            report["single"].append({"length": length, "n_sent": n_sent, "stage": name, "latency_ms": latency})
+            print("single     {:7} {:10} median {:9.2f} ms".format(length, name, latency["median"]))
+        latency = bench_end_to_end(groups, texts)
+        report["end_to_end"].append({"length": length, "n_sent": n_sent, "latency_ms": latency})
+        print("end_to_end {:7} {:10} median {:9.2f} ms".format(length, "all", latency["median"]))
+
+        for n_docs in counts:
+            texts = corpus.make_corpus(n_docs, n_sent, seed=2)
+            result = throughput(lambda: extractor.extract_many(texts, groups=groups), n_docs)
+            report["batch"].append(dict(result, length=length, n_sent=n_sent))
+            print("batch      {:7} {:5} texts {:9.2f} docs/sec".format(length, n_docs, result["docs_per_sec"]))
+            if args.workers > 0 and n_docs >= 100:
+                result = throughput(
+                    lambda: list(parallel.extract(texts, groups=groups, n_workers=args.workers)), n_docs)
+                report["parallel"].append(dict(result, length=length, n_sent=n_sent, workers=args.workers))
+                print("parallel   {:7} {:5} texts {:9.2f} docs/sec".format(length, n_docs, result["docs_per_sec"]))
+
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print("results written to {}".format(args.out))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ Contributing Author: -
 Affiliation : -
 """
 
-import gensim
+from lingfeat._AdvancedSemantic import topics
 from lingfeat.utils import division
 
 def richness(probability_list):
@@ -44,34 +44,22 @@ def noise(probability_list):
     return result
 
 
-def get_probability_lists(token_list, dir_path):
-    n_topic_list = [50, 100, 150, 200]
+# tokens are looked up in each model's own dictionary, see topics.py
+def get_probability_lists(token_list):
+    return topics.probability_lists("onestop", [token_list])[0]
 
-    # lda_list is a list of Gensim lda objects
-    lda_list = []
 
-    # probability_lists is a list of list. 
-    # [[probability list at topic 50],[probability list at topic 100],[probability list at topic 150],[probability list at topic 200]]
-    probability_lists = []
+def retrieve(token_list):
+    return from_probability_lists(get_probability_lists(token_list))
 
-    common_dictionary = gensim.corpora.dictionary.Dictionary([token_list])
-    common_corpus = [common_dictionary.doc2bow(token_list)]
 
-    for n_topic in n_topic_list:
-        lda_list.append(gensim.models.ldamodel.LdaModel.load(dir_path+"/_AdvancedSemantic/model/onestop" + str(n_topic)))
+# every model infers the topics of all token lists in one call
+def retrieve_many(token_lists):
+    return [from_probability_lists(probability_lists) for probability_lists in topics.probability_lists("onestop", token_lists)]
 
-    probability_list = []
-    for lda in lda_list:
-        for topic_probability in lda.get_document_topics(common_corpus)[0]:
-            probability_list.append(topic_probability[1])
-            probability_list = sorted(probability_list, reverse=True)
-        probability_lists.append(probability_list)
-    return probability_lists
 
-
-def retrieve(token_list, dir_path):
+def from_probability_lists(probability_lists):
     n_topic_list_for_naming = ["05", "10", "15", "20"]
-    probability_lists = get_probability_lists(token_list, dir_path)
 
     # obtain each feature list
     richness_list = []
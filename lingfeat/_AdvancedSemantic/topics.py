@@ -0,0 +1,90 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: topics.py (Topic Inference)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Topic inference shared by WoKF, WBKF and OSKF. Tokens are looked up in each LDA model's own
+dictionary, and each model infers the topics of a whole batch of documents in one call.
+"""
+from collections import Counter
+
+from lingfeat import models
+
+
+"""
+Bag of words of a document in the ids of an LDA model's dictionary
+
+input :
+- lda: gensim LdaModel
+- document: token list, or token -> count mapping
+** tokens the model has never seen are left out
+
+output (type -> list):
+- (token id, count) pairs
+"""
+def bag_of_words(lda, document):
+    token2id = lda.id2word.token2id
+    counts = document if isinstance(document, dict) else Counter(document)
+    return [(token2id[token], count) for token, count in counts.items() if token in token2id]
+
+
+"""
+Topic distribution of each document under one LDA model
+
+input :
+- lda: gensim LdaModel
+- documents: token lists, or token -> count mappings
+
+output (type -> numpy array):
+- documents x topics, each row sums to 1
+"""
+def topic_distributions(lda, documents):
+    import numpy as np
+    if not documents:
+        return np.zeros((0, lda.num_topics))
+    gamma, _ = lda.inference([bag_of_words(lda, document) for document in documents])
+    return gamma / gamma.sum(axis=1, keepdims=True)
+
+
+"""
+Topic distributions of documents under every LDA model of a corpus
+
+input :
+- corpus: "enwiki", "weebit" or "onestop"
+- documents: token lists, or token -> count mappings
+
+output (type -> dictionary):
+- number of topics -> documents x topics array, for each of models.LDA_N_TOPICS
+"""
+def distributions(corpus, documents):
+    # loaded once per process and shared, see lingfeat/models.py
+    return {n_topic: topic_distributions(models.get(models.lda_name(corpus, n_topic)), documents)
+            for n_topic in models.LDA_N_TOPICS}
+
+
+"""
+Probabilities of the topics of each document, as get_document_topics keeps them
+
+input :
+- corpus: "enwiki", "weebit" or "onestop"
+- documents: token lists, or token -> count mappings
+
+output (type -> list):
+- for each document, one list per model in models.LDA_N_TOPICS order, probabilities
+  of at least the model's minimum_probability, largest first
+"""
+def probability_lists(corpus, documents):
+    results = [[] for document in documents]
+    for n_topic, array in distributions(corpus, documents).items():
+        lda = models.get(models.lda_name(corpus, n_topic))
+        minimum = max(lda.minimum_probability, 1e-8)
+        for result, distribution in zip(results, array):
+            result.append(sorted(distribution[distribution >= minimum].tolist(), reverse=True))
+    return results
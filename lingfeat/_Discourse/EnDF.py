@@ -15,21 +15,22 @@ References:
 Publication 1: Feng, Lijun, Noémie Elhadad, and Matt Huenerfauth. "Cognitively motivated features for readability assessment." Proceedings of the 12th Conference of the European Chapter of the ACL (EACL 2009). 2009.
 """
 
-def retrieve(NLP_doc, n_sent, n_token):
-        to_EntiM_C = 0
-        to_UEnti_C = 0
-        ent_list = []
-        unique_ent_list = []
+from collections import Counter
 
-        for ent in NLP_doc.ents:
-            to_EntiM_C += 1
-            ent_list.append(ent.text)
+def retrieve(doc_scan, n_sent, n_token):
+        to_UEnti_C = 0
+        ent_list = doc_scan.ent_texts
+        to_EntiM_C = len(ent_list)
         
-        for ent in ent_list:
-            if ent_list.count(ent) == 1:
+        # entities mentioned exactly once
+        for count in Counter(ent_list).values():
+            if count == 1:
                 to_UEnti_C += 1
-                unique_ent_list.append(ent)
+        return from_counts(to_EntiM_C, to_UEnti_C, n_sent, n_token)
+
 
+def from_counts(to_EntiM_C, to_UEnti_C, n_sent, n_token):
+        # entity mentions, entities mentioned exactly once
         result = {
             "to_EntiM_C": to_EntiM_C, 
             "as_EntiM_C": to_EntiM_C/n_sent, 
@@ -29,15 +29,19 @@ Publication 1: Barzilay, Regina, and Mirella Lapata. "Modeling local coherence:
 Publication 1: Guinaudeau, Camille, and Michael Strube. "Graph-based local coherence modeling." Proceedings of the 51st Annual Meeting of the Association for Computational Linguistics (Volume 1: Long Papers). 2013.
 """
 
-from lingfeat.utils import division
+# documents with at least this many sentences get sparse coherence matrices
+SPARSE_MIN_SENT = 200
 
-NOUNS = set(['NOUN', 'PRON', 'PROPN'])
 
 ordered_transitions = [
     'SS', 'SO', 'SX', 'S-', 'OS', 'OO', 'OX', 'O-', 'XS', 'XO',
     'XX', 'X-', '-S', '-O', '-X', '--'
 ]
 
+# role codes of the entity grid matrix, which are also the syntactic weights of the PA projection
+ROLE_CODES = {'-': 0, 'X': 1, 'O': 2, 'S': 3}
+ROLE_TAGS = ['-', 'X', 'O', 'S']
+
 def dependency_mapping(dep):
     """
     +-----------+-----------------------------------+
@@ -59,80 +63,110 @@ def dependency_mapping(dep):
     return 'X'
 
 
+def transition_probabilities(transition_counts, total_transitions):
+    """Transition ('SS', 'SO', ...) -> share of all transitions, from the 16 counts indexed first * 4 + second."""
+    entity_features = {}
+    for first in range(4):
+        for second in range(4):
+            count = int(transition_counts[first * 4 + second])
+            if total_transitions != 0:
+                entity_features[ROLE_TAGS[first] + ROLE_TAGS[second]] = count / float(total_transitions)
+            else:
+                entity_features[ROLE_TAGS[first] + ROLE_TAGS[second]] = 0.0
+    return entity_features
+
+
 class EntityGrid:
 
-    def __init__(self, NLP_doc, n_sent):
+    def __init__(self, doc_scan, n_sent):
         """Construct EntityGrid object."""
+        import numpy as np
+
         # Initialization
-        entity_map = dict()
-        entity_grid = dict()
-        i = 1
-        entity_map['s%d' % i] = []
-        entity_features = {
-            'SS': 0,
-            'SO': 0,
-            'SX': 0,
-            'S-': 0,
-            'OS': 0,
-            'OO': 0,
-            'OX': 0,
-            'O-': 0,
-            'XS': 0,
-            'XO': 0,
-            'XX': 0,
-            'X-': 0,
-            '-S': 0,
-            '-O': 0,
-            '-X': 0,
-            '--': 0
-        }
-
-        # For each sentence, get dependencies and its grammatical role
-        for token in NLP_doc:
-            if token.pos_ in NOUNS:
-                entity_map['s%d' % i].append((token.text.upper(),
-                                                token.dep_))
-                if token.text.upper() not in entity_grid:
-                    entity_grid[token.text.upper()] = ['-'] * n_sent
-            i += 1
-            entity_map['s%d' % i] = []
-
-        # Last iteration will create an extra element, so I remove it.
-        entity_map.pop('s%d' % i)
-
-        # Fill entity grid
-        for i in range(n_sent):
-            sentence = "s%d" % (i + 1)
-            for entity, dep in entity_map[sentence]:
-                if entity_grid[entity][i] == '-':
-                    entity_grid[entity][i] = dependency_mapping(dep)
-                elif dependency_mapping(dep) == 'S':
-                    entity_grid[entity][i] = dependency_mapping(dep)
-                elif (dependency_mapping(dep) == 'O'
-                      and entity_grid[entity][i] == 'X'):
-                    entity_grid[entity][i] = dependency_mapping(dep)
+        entity_index = dict()
+        cells = []
+
+        # For each noun-like token, get its grammatical role
+        # ** grid column i holds the role of token i, as in TRUNAJOD's token-wise map,
+        # so only tokens before index n_sent fill a cell
+        for i, entity, dep in doc_scan.noun_roles:
+            if entity not in entity_index:
+                entity_index[entity] = len(entity_index)
+            if i < n_sent:
+                cells.append((entity_index[entity], i, ROLE_CODES[dependency_mapping(dep)]))
+
+        # entities x sentences matrix of role codes
+        roles = np.zeros((len(entity_index), n_sent), dtype=np.int8)
+        if cells:
+            rows, columns, codes = zip(*cells)
+            roles[list(rows), list(columns)] = codes
 
         # Compute feature vector, we consider transitions of length 2
-        total_transitions = (n_sent - 1) * len(entity_grid.keys())
-
-        for entity in entity_grid:
-            for i in range(n_sent - 1):
-                # Transition type found (e.g. S-)
-                transition = (
-                    entity_grid[entity][i] + entity_grid[entity][i + 1])
+        total_transitions = (n_sent - 1) * len(entity_index)
+        transitions = roles[:, :-1].astype(np.intp) * 4 + roles[:, 1:]
+        transition_counts = np.bincount(transitions.ravel(), minlength=16)
 
-                # Adding 1 to transition count
-                entity_features[transition] += 1
+        self.entities = list(entity_index)
+        self.roles = roles
+        self.n_sent = n_sent
+        self.prob = transition_probabilities(transition_counts, total_transitions)
 
-        for prob in entity_features:
-            if total_transitions != 0:
-                entity_features[prob] /= float(total_transitions)
-            else:
-                entity_features[prob] = 0.0
+    @classmethod
+    def from_cells(cls, n_entity, cells, n_sent):
+        """
+        Entity grid from its non-empty cells only, for a text read in chunks
+        ** rows without any cell hold only '--' transitions: they are counted, not stored,
+        and from SPARSE_MIN_SENT sentences on the rows that are stored are a sparse matrix
 
-        self.grid = entity_grid
-        self.n_sent = n_sent
-        self.prob = entity_features
+        input :
+        - n_entity: number of distinct entities in the whole text
+        - cells: (entity, column, role code) of each noun-like token whose column is under n_sent
+        """
+        import numpy as np
+
+        row_of = {}
+        code_at = {}
+        for entity, column, code in cells:
+            row = row_of.setdefault(entity, len(row_of))
+            code_at[(row, column)] = code
+
+        # transitions into every non-empty cell and out of it into an empty one, the rest are '--'
+        transition_counts = np.zeros(16, dtype=np.int64)
+        for (row, column), code in code_at.items():
+            if column >= 1:
+                transition_counts[code_at.get((row, column - 1), 0) * 4 + code] += 1
+            if column + 1 < n_sent and (row, column + 1) not in code_at:
+                transition_counts[code * 4] += 1
+        total_transitions = (n_sent - 1) * n_entity
+        transition_counts[0] = total_transitions - transition_counts[1:].sum()
+
+        shape = (len(row_of), n_sent)
+        if code_at:
+            rows, columns = zip(*code_at)
+            codes = list(code_at.values())
+        else:
+            rows, columns, codes = (), (), ()
+        if n_sent >= SPARSE_MIN_SENT:
+            from scipy import sparse
+            roles = sparse.csr_matrix((np.array(codes, dtype=np.int8), (rows, columns)), shape=shape)
+        else:
+            roles = np.zeros(shape, dtype=np.int8)
+            if code_at:
+                roles[list(rows), list(columns)] = codes
+
+        grid = cls.__new__(cls)
+        grid.entities = [entity for entity, row in sorted(row_of.items(), key=lambda item: item[1])]
+        grid.roles = roles
+        grid.n_sent = n_sent
+        grid.prob = transition_probabilities(transition_counts, total_transitions)
+        return grid
+
+    @property
+    def grid(self):
+        """Entity -> list of role tags per sentence"""
+        return {
+            entity: [ROLE_TAGS[code] for code in row]
+            for entity, row in zip(self.entities, self.roles.tolist())}
 
     def retrieve(self):
         """
@@ -183,59 +217,27 @@ def weighting_syntactic_role(entity_role):
     return 0
 
 def get_local_coherence(EntityGrid):
-    local_coherence_PU = 0.0        #lcPA
-    local_coherence_PW = 0.0        #lcPW
-    local_coherence_PA = 0.0        #lcPU
-    local_coherence_PU_dist = 0.0   #lcdPA
-    local_coherence_PW_dist = 0.0   #lcdPW
-    local_coherence_PA_dist = 0.0   #lcdPU
-
+    """
+    Local coherence from the one-mode projections of the entity graph
+    ** PW counts entities shared by two sentences, PU marks whether any is shared,
+    PA (W) sums the products of their syntactic weights; only pairs i < j count
+    """
     n_sent = EntityGrid.n_sent
-    grid = EntityGrid.grid
-
-    PW = [[0] * n_sent for i in range(n_sent)]
-
-    # Weight Matrix for PACC, syntactic information is accounted for by
-    # integrating the edges of the bipartite graph
-    W = [[0] * n_sent for i in range(n_sent)]
-
-    for entity in grid:
-        for i in range(n_sent):
-            for j in range(i + 1, n_sent):
-                if grid[entity][i] != u"-" and grid[entity][j] != u"-":
-                    PW[i][j] += 1
-                    W[i][j] += (weighting_syntactic_role(grid[entity][i]) *
-                                weighting_syntactic_role(grid[entity][j]))
-
-    PU = [list(map(lambda x: x != 0, PWi)) for PWi in PW]
-
-    for i in range(n_sent):
-        local_coherence_PW += sum(PW[i])
-        local_coherence_PU += sum(PU[i])
-        local_coherence_PA += sum(W[i])
-
-    local_coherence_PW /= n_sent
-    local_coherence_PU /= n_sent
-    local_coherence_PA /= n_sent
-
-    # Weighting projection graphs
-    PU_weighted = list(PU)
-    PW_weighted = list(PW)
-    PA_weighted = list(W)
-    for i in range(n_sent):
-        for j in range(i + 1, n_sent):
-            PU_weighted[i][j] = division(PU[i][j],float(j - i))
-            PW_weighted[i][j] = division(PW[i][j],float(j - i))
-            PA_weighted[i][j] = division(W[i][j],float(j - i))
-
-    for i in range(n_sent):
-        local_coherence_PW_dist += sum(PW_weighted[i])
-        local_coherence_PU_dist += sum(PU_weighted[i])
-        local_coherence_PA_dist += sum(PA_weighted[i])
-
-    local_coherence_PW_dist /= n_sent
-    local_coherence_PU_dist /= n_sent
-    local_coherence_PA_dist /= n_sent
+    roles = EntityGrid.roles
+
+    if n_sent >= SPARSE_MIN_SENT:
+        PW, W, distance = upper_projections_sparse(roles)
+    else:
+        PW, W, distance = upper_projections_dense(roles)
+
+    local_coherence_PW = float(PW.sum()) / n_sent
+    local_coherence_PU = float((PW != 0).sum()) / n_sent
+    local_coherence_PA = float(W.sum()) / n_sent
+
+    # Weighting projection graphs by sentence distance
+    local_coherence_PW_dist = float((PW / distance).sum()) / n_sent
+    local_coherence_PU_dist = float(((PW != 0) / distance).sum()) / n_sent
+    local_coherence_PA_dist = float((W / distance).sum()) / n_sent
 
     result = {
         'LoCohPA_S':local_coherence_PU,        
@@ -245,4 +247,34 @@ def get_local_coherence(EntityGrid):
         'LoCoDPW_S':local_coherence_PW_dist,
         'LoCoDPU_S':local_coherence_PA_dist,
     }
-    return result
\ No newline at end of file
+    return result
+
+def upper_projections_dense(roles):
+    """
+    PW and W entries above the diagonal, with the distance j - i of each entry
+    """
+    import numpy as np
+
+    presence = (roles != 0).astype(np.int64)
+    weights = roles.astype(np.int64)
+    rows, columns = np.triu_indices(roles.shape[1], k=1)
+    PW = (presence.T @ presence)[rows, columns]
+    W = (weights.T @ weights)[rows, columns]
+    return PW, W, (columns - rows)
+
+def upper_projections_sparse(roles):
+    """
+    Same as upper_projections_dense, but only the non-zero entries, for long documents
+    """
+    import numpy as np
+    from scipy import sparse
+
+    presence = sparse.csr_matrix((roles != 0).astype(np.int64))
+    weights = sparse.csr_matrix(roles.astype(np.int64))
+    PW = sparse.triu(presence.T @ presence, k=1).tocsr()
+    W = sparse.triu(weights.T @ weights, k=1).tocsr()
+    PW.sort_indices()
+    W.sort_indices()
+    # W is non-zero exactly where PW is, so in canonical order their data line up
+    PW = PW.tocoo()
+    return PW.data, W.data, (PW.col - PW.row)
@@ -17,27 +17,25 @@ Publication 1: Kuperman, Victor, Hans Stadthagen-Gonzalez, and Marc Brysbaert. "
 Publication 2: Vajjala, Sowmya, and Detmar Meurers. "Readability-based sentence ranking for evaluating text simplification." (2015).
 """
 
-import pandas as pd
-
-def retrieve(token_list, n_token, n_sent, dir_path):
-    to_AAKuW_C = 0
-    to_AAKuL_C = 0
-    to_AABiL_C = 0
-    to_AABrL_C = 0
-    to_AACoL_C = 0
-
-    DB = pd.read_csv(dir_path+'/_LexicoSemantic/resources/AoAKuperman.csv')
-    DB.set_index('Word', inplace=True, drop=True)
-    for token in token_list:
-        if token in DB.index:
-            scores_for_this_token = list(DB.loc[token, :])
-            for i, score in enumerate(scores_for_this_token):
-                scores_for_this_token[i] = 0 if str(score) == 'none' else scores_for_this_token[i]
-            to_AAKuW_C += float(scores_for_this_token[7])
-            to_AAKuL_C += float(scores_for_this_token[9])
-            to_AABiL_C += float(scores_for_this_token[11])
-            to_AABrL_C += float(scores_for_this_token[12])
-            to_AACoL_C += float(scores_for_this_token[13])
+from lingfeat import models
+
+def retrieve(token_list, n_token, n_sent):
+    return retrieve_many([token_list], [n_token], [n_sent])[0]
+
+
+def retrieve_many(token_lists, n_tokens, n_sents):
+    # parsed once per process, see lingfeat/models.py
+    DB = models.get("lexicon/aoakuperman")
+    totals = DB.sum_scores(token_lists)
+
+    results = []
+    for scores, n_token, n_sent in zip(totals.tolist(), n_tokens, n_sents):
+        results.append(from_totals(scores, n_token, n_sent))
+    return results
+
+
+def from_totals(scores, n_token, n_sent):
+    to_AAKuW_C, to_AAKuL_C, to_AABiL_C, to_AABrL_C, to_AACoL_C = scores
 
     result = {
         "to_AAKuW_C": to_AAKuW_C,
@@ -16,18 +16,48 @@ References:
 Publication 1: Malvern, David, and Brian Richards. "Measures of lexical richness." The encyclopedia of applied linguistics (2012).
 """
 import math
+from collections import Counter
 from lingfeat.utils import division
     
+# MTLD counts positions from where the running type-token ratio reaches this
+default_MTLD = 0.72
+
 def retrieve(n_token,token_list):
     n_utoken = 1
-    default_MTLD = 0.72
     MTLD_count = 0
+    # count every token once up front, then stream through the list a single time
+    token_counts = Counter(token_list)
     for token in token_list:
-        if token_list.count(token) == 1:
+        if token_counts[token] == 1:
             n_utoken += 1
-        if float(n_utoken/n_token) >= 0.72:
+        if float(n_utoken/n_token) >= default_MTLD:
             MTLD_count += 1
+    return from_totals(n_token, n_utoken, MTLD_count)
+
+
+def from_once(n_token, n_position, once_positions):
+    """
+    Same as retrieve, from where the tokens occurring once are instead of the token list
+    ** the running ratio only grows, so MTLD counts every position from where it first reaches default_MTLD
+
+    input :
+    - n_position: length of token_list
+    - once_positions: sorted positions in token_list of the tokens occurring exactly once
+    """
+    n_utoken = 1
+    MTLD_count = 0
+    if float(n_utoken/n_token) >= default_MTLD:
+        MTLD_count = n_position
+    else:
+        for position in once_positions:
+            n_utoken += 1
+            if float(n_utoken/n_token) >= default_MTLD:
+                MTLD_count = n_position - position
+                break
+    return from_totals(n_token, 1 + len(once_positions), MTLD_count)
+
 
+def from_totals(n_token, n_utoken, MTLD_count):
     result={
         "SimpTTR_S":float(n_utoken/n_token),
         "CorrTTR_S":float(n_utoken/math.sqrt(2*n_token)),
@@ -35,4 +65,4 @@ def retrieve(n_token,token_list):
         "UberTTR_S":float(division(((math.log(n_utoken))**2),(math.log(n_token/n_utoken)))),
         "MTLDTTR_S":float(MTLD_count)
     }
-    return result
\ No newline at end of file
+    return result
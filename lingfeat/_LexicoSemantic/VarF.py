@@ -19,50 +19,42 @@ Publication 2: Vajjala, Sowmya, and Detmar Meurers. "On improving the accuracy o
 import math
 from lingfeat.utils import division
 
-def retrieve(NLP_doc):
-    noun_list = []
-    verb_list = []
-    adje_list = []
-    adve_list = []
-    n_unoun = 0
-    n_uverb = 0
-    n_uadje = 0
-    n_uadve = 0
-    for token in NLP_doc:
-        if token.pos_ == "NOUN":
-            noun_list.append(token.lemma)
-        if token.pos_ == "VERB":
-            verb_list.append(token.lemma)
-        if token.pos_ == "ADJ":
-            adje_list.append(token.lemma)
-        if token.pos_ == "ADV":
-            adve_list.append(token.lemma)
-    for noun in noun_list:
-        if noun_list.count(noun) == 1:
-            n_unoun += 1
-    for verb in verb_list:
-        if verb_list.count(verb) == 1:
-            n_uverb += 1
-    for adje in adje_list:
-        if adje_list.count(adje) == 1:
-            n_uadje += 1
-    for adve in adve_list:
-        if adve_list.count(adve) == 1:
-            n_uadve += 1
+def count_once(lemma_array):
+    # number of lemmas that occur exactly once
+    import numpy as np
+    counts = np.unique(lemma_array, return_counts=True)[1]
+    return int(np.count_nonzero(counts == 1))
+
+def retrieve(doc_scan):
+    once = {tag: count_once(lemmas) for tag, lemmas in doc_scan.lemmas_by_pos.items()}
+    total = {tag: len(lemmas) for tag, lemmas in doc_scan.lemmas_by_pos.items()}
+    return from_counts(once, total)
+
+
+def from_counts(once, total):
+    # once: tag -> number of lemmas occurring exactly once, total: tag -> number of lemmas
+    n_unoun = once["NOUN"]
+    n_uverb = once["VERB"]
+    n_uadje = once["ADJ"]
+    n_uadve = once["ADV"]
+    n_noun = total["NOUN"]
+    n_verb = total["VERB"]
+    n_adje = total["ADJ"]
+    n_adve = total["ADV"]
     
     result = {
-        "SimpNoV_S":float(division(n_unoun,(len(noun_list)))),
-        "SquaNoV_S":float(division((n_unoun)**2,(len(noun_list)))),
-        "CorrNoV_S":float(division(n_unoun,(math.sqrt(2*len(noun_list))))),
-        "SimpVeV_S":float(division(n_uverb,(len(verb_list)))),
-        "SquaVeV_S":float(division((n_uverb)**2,(len(verb_list)))),
-        "CorrVeV_S":float(division(n_uverb,(math.sqrt(2*len(verb_list))))),
-        "SimpAjV_S":float(division(n_uadje,(len(adje_list)))),
-        "SquaAjV_S":float(division((n_uadje)**2,(len(adje_list)))),
-        "CorrAjV_S":float(division(n_uadje,(math.sqrt(2*len(adje_list))))),
-        "SimpAvV_S":float(division(n_uadve,(len(adve_list)))),
-        "SquaAvV_S":float(division((n_uadve)**2,(len(adve_list)))),
-        "CorrAvV_S":float(division(n_uadve,(math.sqrt(2*len(adve_list))))),
+        "SimpNoV_S":float(division(n_unoun,n_noun)),
+        "SquaNoV_S":float(division((n_unoun)**2,n_noun)),
+        "CorrNoV_S":float(division(n_unoun,(math.sqrt(2*n_noun)))),
+        "SimpVeV_S":float(division(n_uverb,n_verb)),
+        "SquaVeV_S":float(division((n_uverb)**2,n_verb)),
+        "CorrVeV_S":float(division(n_uverb,(math.sqrt(2*n_verb)))),
+        "SimpAjV_S":float(division(n_uadje,n_adje)),
+        "SquaAjV_S":float(division((n_uadje)**2,n_adje)),
+        "CorrAjV_S":float(division(n_uadje,(math.sqrt(2*n_adje)))),
+        "SimpAvV_S":float(division(n_uadve,n_adve)),
+        "SquaAvV_S":float(division((n_uadve)**2,n_adve)),
+        "CorrAvV_S":float(division(n_uadve,(math.sqrt(2*n_adve)))),
     }
 
     return result
\ No newline at end of file
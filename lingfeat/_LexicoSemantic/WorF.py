@@ -16,33 +16,25 @@ References:
 Publication 1: Vajjala, Sowmya, and Detmar Meurers. "Readability-based sentence ranking for evaluating text simplification." (2015).
 """
 
-import pandas as pd
+from lingfeat import models
 
-def retrieve(token_list, n_token, n_sent, dir_path):
-    to_SbFrQ_C = 0
-    to_SbCDC_C = 0
-    to_SbFrL_C = 0
-    to_SbCDL_C = 0
-    to_SbSBW_C = 0
-    to_SbL1W_C = 0
-    to_SbSBC_C = 0
-    to_SbL1C_C = 0
+def retrieve(token_list, n_token, n_sent):
+    return retrieve_many([token_list], [n_token], [n_sent])[0]
 
-    DB = pd.read_csv(dir_path+'/_LexicoSemantic/resources/SUBTLEXus.csv')
-    DB.set_index('Word_lowercased', inplace=True, drop=True)
-    for token in token_list:
-        if token in DB.index:
-            scores_for_this_token = list(DB.loc[token, :])
-            for i, score in enumerate(scores_for_this_token):
-                scores_for_this_token[i] = 0 if str(score) == 'none' else scores_for_this_token[i]
-            to_SbFrQ_C += float(scores_for_this_token[1])
-            to_SbCDC_C += float(scores_for_this_token[2])
-            to_SbFrL_C += float(scores_for_this_token[3])
-            to_SbCDL_C += float(scores_for_this_token[4])
-            to_SbSBW_C += float(scores_for_this_token[5])
-            to_SbL1W_C += float(scores_for_this_token[6])
-            to_SbSBC_C += float(scores_for_this_token[7])
-            to_SbL1C_C += float(scores_for_this_token[8])
+
+def retrieve_many(token_lists, n_tokens, n_sents):
+    # parsed once per process, see lingfeat/models.py
+    DB = models.get("lexicon/subtlexus")
+    totals = DB.sum_scores(token_lists)
+
+    results = []
+    for scores, n_token, n_sent in zip(totals.tolist(), n_tokens, n_sents):
+        results.append(from_totals(scores, n_token, n_sent))
+    return results
+
+
+def from_totals(scores, n_token, n_sent):
+    to_SbFrQ_C, to_SbCDC_C, to_SbFrL_C, to_SbCDL_C, to_SbSBW_C, to_SbL1W_C, to_SbSBC_C, to_SbL1C_C = scores
 
     result = {
         "to_SbFrQ_C": to_SbFrQ_C,
@@ -0,0 +1,95 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: lexicon.py (Word Score Lexicons shared by WorF and PsyF)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import csv
+
+
+def to_score(value):
+    # 'none' marks a missing score in the resources and counts as 0, anything else unreadable is NaN
+    if value == 'none':
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
+class Lexicon:
+    """
+    Token -> score row lookup, parsed once from a resource CSV
+    ** scores are held in one float matrix so a whole batch of documents is scored with NumPy
+
+    input :
+    - path: CSV file with a header row
+    - index_column: name of the column holding the token
+    - score_positions: positions of the score columns to keep, counted among the columns other than index_column
+    """
+    def __init__(self, path, index_column, score_positions):
+        import numpy as np
+
+        self.index = {}
+        rows = []
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            index = header.index(index_column)
+            # shift positions past the index column, which is not counted
+            columns = [p if p < index else p + 1 for p in score_positions]
+            for line in reader:
+                token = line[index]
+                # first row wins when a token is listed twice
+                if token not in self.index:
+                    self.index[token] = len(rows)
+                    rows.append([to_score(line[c]) for c in columns])
+
+        # unlisted tokens point at the extra all-zero last row
+        self.unknown = len(rows)
+        rows.append([0.0] * len(columns))
+        self.scores = np.array(rows, dtype=np.float64)
+
+    def __contains__(self, token):
+        return token in self.index
+
+    def __len__(self):
+        return self.unknown
+
+    def get(self, token):
+        """Return the score row of token, None if the token is not listed."""
+        row = self.index.get(token)
+        if row is None:
+            return None
+        return self.scores[row]
+
+    def sum_scores(self, token_lists):
+        """
+        Sum the score rows of every token, per document
+
+        output (type -> numpy array):
+        - documents x score columns matrix of totals
+        """
+        import numpy as np
+
+        n_doc = len(token_lists)
+        lengths = [len(token_list) for token_list in token_lists]
+        index = self.index
+        unknown = self.unknown
+        rows = np.fromiter(
+            (index.get(token, unknown) for token_list in token_lists for token in token_list),
+            dtype=np.intp, count=sum(lengths))
+        doc_ids = np.repeat(np.arange(n_doc), lengths)
+
+        # gather the rows, then segment-sum each column by document
+        gathered = self.scores[rows]
+        totals = np.empty((n_doc, self.scores.shape[1]), dtype=np.float64)
+        for column in range(self.scores.shape[1]):
+            totals[:, column] = np.bincount(doc_ids, weights=gathered[:, column], minlength=n_doc)
+        return totals
@@ -20,10 +20,16 @@ from lingfeat.utils import count_syllables
 
 def retrieve(origin_doc, token_list, n_token, n_sent):
     total_count_char = len(origin_doc.replace(" ",""))
-    total_count_tokn = n_token
     total_count_syll = 0
     for token in token_list:
         total_count_syll += count_syllables(token)
+    return from_totals((total_count_char, total_count_syll), n_token, n_sent)
+
+
+def from_totals(totals, n_token, n_sent):
+    # characters other than spaces in the text, syllables of token_list
+    total_count_char, total_count_syll = totals
+    total_count_tokn = n_token
     result = {
         "TokSenM_S":float(n_token*n_sent),
         "TokSenS_S":float(math.sqrt(n_token*n_sent)),
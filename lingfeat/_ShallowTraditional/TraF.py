@@ -20,36 +20,48 @@ Publication 3: Eltorai, Adam EM, Syed S. Naqvi, Soha Ghanian, Craig P. Eberson,
 import math
 from lingfeat.utils import count_syllables
 
+def sentence_counts(sent):
+    """(syllables, characters, words of 3+ syllables, words of 2+ syllables) of one tokenized sentence."""
+    n_syll = 0
+    n_char = 0
+    n_diff_token = 0
+    n_poly_token = 0
+    for token in sent:
+        syll_this_token = count_syllables(token)
+        n_syll += syll_this_token
+        if syll_this_token >= 3:
+            n_diff_token += 1
+        if syll_this_token >= 2:
+            n_poly_token += 1
+        n_char += len(token)
+    return n_syll, n_char, n_diff_token, n_poly_token
+
+
+def smog_poly_count(poly_counts, n_sent):
+    """Words of 2+ syllables SMOG counts: all of them up to 30 sentences, else those of the first, middle and last sentences."""
+    n_poly_token = 0
+    SMOG_upper_bound = len(poly_counts)-10
+    SMOG_middle_bound1 = len(poly_counts)/2 - 5
+    SMOG_middle_bound2 = len(poly_counts)/2 + 5
+    for i,poly in enumerate(poly_counts):
+        if n_sent <= 30:
+            n_poly_token += poly
+        else:
+            if i <= 10 or i >= SMOG_upper_bound or SMOG_middle_bound1 <= i <= SMOG_middle_bound2:
+                n_poly_token += poly
+    return n_poly_token
+
+
 class formulas:
-    def __init__(self, origin_doc, sent_token_list, n_sent, n_token):
+    """
+    input :
+    - totals: (syllables, characters, words of 3+ syllables, smog_poly_count) over sent_token_list
+    """
+    def __init__(self, totals, n_sent, n_token):
         self.n_sent = n_sent
         self.n_token = n_token
-        n_syll = 0
-        n_char = 0
-        n_diff_token = 0
-        n_poly_token = 0
-        SMOG_upper_bound = len(sent_token_list)-10
-        SMOG_middle_bound1 = len(sent_token_list)/2 - 5
-        SMOG_middle_bound2 = len(sent_token_list)/2 + 5
-        for i,sent in enumerate(sent_token_list):
-            for token in sent:
-                syll_this_token = count_syllables(token)
-                n_syll += syll_this_token
-                if syll_this_token >= 3:
-                    n_diff_token += 1
-                if syll_this_token >= 2:
-                    if n_sent <= 30:
-                        n_poly_token += 1
-                    else:
-                        if i <= 10 or i >= SMOG_upper_bound or SMOG_middle_bound1 <= i <= SMOG_middle_bound2:
-                            n_poly_token += 1
-                n_char += len(token)
-
-        self.n_syll = n_syll
-        self.n_char = n_char
-        self.n_diff_token = n_diff_token
-        self.n_easy_token = n_token - n_diff_token
-        self.n_poly_token = n_poly_token
+        self.n_syll, self.n_char, self.n_diff_token, self.n_poly_token = totals
+        self.n_easy_token = n_token - self.n_diff_token
 
     # follow "new" automated readability index in reference 1
     def automated_readability_index(self):
@@ -94,8 +106,21 @@ class formulas:
         return result
     
 
-def retrieve(origin_doc, sent_token_list, n_sent, n_token):
-    Formulas = formulas(origin_doc, sent_token_list, n_sent, n_token)
+def retrieve(origin_doc, sent_token_list, n_sent, n_token, sent_counts=None):
+    # sent_counts: sentence_counts of each sentence in sent_token_list, computed if None
+    if sent_counts is None:
+        sent_counts = [sentence_counts(sent) for sent in sent_token_list]
+    totals = (
+        sum(counts[0] for counts in sent_counts),
+        sum(counts[1] for counts in sent_counts),
+        sum(counts[2] for counts in sent_counts),
+        smog_poly_count([counts[3] for counts in sent_counts], n_sent),
+    )
+    return from_totals(totals, n_sent, n_token)
+
+
+def from_totals(totals, n_sent, n_token):
+    Formulas = formulas(totals, n_sent, n_token)
     SMI = Formulas.smog_index()
     CML = Formulas.coleman_liau_index()
     GNF = Formulas.fog_count()
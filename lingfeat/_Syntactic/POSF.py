@@ -17,34 +17,20 @@ Publication 1: Feng, Lijun, Noémie Elhadad, and Matt Huenerfauth. "Cognitively
 
 from lingfeat.utils import division
     
-def retrieve(NLP_doc, n_token, n_sent):
-    to_NoTag_C = 0
-    to_VeTag_C = 0
-    to_AjTag_C = 0
-    to_AvTag_C = 0
-    to_SuTag_C = 0
-    to_CoTag_C = 0
-    to_ContW_C = 0
-    to_FuncW_C = 0
+def retrieve(doc_scan, n_token, n_sent):
+    return from_counts(doc_scan.pos_counts, doc_scan.n_doc_token, n_token, n_sent)
 
-    for token in NLP_doc:
-        if token.pos_ == "NOUN" or token.pos_ == "VERB" or token.pos_ == "NUM" or token.pos_ == "ADJ" or token.pos_ == "ADV":
-            to_ContW_C += 1
-        else:
-            to_FuncW_C += 1
 
-        if token.pos_ == "NOUN":
-            to_NoTag_C += 1
-        if token.pos_ == "VERB":
-            to_VeTag_C += 1
-        if token.pos_ == "ADJ":
-            to_AjTag_C += 1
-        if token.pos_ == "ADV":
-            to_AvTag_C += 1
-        if token.pos_ == "SCONJ":
-            to_SuTag_C += 1
-        if token.pos_ == "CCONJ":
-            to_CoTag_C += 1
+def from_counts(pos_counts, n_doc_token, n_token, n_sent):
+    # pos_counts: part-of-speech tag -> count, n_doc_token: spacy tokens counted, punctuation included
+    to_NoTag_C = pos_counts.get("NOUN", 0)
+    to_VeTag_C = pos_counts.get("VERB", 0)
+    to_AjTag_C = pos_counts.get("ADJ", 0)
+    to_AvTag_C = pos_counts.get("ADV", 0)
+    to_SuTag_C = pos_counts.get("SCONJ", 0)
+    to_CoTag_C = pos_counts.get("CCONJ", 0)
+    to_ContW_C = to_NoTag_C + to_VeTag_C + pos_counts.get("NUM", 0) + to_AjTag_C + to_AvTag_C
+    to_FuncW_C = n_doc_token - to_ContW_C
     
     result = {
         "to_NoTag_C":float(to_NoTag_C),
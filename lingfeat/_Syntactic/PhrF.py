@@ -17,23 +17,25 @@ Publication 2: Lu, Xiaofei. "Automatic analysis of syntactic complexity in secon
 """
 from lingfeat.utils import division
 
-def retrieve(SuPar, sent_token_list, n_token, n_sent):
-    to_NoPhr_C = 0
-    to_VePhr_C = 0
-    to_SuPhr_C = 0
-    to_PrPhr_C = 0
-    to_AjPhr_C = 0
-    to_AvPhr_C = 0
-    for sent in sent_token_list:
-
-        dataset = SuPar.predict([sent], prob=True, verbose=False)
-        parsed_tree = str(dataset.sentences)
-        to_NoPhr_C += parsed_tree.count("NP")
-        to_VePhr_C += parsed_tree.count("VP")
-        to_SuPhr_C += parsed_tree.count("SBAR")
-        to_PrPhr_C += parsed_tree.count("PP")
-        to_AjPhr_C += parsed_tree.count("ADJP")
-        to_AvPhr_C += parsed_tree.count("ADVP")
+# phrase labels counted in each tree, in the order of the totals below
+PHRASE_LABELS = ("NP", "VP", "SBAR", "PP", "ADJP", "ADVP")
+
+
+def tree_counts(parsed_tree):
+    """Occurrences of each of PHRASE_LABELS in one bracketed tree string."""
+    return [parsed_tree.count(label) for label in PHRASE_LABELS]
+
+
+def retrieve(parsed_tree_list, n_token, n_sent):
+    totals = [0] * len(PHRASE_LABELS)
+    for parsed_tree in parsed_tree_list:
+        for i, count in enumerate(tree_counts(parsed_tree)):
+            totals[i] += count
+    return from_totals(totals, n_token, n_sent)
+
+
+def from_totals(totals, n_token, n_sent):
+    to_NoPhr_C, to_VePhr_C, to_SuPhr_C, to_PrPhr_C, to_AjPhr_C, to_AvPhr_C = totals
     result = {
         "to_NoPhr_C": to_NoPhr_C,
         "as_NoPhr_C": float(division(to_NoPhr_C,n_sent)),
@@ -15,18 +15,27 @@ References:
 Publication 1: Schwarm, Sarah E., and Mari Ostendorf. "Reading level assessment using support vector machines and statistical language models." Proceedings of the 43rd Annual Meeting of the Association for Computational Linguistics (ACL’05). 2005.
 """
 
-import nltk
 from lingfeat.utils import division
 
-def retrieve(SuPar, sent_token_list, n_token, n_sent):
+def tree_counts(parsed_tree):
+    """(height, length of flattened tree) of one bracketed tree string."""
+    import nltk
+    nltk_tree = nltk.Tree.fromstring(parsed_tree)
+    return int(nltk_tree.height()), len(nltk_tree.flatten())
+
+
+def retrieve(parsed_tree_list, n_token, n_sent):
     to_TreeH_C = 0
     to_FTree_C = 0
-    for sent in sent_token_list:
-        dataset = SuPar.predict([sent], prob=True, verbose=False)
-        parsed_tree = dataset.sentences
-        nltk_tree = nltk.Tree.fromstring(str(parsed_tree[0]))
-        to_TreeH_C += int(nltk_tree.height())
-        to_FTree_C += len(nltk_tree.flatten())
+    for parsed_tree in parsed_tree_list:
+        height, length = tree_counts(parsed_tree)
+        to_TreeH_C += height
+        to_FTree_C += length
+    return from_totals((to_TreeH_C, to_FTree_C), n_token, n_sent)
+
+
+def from_totals(totals, n_token, n_sent):
+    to_TreeH_C, to_FTree_C = totals
     result = {
         "to_TreeH_C": to_TreeH_C,
         "as_TreeH_C": float(division(to_TreeH_C,n_sent)),
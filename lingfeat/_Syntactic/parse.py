@@ -0,0 +1,50 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: parse.py (Constituency Parsing shared by PhrF and TrSF)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+from lingfeat import stats
+
+
+def parse(SuPar, sent_token_list, batch_size=5000):
+    """
+    Parse all tokenized sentences with one SuPar predict call
+
+    input :
+    - batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+
+    output (type -> list):
+    - bracketed tree string of each sentence, in the order of sent_token_list
+    """
+    if len(sent_token_list) == 0:
+        return []
+    stats.count("sentences_parsed", len(sent_token_list))
+    # prob=False: CRF marginals are never read, only the best trees
+    with stats.stage("supar"):
+        dataset = SuPar.predict(sent_token_list, prob=False, batch_size=batch_size, verbose=False)
+    return [str(sentence) for sentence in dataset.sentences]
+
+
+def parse_many(SuPar, sent_token_lists, batch_size=5000):
+    """
+    Parse the sentences of many documents with one SuPar predict call
+
+    output (type -> list of list):
+    - parsed tree list of each document, in the order of sent_token_lists
+    """
+    flat_sent_token_list = [sent for sent_token_list in sent_token_lists for sent in sent_token_list]
+    flat_parsed_tree_list = parse(SuPar, flat_sent_token_list, batch_size)
+
+    parsed_tree_lists = []
+    start = 0
+    for sent_token_list in sent_token_lists:
+        parsed_tree_lists.append(flat_parsed_tree_list[start:start + len(sent_token_list)])
+        start += len(sent_token_list)
+    return parsed_tree_lists
@@ -1 +1,3 @@
+__version__ = '1.0.0-beta.19'
+
 from lingfeat.extractor import pass_text
\ No newline at end of file
@@ -0,0 +1,121 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: aio.py (Asyncio API)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Coroutine counterparts of the extractor entry points for async applications. The work
+runs in an executor, so the event loop stays free. A semaphore limits how many
+extractions run at once.
+"""
+import os
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from lingfeat import models
+from lingfeat import extractor
+from lingfeat.planner import Plan
+
+# set by configure(): None runs on the event loop's default executor
+_executor = None
+_max_concurrency = None
+
+# event loop -> semaphore, asyncio primitives belong to one loop
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def configure(executor=None, max_concurrency=None):
+    """
+    input :
+    - executor (default None): concurrent.futures executor to run extraction in, None for the
+    event loop's default; with a ProcessPoolExecutor a text is extracted in one call
+    - max_concurrency (default os.cpu_count()): extractions running at once, others wait their turn
+    """
+    global _executor, _max_concurrency
+    _executor = executor
+    _max_concurrency = max_concurrency
+    _semaphores.clear()
+
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_max_concurrency or os.cpu_count() or 1)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+def _run(executor, function, *args, **kwargs):
+    return asyncio.get_running_loop().run_in_executor(executor, functools.partial(function, *args, **kwargs))
+
+
+def _annotate(text, pipeline):
+    NLP = models.get(pipeline)
+    LingFeat = extractor.pass_text(text, NLP_doc=NLP(text))
+    LingFeat.pipeline = pipeline
+    LingFeat.preprocess()
+    return LingFeat
+
+
+async def aextract(text, groups=None, features=None, executor=None, sentence_splitter="parser"):
+    """
+    Coroutine version of extractor.extract
+
+    input :
+    - text, groups, features, sentence_splitter: as in extractor.extract
+    - executor (default None): overrides the executor set by configure() for this call
+    ** cancelling the task stops at the next stage boundary (spacy, then each subgroup):
+    a stage already running in the executor finishes, later stages are not started
+
+    output (type -> dictionary):
+    - the requested features
+    """
+    plan = Plan(groups, features, sentence_splitter)
+    executor = executor if executor is not None else _executor
+    async with _semaphore():
+        if isinstance(executor, ProcessPoolExecutor):
+            return await _run(executor, extractor.extract, text, groups, features, sentence_splitter)
+        pipeline = models.spacy_name(plan.stages)
+        known = await _run(executor, extractor._lookup, text, plan.groups, pipeline)
+        if len(known) < len(plan.groups):
+            LingFeat = await _run(executor, _annotate, text, pipeline)
+            for group in plan.groups:
+                if group not in known:
+                    known[group] = await _run(executor, extractor._compute, LingFeat, group)
+        return plan.select(extractor._merge(known, plan.groups))
+
+
+async def aextract_many(texts, groups=None, features=None, batch_size=64, executor=None, errors="raise",
+                        sentence_splitter="parser"):
+    """
+    Coroutine version of extractor.extract_many, one executor call per batch_size texts
+    ** cancelling the task stops between batches
+    ** errors: as in extractor.extract_many, a function must be picklable for a ProcessPoolExecutor
+
+    output (type -> list of dictionary):
+    - one dictionary per text, in input order
+    """
+    Plan(groups, features, sentence_splitter)
+    texts = list(texts)
+    executor = executor if executor is not None else _executor
+    results = []
+    for start in range(0, len(texts), batch_size):
+        async with _semaphore():
+            results.extend(await _run(
+                executor, extractor.extract_many, texts[start:start + batch_size], groups, features, batch_size,
+                errors=errors, sentence_splitter=sentence_splitter))
+    return results
+
+
+async def awarmup(groups=extractor.FEATURE_GROUPS, executor=None, sentence_splitter="parser"):
+    """Coroutine version of extractor.warmup."""
+    await _run(executor if executor is not None else _executor, extractor.warmup, groups, sentence_splitter)
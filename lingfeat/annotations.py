@@ -0,0 +1,142 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: annotations.py (Annotation Store)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Keeps spacy annotations (as DocBin bytes) and SuPar trees of texts in a local SQLite
+file, so features can be extracted again after a formula changes without running
+spacy or SuPar. Reading the store needs spacy installed, but loads no trained model.
+"""
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+
+# token attributes kept for every Doc, everything DocScan and the feature modules read
+ANNOTATION_ATTRS = ("ORTH", "NORM", "SPACY", "LEMMA", "POS", "TAG", "MORPH", "HEAD", "DEP",
+                    "SENT_START", "ENT_IOB", "ENT_TYPE")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS annotations (key TEXT PRIMARY KEY, text TEXT NOT NULL, pipeline TEXT, doc BLOB NOT NULL, trees TEXT);
+"""
+
+
+class AnnotationStore:
+    """
+    input :
+    - path: SQLite file, created if missing
+
+    saves :
+    - self.vocab: spacy Vocab the stored Docs are read into, shared so strings are stored once
+    ** records are (text, NLP_doc, parsed_trees, pipeline), parsed_trees None if SuPar never ran
+    """
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self.vocab = None
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        # a connection must not cross a fork, reopen in the child
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def key(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def save_many(self, records):
+        """
+        Store (text, NLP_doc, parsed_trees, pipeline) records in one transaction
+        ** parse trees already stored for a text are kept when the new record has none
+        """
+        from spacy.tokens import DocBin
+        rows = []
+        for text, NLP_doc, parsed_trees, pipeline in records:
+            doc_bin = DocBin(attrs=ANNOTATION_ATTRS, store_user_data=False)
+            doc_bin.add(NLP_doc)
+            trees = None if parsed_trees is None else json.dumps(parsed_trees)
+            rows.append((self.key(text), text, pipeline, doc_bin.to_bytes(), trees))
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for key, text, pipeline, doc, trees in rows:
+                    # update in place, records() walks the table in rowid order
+                    updated = connection.execute(
+                        "UPDATE annotations SET pipeline = ?, doc = ?, trees = COALESCE(?, trees) WHERE key = ?",
+                        (pipeline, doc, trees, key)).rowcount
+                    if not updated:
+                        connection.execute(
+                            "INSERT INTO annotations VALUES (?, ?, ?, ?, ?)", (key, text, pipeline, doc, trees))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def save(self, text, NLP_doc, parsed_trees=None, pipeline=None):
+        self.save_many([(text, NLP_doc, parsed_trees, pipeline)])
+
+    def get(self, text):
+        """Stored record of text, None if it is not in the store."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT text, pipeline, doc, trees FROM annotations WHERE key = ?", (self.key(text),)).fetchone()
+        return None if row is None else self._record(row)
+
+    def records(self, batch_size=256):
+        """Every stored record, in the order texts were first stored."""
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT rowid, text, pipeline, doc, trees FROM annotations WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._record(row[1:])
+            last = rows[-1][0]
+
+    def _record(self, row):
+        from spacy.tokens import DocBin
+        if self.vocab is None:
+            # a blank English vocab, not a bare Vocab(): DocScan needs lexical attributes such as IS_ALPHA
+            import spacy
+            self.vocab = spacy.blank("en").vocab
+        text, pipeline, doc, trees = row
+        NLP_doc = next(iter(DocBin().from_bytes(doc).get_docs(self.vocab)))
+        return text, NLP_doc, (None if trees is None else json.loads(trees)), pipeline
+
+    def __contains__(self, text):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT 1 FROM annotations WHERE key = ?", (self.key(text),)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM annotations").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
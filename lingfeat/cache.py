@@ -0,0 +1,197 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: cache.py (Persistent Feature Cache)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Optional on-disk cache of subgroup results in a local SQLite file. Results are keyed by
+the text, the subgroup and everything the result depends on: LingFeat version, spacy
+pipeline, model fingerprints and preprocess options. Off until enable() is called.
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+from lingfeat import models
+from lingfeat import stats
+from lingfeat.planner import GROUP_MODELS
+
+DEFAULT_PATH = "~/.cache/lingfeat/features.sqlite"
+DEFAULT_MAX_BYTES = 1 << 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS features_used ON features (used);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('bytes', 0);
+"""
+
+# the cache extractor consults, None while caching is off
+_active = None
+
+# (group, pipeline, short) -> variant, computed once per process
+_variants = {}
+
+
+def enable(path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+    """Turn caching on for this process and return the cache."""
+    global _active
+    if _active is not None:
+        _active.close()
+    _active = FeatureCache(path, max_bytes)
+    return _active
+
+
+def disable():
+    """Turn caching off for this process."""
+    global _active
+    if _active is not None:
+        _active.close()
+    _active = None
+
+
+def active():
+    return _active
+
+
+def variant(group, pipeline, short=False):
+    """
+    Everything besides the text that the result of a subgroup depends on, as one digest
+
+    input :
+    - group: subgroup code, e.g. "WorF"
+    - pipeline: registry name of the spacy pipeline that annotated the text
+    - short: preprocess option the token list was made with
+    """
+    try:
+        return _variants[(group, pipeline, short)]
+    except KeyError:
+        pass
+    from lingfeat import __version__
+    parts = ["lingfeat=" + __version__, "short=" + str(bool(short)), models.fingerprint(pipeline)]
+    parts.extend(models.fingerprint(name) for name in GROUP_MODELS.get(group, ()))
+    value = hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+    _variants[(group, pipeline, short)] = value
+    return value
+
+
+class FeatureCache:
+    """
+    input :
+    - path: SQLite file, created if missing
+    - max_bytes (default 1 GB): least recently used results are evicted past this size
+
+    saves :
+    - self.hits, self.misses, self.evictions: counters for this process
+    ** safe to share between threads and processes, each process opens its own connection
+    """
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        # a connection must not cross a fork, reopen in the child
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def key(text, group, variant):
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return hashlib.sha256("{}\n{}\n{}".format(digest, group, variant).encode('utf-8')).hexdigest()
+
+    def get(self, text, group, variant):
+        """Cached result dictionary of the subgroup for text, None on a miss."""
+        key = self.key(text, group, variant)
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT value FROM features WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                connection.execute("UPDATE features SET used = ? WHERE key = ?", (time.time(), key))
+                self.hits += 1
+        if row is None:
+            stats.count("cache_misses")
+            return None
+        stats.count("cache_hits")
+        return json.loads(row[0])
+
+    def put(self, text, group, variant, result):
+        key = self.key(text, group, variant)
+        value = json.dumps(result, default=lambda number: number.item())
+        size = len(key) + len(value)
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                old = connection.execute("SELECT size FROM features WHERE key = ?", (key,)).fetchone()
+                connection.execute(
+                    "INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?)", (key, value, size, time.time()))
+                connection.execute(
+                    "UPDATE meta SET value = value + ? WHERE name = 'bytes'", (size - (old[0] if old else 0),))
+                self._evict(connection)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        while total > self.max_bytes:
+            oldest = connection.execute(
+                "SELECT key, size FROM features ORDER BY used LIMIT 256").fetchall()
+            if not oldest:
+                break
+            evicted = []
+            for key, size in oldest:
+                evicted.append(key)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            connection.executemany("DELETE FROM features WHERE key = ?", [(key,) for key in evicted])
+            self.evictions += len(evicted)
+        connection.execute("UPDATE meta SET value = ? WHERE name = 'bytes'", (max(total, 0),))
+
+    def stats(self):
+        """Counters for this process, plus entries and bytes in the file."""
+        with self._lock:
+            connection = self._connect()
+            entries = connection.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+            size = connection.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM features")
+            connection.execute("UPDATE meta SET value = 0 WHERE name = 'bytes'")
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
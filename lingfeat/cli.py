@@ -0,0 +1,307 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: cli.py (Command Line Interface)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+usage:
+    lingfeat extract INPUT OUTPUT [--groups TraF,WorF] [--features ...] [--workers N] [--sentence-splitter senter]
+    lingfeat serve [--port 8080] [--max-batch 64] [--max-wait-ms 5]
+
+Reads JSONL, CSV or one-text-per-line input as a stream and writes one feature row
+per text to CSV or Parquet as it goes. After every committed chunk a checkpoint
+records how far it got, so a killed run picks up where it stopped. A text that fails
+(e.g. a blank line, a null JSONL text or one over spacy's max_length) gets NaN features
+and its exception in the error column, and the run goes on.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from collections import deque
+
+from lingfeat import cache
+from lingfeat import stats
+from lingfeat.planner import Plan
+
+
+def read_texts(path, input_format, text_field, id_field):
+    """Yield (id, text) for each record of the input, lazily."""
+    if input_format == "jsonl":
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                yield (record.get(id_field) if id_field else None), record[text_field]
+    elif input_format == "csv":
+        _raise_field_size_limit()
+        with open(path, newline='', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                yield (record.get(id_field) if id_field else None), record[text_field]
+    else:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                yield None, line.rstrip('\n')
+
+
+def _raise_field_size_limit():
+    # the csv module refuses fields over 128 KB by default, and texts can be longer
+    limit = sys.maxsize
+    while True:
+        try:
+            csv.field_size_limit(limit)
+            return
+        except OverflowError:
+            # C long is 32 bits on Windows
+            limit //= 10
+
+
+def _failure(error):
+    # what a text that raised gets from extract_many, picklable for worker processes
+    return {"error": "{}: {}".format(type(error).__name__, error)}
+
+
+def guess_format(path, formats, default):
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension == "json":
+        extension = "jsonl"
+    return extension if extension in formats else default
+
+
+class Checkpoint:
+    """
+    Progress of one run, saved next to the output
+
+    saves :
+    - done: number of input texts whose rows are committed
+    - position: CSV byte size or number of Parquet parts at that point
+    - columns: output columns, a resumed run must ask for the same ones
+    - sentence_splitter: a resumed run must split sentences the same way
+    """
+    def __init__(self, path):
+        self.path = path
+        self.done = 0
+        self.position = 0
+        self.columns = None
+        self.sentence_splitter = None
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.done = state["done"]
+            self.position = state["position"]
+            self.columns = state["columns"]
+            # checkpoints written before the option existed split with the parser
+            self.sentence_splitter = state.get("sentence_splitter", "parser")
+
+    def save(self, done, position, columns, sentence_splitter):
+        self.done = done
+        self.position = position
+        self.columns = columns
+        self.sentence_splitter = sentence_splitter
+        # write aside and rename, so a kill never leaves a half-written checkpoint
+        with open(self.path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({"done": done, "position": position, "columns": columns,
+                       "sentence_splitter": sentence_splitter}, f)
+        os.replace(self.path + ".tmp", self.path)
+
+
+class CSVSink:
+    def __init__(self, path, columns, position):
+        if position:
+            # drop rows written after the last checkpoint
+            with open(path, 'r+b') as f:
+                f.truncate(position)
+            self.file = open(path, 'a', newline='', encoding='utf-8')
+            self.writer = csv.writer(self.file)
+        else:
+            self.file = open(path, 'w', newline='', encoding='utf-8')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(columns)
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """Writes OUTPUT as a directory of part files, one per committed chunk."""
+    def __init__(self, path, columns, position):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise SystemExit("lingfeat: Parquet output needs pyarrow, run: pip install pyarrow")
+        self.pyarrow = pyarrow
+        self.path = path
+        self.columns = columns
+        self.part = position
+        os.makedirs(path, exist_ok=True)
+        # drop parts written after the last checkpoint
+        for name in os.listdir(path):
+            if name.startswith("part-") and int(name[5:10]) >= position:
+                os.remove(os.path.join(path, name))
+
+    def write(self, rows):
+        table = self.pyarrow.table({column: [row[i] for row in rows] for i, column in enumerate(self.columns)})
+        part_path = os.path.join(self.path, "part-%05d.parquet" % self.part)
+        self.pyarrow.parquet.write_table(table, part_path + ".tmp")
+        os.replace(part_path + ".tmp", part_path)
+        self.part += 1
+        return self.part
+
+    def close(self):
+        pass
+
+
+def iter_results(texts, args):
+    """Feature dictionaries for texts, in order, from one process or a pool; {"error": ...} for texts that failed."""
+    groups = args.groups.split(",") if args.groups else None
+    features = args.features.split(",") if args.features else None
+    if args.workers > 1:
+        from lingfeat import parallel
+        for result in parallel.extract(texts, groups, features, n_workers=args.workers, chunk_size=args.batch_size,
+                                       errors=_failure, sentence_splitter=args.sentence_splitter):
+            yield result
+    else:
+        from lingfeat import extractor
+        texts = iter(texts)
+        while True:
+            batch = list(itertools.islice(texts, args.batch_size))
+            if not batch:
+                return
+            for result in extractor.extract_many(batch, groups, features, batch_size=args.batch_size, errors=_failure,
+                                                 sentence_splitter=args.sentence_splitter):
+                yield result
+
+
+def run_extract(args):
+    groups = args.groups.split(",") if args.groups else None
+    features = args.features.split(",") if args.features else None
+    plan = Plan(groups, features, args.sentence_splitter)
+    feature_columns = list(plan.columns)
+    columns = ["index"] + (["id"] if args.id_field else []) + feature_columns + ["error"]
+
+    input_format = args.input_format or guess_format(args.input, ("jsonl", "csv", "txt"), "txt")
+    output_format = args.output_format or guess_format(args.output, ("csv", "parquet"), "csv")
+    checkpoint = Checkpoint(args.checkpoint or args.output + ".checkpoint")
+    if checkpoint.columns is not None and checkpoint.columns != columns:
+        raise SystemExit("lingfeat: {} was written for other columns, remove it to start over".format(checkpoint.path))
+    if checkpoint.sentence_splitter is not None and checkpoint.sentence_splitter != args.sentence_splitter:
+        raise SystemExit("lingfeat: {} was written with --sentence-splitter {}, remove it to start over".format(
+            checkpoint.path, checkpoint.sentence_splitter))
+
+    if output_format == "parquet":
+        sink = ParquetSink(args.output, columns, checkpoint.position)
+    else:
+        sink = CSVSink(args.output, columns, checkpoint.position)
+
+    # ids wait here until their text's result comes back, results keep input order
+    records = itertools.islice(read_texts(args.input, input_format, args.text_field, args.id_field), checkpoint.done, None)
+    waiting_ids = deque()
+    def texts():
+        for record_id, text in records:
+            waiting_ids.append(record_id)
+            yield text
+
+    if args.cache:
+        cache.enable(args.cache, max_bytes=args.cache_size * 1024 * 1024)
+
+    done = checkpoint.done
+    results = iter_results(texts(), args)
+    try:
+        while True:
+            rows = []
+            for result in itertools.islice(results, args.commit_every):
+                record_id = waiting_ids.popleft()
+                row = [done + len(rows)] + ([record_id] if args.id_field else [])
+                if "error" in result:
+                    rows.append(row + [float('nan')] * len(feature_columns) + [result["error"]])
+                else:
+                    rows.append(row + [result[feature] for feature in feature_columns] + [""])
+            if not rows:
+                break
+            position = sink.write(rows)
+            done += len(rows)
+            checkpoint.save(done, position, columns, args.sentence_splitter)
+            if not args.quiet:
+                print("lingfeat: {} texts done".format(done), file=sys.stderr)
+    finally:
+        sink.close()
+
+
+def run_serve(args):
+    from lingfeat.server import ExtractionServer
+    if args.cache:
+        cache.enable(args.cache, max_bytes=args.cache_size * 1024 * 1024)
+    if args.stats:
+        stats.enable()
+    server = ExtractionServer(
+        args.host, args.port, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms, max_queue=args.max_queue,
+        warmup_groups=args.warmup.split(",") if args.warmup else None)
+    print("lingfeat: serving on http://{}:{}".format(*server.address), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="lingfeat", description="LingFeat - Comprehensive Linguistic Features for Readability Assessment")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    extract = commands.add_parser("extract", help="extract features from a corpus file, resumably")
+    extract.add_argument("input", help="JSONL, CSV or plain text (one text per line) file")
+    extract.add_argument("output", help="CSV file, or directory of Parquet parts")
+    extract.add_argument("--input-format", choices=("jsonl", "csv", "txt"), help="default: from the input extension")
+    extract.add_argument("--output-format", choices=("csv", "parquet"), help="default: from the output extension")
+    extract.add_argument("--text-field", default="text", help="JSONL key or CSV column holding the text (default: text)")
+    extract.add_argument("--id-field", help="JSONL key or CSV column copied to the output id column")
+    extract.add_argument("--groups", help="comma separated subgroups, e.g. TraF,WorF (default: all)")
+    extract.add_argument("--features", help="comma separated feature codes, e.g. FleschG_S,SimpTTR_S")
+    extract.add_argument("--sentence-splitter", choices=("parser", "senter"), default="parser",
+                         help="sentence boundaries from the dependency parser, or the faster senter (default: parser)")
+    extract.add_argument("--batch-size", type=int, default=64, help="texts per spacy/SuPar batch (default: 64)")
+    extract.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    extract.add_argument("--commit-every", type=int, default=1000, help="texts per write and checkpoint (default: 1000)")
+    extract.add_argument("--cache", help="SQLite feature cache file, texts seen before are not recomputed")
+    extract.add_argument("--cache-size", type=int, default=1024, help="cache size limit in MB (default: 1024)")
+    extract.add_argument("--checkpoint", help="checkpoint file (default: OUTPUT.checkpoint)")
+    extract.add_argument("--quiet", action="store_true", help="no progress messages")
+    extract.set_defaults(func=run_extract)
+
+    serve = commands.add_parser("serve", help="serve extraction over local HTTP, batching concurrent requests")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8080, help="port to listen on (default: 8080)")
+    serve.add_argument("--max-batch", type=int, default=64, help="most texts merged into one batch (default: 64)")
+    serve.add_argument("--max-wait-ms", type=float, default=5, help="how long a batch waits to fill up (default: 5)")
+    serve.add_argument("--max-queue", type=int, default=1024, help="queued texts before answering 503 (default: 1024)")
+    serve.add_argument("--warmup", help="comma separated subgroups to load models for before serving")
+    serve.add_argument("--cache", help="SQLite feature cache file")
+    serve.add_argument("--cache-size", type=int, default=1024, help="cache size limit in MB (default: 1024)")
+    serve.add_argument("--stats", action="store_true", help="record stage timings, shown on /stats")
+    serve.set_defaults(func=run_serve)
+
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except ValueError as e:
+        raise SystemExit("lingfeat: {}".format(e))
+
+
+if __name__ == "__main__":
+    main()
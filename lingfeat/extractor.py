@@ -16,17 +16,18 @@ import math
 import os
 import warnings
 import logging
-import tqdm
-def nop(it, *a, **k):
-    return it
-tqdm.tqdm = nop
+import functools
 from lingfeat.utils import nan_check
+from lingfeat.scanner import DocScan
 
-# performance-central dependencies
-import spacy 
-import supar
-from supar import Parser
-import gensim # for World Knowledge Features
+# performance-central dependencies (spaCy, SuPar, ...) load lazily through the registry
+from lingfeat import models
+from lingfeat import cache
+from lingfeat import stats
+
+# feature subgroups, feature codes and what each subgroup needs
+from lingfeat.schema import FEATURE_GROUPS, FEATURES
+from lingfeat.planner import Plan
 
 # advanced Semantic features
 import lingfeat._AdvancedSemantic.WoKF as AdSem_WoKF
@@ -41,6 +42,7 @@ import lingfeat._Discourse.EnGF as Disco_EnGF
 import lingfeat._Syntactic.POSF as Synta_POSF
 import lingfeat._Syntactic.PhrF as Synta_PhrF
 import lingfeat._Syntactic.TrSF as Synta_TrSF
+import lingfeat._Syntactic.parse as Synta_parse
 
 # lexico-Semantic features
 import lingfeat._LexicoSemantic.TTRF as LxSem_TTRF
@@ -55,12 +57,46 @@ import lingfeat._ShallowTraditional.TraF as ShaTr_TraF
 # ignore warning
 warnings.filterwarnings("ignore")
 
+log = logging.getLogger("lingfeat.extractor")
+
 # current path
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
-# load models
-NLP = spacy.load('en_core_web_sm')
-SuPar = Parser.load('crf-con-en')
+# default number of tokens per SuPar tensor batch
+PARSE_BATCH_SIZE = 5000
+
+
+def __getattr__(name):
+    # module attributes NLP and SuPar are kept for backward compatibility, now loaded on first access
+    if name == "NLP":
+        return models.get("spacy")
+    if name == "SuPar":
+        return models.get("supar")
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def _group_method(group):
+    # times the subgroup method (see lingfeat.stats) and looks it up in lingfeat.cache first, when caching is on
+    # ** <method>.compute skips the cache lookup
+    def decorator(method):
+        def compute(self):
+            with stats.stage(group):
+                return method(self)
+
+        @functools.wraps(method)
+        def cached_method(self):
+            store = cache.active()
+            if store is None or self.pipeline is None:
+                return compute(self)
+            variant = cache.variant(group, self.pipeline, self.short)
+            result = store.get(self.origin_doc, group, variant)
+            if result is None:
+                result = compute(self)
+                store.put(self.origin_doc, group, variant, result)
+            return result
+        cached_method.compute = compute
+        return cached_method
+    return decorator
 
 
 class pass_text:
@@ -70,14 +106,46 @@ class pass_text:
 
     input :
     - text: original input text to analyze
+    - NLP_doc (default None): spacy Doc already made from text, skips running NLP again
 
     saves :
     - self.origin_doc
     - self.NLP_doc: spacy pipeline object
+    - self.doc_scan: token attributes read from NLP_doc, None until first needed
+    - self.parsed_trees: SuPar tree of each sentence, None until first needed
+    - self.pipeline: registry name of the spacy pipeline that made NLP_doc, None if NLP_doc was given
+    ** results are cached (see lingfeat.cache) only when self.pipeline is known
     """
-    def __init__(self, text:str):
-        self.NLP_doc = NLP(text)
+    def __init__(self, text:str, NLP_doc=None):
+        if NLP_doc is None:
+            NLP = models.get("spacy")
+            with stats.stage("spacy"):
+                NLP_doc = NLP(text)
+            self.pipeline = "spacy"
+        else:
+            self.pipeline = None
+        self.NLP_doc = NLP_doc
         self.origin_doc = text
+        self.doc_scan = None
+        self.parsed_trees = None
+
+
+
+    """
+    Read the token attributes of self.NLP_doc in one pass, only once per document
+    ** preprocess, POSF_, VarF_, EnDF_ and EnGF_ all read the scan saved here
+
+    saves :
+    - self.doc_scan: lingfeat.scanner.DocScan of self.NLP_doc
+
+    output:
+    - doc_scan
+    """
+    def scan(self):
+        if self.doc_scan is None:
+            with stats.stage("scan"):
+                self.doc_scan = DocScan(self.NLP_doc)
+        return self.doc_scan
 
 
 
@@ -95,6 +163,7 @@ class pass_text:
     - self.n_sent
     - self.token_list: lemmatized token list, only alphabets
     - self.sent_token_list: token list, no lemmatization, list of list in sentence
+    - self.short
 
     output:
     - n_token
@@ -103,37 +172,30 @@ class pass_text:
     - sent_token_list (optional)
     """
     def preprocess(self, short=False, see_token=False, see_sent_token=False):
-        n_token = 1
-        n_sent = 1
-        token_list = []
-        raw_token_list = []
-        sent_token_list = []
-
-        # sent_list is for raw string sentences
-        sent_list = []
-
-        # count tokens, sentence + make lists
-        for sent in self.NLP_doc.sents:
-            n_sent += 1
-            sent_list.append(sent.text)
-            temp_list = []
-            for token in sent:
-                if token.text.isalpha():
-                    temp_list.append(token.text)
-                    if short == True:
-                        n_token += 1
-                        token_list.append(token.lemma_.lower())
-                    if short == False:
-                        if len(token.text) >= 3:
-                            n_token += 1
-                            token_list.append(token.lemma_.lower())
-            if len(temp_list) > 3:
-                sent_token_list.append(temp_list)
+        doc_scan = self.scan()
+        with stats.stage("preprocess"):
+            n_token = 1
+            n_sent = 1 + doc_scan.n_doc_sent
+            token_list = []
+            sent_token_list = [[] for i in range(doc_scan.n_doc_sent)]
+
+            # count tokens + make lists, alphabetic tokens only
+            for i, text, lemma in zip(doc_scan.alpha_sent, doc_scan.alpha_text, doc_scan.alpha_lemma):
+                sent_token_list[i].append(text)
+                if short == True or len(text) >= 3:
+                    n_token += 1
+                    token_list.append(lemma)
+            sent_token_list = [temp_list for temp_list in sent_token_list if len(temp_list) > 3]
+
+        stats.count("documents")
+        stats.count("tokens_processed", doc_scan.n_doc_token)
+        stats.describe(n_tokens=doc_scan.n_doc_token, n_sents=doc_scan.n_doc_sent, n_words=len(token_list))
 
         self.n_token = n_token 
         self.n_sent = n_sent
         self.token_list = token_list
         self.sent_token_list = sent_token_list
+        self.short = short
         
         result = {"n_token": self.n_token, 
                     "n_sent": self.n_sent
@@ -148,6 +210,87 @@ class pass_text:
 
 
 
+    """
+    Extract features, running only what the requested subgroups need
+    ** preprocess is run first if it has not been
+
+    input :
+    - groups (default None): subgroups to extract, e.g. ["TraF", "WorF"]
+    - features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+    ** with neither, all 255 features are extracted
+
+    output (type -> dictionary):
+    - the requested features
+    """
+    def extract(self, groups=None, features=None):
+        plan = Plan(groups, features)
+        with stats.document(self.origin_doc):
+            if getattr(self, "token_list", None) is None:
+                self.preprocess()
+            result = {}
+            for group in plan.groups:
+                result.update(getattr(self, group + "_")())
+        return plan.select(result)
+
+
+
+    """
+    Parse sentences with SuPar, only once per document
+    ** PhrF_ and TrSF_ both read the trees saved here
+
+    input :
+    - batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+
+    saves :
+    - self.parsed_trees: bracketed tree string of each sentence in self.sent_token_list
+
+    output:
+    - parsed_trees
+    """
+    def parse(self, batch_size=PARSE_BATCH_SIZE):
+        if self.parsed_trees is None:
+            self.parsed_trees = Synta_parse.parse(models.get("supar"), self.sent_token_list, batch_size)
+        return self.parsed_trees
+
+
+
+    """
+    Save the spacy annotations and, if parsed, the SuPar trees of this text
+    ** see lingfeat.annotations, pass_text.load rebuilds the object without any model
+
+    input :
+    - store: lingfeat.annotations.AnnotationStore
+    """
+    def save(self, store):
+        store.save(self.origin_doc, self.NLP_doc, self.parsed_trees, self.pipeline)
+
+
+
+    """
+    Rebuild a pass_text from an annotation store, without loading spacy or SuPar
+
+    input :
+    - store: lingfeat.annotations.AnnotationStore
+    - text: original input text, as saved
+
+    output:
+    - pass_text, with NLP_doc and parsed_trees (if saved) restored, None if text is not in store
+    """
+    @classmethod
+    def load(cls, store, text):
+        record = store.get(text)
+        return None if record is None else cls._from_record(record)
+
+    @classmethod
+    def _from_record(cls, record):
+        text, NLP_doc, parsed_trees, pipeline = record
+        LingFeat = cls(text, NLP_doc=NLP_doc)
+        LingFeat.parsed_trees = parsed_trees
+        LingFeat.pipeline = pipeline
+        return LingFeat
+
+
+
     """
     Extract World Knowledge Features -> 12
 
@@ -169,8 +312,9 @@ class pass_text:
     - WNois20_S: Semantic Noise, 200 topics extracted from Wikipedia
     - WTopc20_S: Number of topics, 200 topics extracted from Wikipedia
     """
+    @_group_method("WoKF")
     def WoKF_(self):
-        result = AdSem_WoKF.retrieve(self.token_list, dir_path)
+        result = AdSem_WoKF.retrieve(self.token_list)
         result = nan_check(result)
         return result
 
@@ -197,8 +341,9 @@ class pass_text:
     - BNois20_S: Semantic Noise, 200 topics extracted from WeeBit Corpus
     - BTopc20_S: Number of topics, 200 topics extracted from WeeBit Corpus
     """
+    @_group_method("WBKF")
     def WBKF_(self):
-        result = AdSem_WBKF.retrieve(self.token_list, dir_path)
+        result = AdSem_WBKF.retrieve(self.token_list)
         result = nan_check(result)
         return result
 
@@ -225,8 +370,9 @@ class pass_text:
     - ONois20_S: Semantic Noise, 200 topics extracted from OneStopEng Corpus
     - OTopc20_S: Number of topics, 200 topics extracted from OneStopEng Corpus
     """
+    @_group_method("OSKF")
     def OSKF_(self):
-        result = AdSem_OSKF.retrieve(self.token_list, dir_path)
+        result = AdSem_OSKF.retrieve(self.token_list)
         result = nan_check(result)
         return result
 
@@ -243,8 +389,9 @@ class pass_text:
     - as_UEnti_C: average count of unique Entities per sentence
     - at_UEnti_C: average count of unique Entities per token (word)
     """
+    @_group_method("EnDF")
     def EnDF_(self):
-        result = Disco_EnDF.retrieve(self.NLP_doc, self.n_sent, self.n_token)
+        result = Disco_EnDF.retrieve(self.scan(), self.n_sent, self.n_token)
         result = nan_check(result)
         return result
     
@@ -277,6 +424,7 @@ class pass_text:
     - LoCoDPW_S: Local Coherence distance for PW score    
     - LoCoDPU_S: Local Coherence distance for PU score    
     """
+    @_group_method("EnGF")
     def EnGF_(self):
         """
         if self.n_sent <= 2:
@@ -287,7 +435,7 @@ class pass_text:
                 +"1.Entity Grid needs at least two sentences, found: {}.\n".format(self.n_sent))
         else:
         """
-        result = Disco_EnGF.EntityGrid(self.NLP_doc, n_sent=self.n_sent).retrieve()
+        result = Disco_EnGF.EntityGrid(self.scan(), n_sent=self.n_sent).retrieve()
         result = nan_check(result)
         return result
 
@@ -351,8 +499,9 @@ class pass_text:
     - ra_AvPrP_C: ratio of Adv phrases count to Prep phrases count
     - ra_AvAjP_C: ratio of Adv phrases count to Adj phrases count
     """
+    @_group_method("PhrF")
     def PhrF_(self):
-        result = Synta_PhrF.retrieve(SuPar, self.sent_token_list, self.n_token, self.n_sent)
+        result = Synta_PhrF.retrieve(self.parse(), self.n_token, self.n_sent)
         result = nan_check(result)
         return result
     
@@ -369,8 +518,9 @@ class pass_text:
     - as_FTree_C: average length of flattened Trees per sentence
     - at_FTree_C: average length of flattened Trees per token (word)
     """
+    @_group_method("TrSF")
     def TrSF_(self):
-        result = Synta_TrSF.retrieve(SuPar, self.sent_token_list, self.n_token, self.n_sent)
+        result = Synta_TrSF.retrieve(self.parse(), self.n_token, self.n_sent)
         result = nan_check(result)
         return result
 
@@ -442,8 +592,9 @@ class pass_text:
     - at_FuncW_C: average count of Function words per token
     - ra_CoFuW_C: ratio of Content words to Function words
     """
+    @_group_method("POSF")
     def POSF_(self):
-        result = Synta_POSF.retrieve(self.NLP_doc, self.n_token, self.n_sent)
+        result = Synta_POSF.retrieve(self.scan(), self.n_token, self.n_sent)
         result = nan_check(result)
         return result
 
@@ -459,6 +610,7 @@ class pass_text:
     - UberTTR_S: (log(unique tokens))^2/log(total tokens/unique tokens) (Uber Index)
     - MTLDTTR_S: Measure of Textual Lexical Diversity (default TTR = 0.72)
     """
+    @_group_method("TTRF")
     def TTRF_(self):
         result = LxSem_TTRF.retrieve(self.n_token, self.token_list)
         result = nan_check(result)
@@ -486,8 +638,9 @@ class pass_text:
     - SquaAvV_S: (unique Adverbs**2)/total Adverbs (Squared AdVerb Variation-1)
     - CorrAvV_S: unique Adverbs/sqrt(2*total Adverbs) (Corrected AdVerb Variation-1)
     """
+    @_group_method("VarF")
     def VarF_(self):
-        result = LxSem_VarF.retrieve(self.NLP_doc)
+        result = LxSem_VarF.retrieve(self.scan())
         result = nan_check(result)
         return result
 
@@ -512,8 +665,9 @@ class pass_text:
     - as_AACoL_C: average AoA of lemmas, Cortese and Khanna norm per sentence
     - at_AACoL_C: average AoA of lemmas, Cortese and Khanna norm per token
     """
+    @_group_method("PsyF")
     def PsyF_(self):
-        result = LxSem_PsyF.retrieve(self.token_list, self.n_token, self.n_sent, dir_path)
+        result = LxSem_PsyF.retrieve(self.token_list, self.n_token, self.n_sent)
         result = nan_check(result)
         return result
 
@@ -554,8 +708,9 @@ class pass_text:
     - as_SbL1C_C: average SubtlexUS Lg10CD value per sentence
     - at_SbL1C_C: average SubtlexUS Lg10CD value per token
     """
+    @_group_method("WorF")
     def WorF_(self):
-        result = LxSem_WorF.retrieve(self.token_list, self.n_token, self.n_sent, dir_path)
+        result = LxSem_WorF.retrieve(self.token_list, self.n_token, self.n_sent)
         result = nan_check(result)
         return result
 
@@ -572,6 +727,7 @@ class pass_text:
     - as_Chara_C: average count of characters per sentence
     - at_Chara_C: average count of characters per token
     """
+    @_group_method("ShaF")
     def ShaF_(self):
         result = ShaTr_ShaF.retrieve(self.origin_doc, self.token_list, self.n_token, self.n_sent)
         result = nan_check(result)
@@ -590,7 +746,425 @@ class pass_text:
     - FleschG_S: Flesch Kincaid Grade
     - LinseaW_S: Linsear Write
     """
+    @_group_method("TraF")
     def TraF_(self):
         result = ShaTr_TraF.retrieve(self.origin_doc, self.sent_token_list, self.n_sent, self.n_token)
         result = nan_check(result)
-        return result
\ No newline at end of file
+        return result
+
+
+
+"""
+Extract features from one text, running only what the requested subgroups need
+** spacy runs only the components those subgroups need
+** subgroups found in the cache (see lingfeat.cache) are not computed, spacy is skipped if all are
+
+input :
+- text: original input text to analyze
+- groups (default None): subgroups to extract, e.g. ["TraF", "WorF"]
+- features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+- sentence_splitter (default "parser"): where sentence boundaries come from, "parser" or the faster "senter",
+see lingfeat.planner.Plan
+
+output (type -> dictionary):
+- the requested features
+"""
+def extract(text, groups=None, features=None, sentence_splitter="parser"):
+    plan = Plan(groups, features, sentence_splitter)
+    pipeline = models.spacy_name(plan.stages)
+    with stats.document(text):
+        known = _lookup(text, plan.groups, pipeline)
+        if len(known) == len(plan.groups):
+            return plan.select(_merge(known, plan.groups))
+        NLP = models.get(pipeline)
+        _check_text(text, NLP)
+        with stats.stage("spacy"):
+            NLP_doc = NLP(text)
+        LingFeat = pass_text(text, NLP_doc=NLP_doc)
+        LingFeat.pipeline = pipeline
+        LingFeat.preprocess()
+        for group in plan.groups:
+            if group not in known:
+                known[group] = _compute(LingFeat, group)
+    return plan.select(_merge(known, plan.groups))
+
+
+
+"""
+Extract features from many texts, annotating them in batches with NLP.pipe
+** spacy runs only the components the requested subgroups need
+** sentences of every batch_size texts are parsed together in one SuPar call
+** texts whose subgroups are all cached (see lingfeat.cache) are not annotated at all
+
+input :
+- texts: iterable of original input texts
+- groups (default None): subgroups to extract, e.g. ["TraF", "WorF"]
+- features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+- batch_size (default 64): number of texts buffered per spacy batch and per SuPar call
+- n_process (default 1): number of processes spacy annotates with
+- parse_batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+- store (default None): lingfeat.annotations.AnnotationStore to save the annotations of every annotated text to
+- errors (default "raise"): what a text that raises gets, the other texts of its batch are not affected
+    - "raise": the exception propagates
+    - "skip": None in place of its dictionary
+    - "nan": every requested feature set to NaN
+    - a function exception -> what to put in place of its dictionary
+- sentence_splitter (default "parser"): as in extract
+** with neither groups nor features, all 255 features are extracted
+** a text that is not a string or is over spacy's max_length fails on its own, before spacy sees the batch
+** failures are logged to the "lingfeat.extractor" logger and counted as failed_documents in lingfeat.stats
+
+output (type -> list of dictionary):
+- one dictionary per text, in input order, holding the requested features
+"""
+def extract_many(texts, groups=None, features=None, batch_size=64, n_process=1, parse_batch_size=PARSE_BATCH_SIZE,
+                 store=None, errors="raise", sentence_splitter="parser"):
+    plan = Plan(groups, features, sentence_splitter)
+    on_error = _error_handler(errors, plan)
+    texts = list(texts)
+    results = [None] * len(texts)
+    def emit(i, known):
+        results[i] = plan.select(_merge(known, plan.groups))
+    def fail(i, error):
+        results[i] = on_error(error)
+    _extract_into(texts, plan, emit, batch_size, n_process, parse_batch_size, store, None if on_error is None else fail)
+    return results
+
+
+def _error_handler(errors, plan):
+    # None to let exceptions propagate, else a function exception -> result
+    if errors == "raise":
+        return None
+    if errors == "skip":
+        return lambda error: None
+    if errors == "nan":
+        return lambda error: dict.fromkeys(plan.columns, float('nan'))
+    if callable(errors):
+        return errors
+    raise ValueError("errors must be 'raise', 'skip', 'nan' or a function, not {!r}".format(errors))
+
+
+
+"""
+Extract features from many texts straight into a preallocated array, one row per text
+** same pipeline as extract_many, without building a dictionary per text
+** columns follow lingfeat.schema: every code of the requested subgroups in COLUMNS order,
+or only the requested feature codes; lingfeat.schema.FeatureView(row, columns) reads a row like a dictionary
+
+input :
+- texts: iterable of original input texts
+- groups (default None): subgroups to extract, e.g. ["TraF", "WorF"]
+- features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+- dtype (default "float64"): array dtype, e.g. "float32" to halve memory
+- batch_size, n_process, parse_batch_size, store: as in extract_many
+- errors (default "raise"): "raise", or "nan" to fill the row of a text that raises with NaN
+- sentence_splitter (default "parser"): as in extract
+
+output (type -> numpy array, tuple):
+- array of shape (number of texts, number of columns)
+- feature code of each column
+"""
+def extract_array(texts, groups=None, features=None, dtype="float64", batch_size=64, n_process=1,
+                  parse_batch_size=PARSE_BATCH_SIZE, store=None, errors="raise", sentence_splitter="parser"):
+    import numpy as np
+    plan = Plan(groups, features, sentence_splitter)
+    if errors not in ("raise", "nan"):
+        raise ValueError("errors must be 'raise' or 'nan', not {!r}".format(errors))
+    texts = list(texts)
+    array = np.empty((len(texts), len(plan.columns)), dtype=dtype)
+
+    # subgroup -> (its feature codes kept in the array, their column indexes)
+    column_of = {feature: index for index, feature in enumerate(plan.columns)}
+    layout = {}
+    for group in plan.groups:
+        kept = [feature for feature in FEATURES[group] if feature in column_of]
+        layout[group] = (kept, [column_of[feature] for feature in kept])
+
+    def emit(i, known):
+        row = array[i]
+        for group in plan.groups:
+            kept, columns = layout[group]
+            result = known[group]
+            row[columns] = [result[feature] for feature in kept]
+    def fail(i, error):
+        array[i] = np.nan
+    _extract_into(texts, plan, emit, batch_size, n_process, parse_batch_size, store, fail if errors == "nan" else None)
+    return array, plan.columns
+
+
+
+"""
+Extract features from many texts into a pandas DataFrame, one row per text
+** arguments as in extract_array, columns are named by feature code
+
+output (type -> pandas DataFrame):
+- one row per text, in input order
+"""
+def extract_frame(texts, groups=None, features=None, dtype="float64", batch_size=64, n_process=1,
+                  parse_batch_size=PARSE_BATCH_SIZE, store=None, errors="raise", sentence_splitter="parser"):
+    import pandas as pd
+    array, columns = extract_array(
+        texts, groups, features, dtype, batch_size, n_process, parse_batch_size, store, errors, sentence_splitter)
+    return pd.DataFrame(array, columns=list(columns), copy=False)
+
+
+def _extract_into(texts, plan, emit, batch_size, n_process, parse_batch_size, store, fail=None):
+    # runs plan over texts, calling emit(i, subgroup -> result) once text i is done,
+    # or fail(i, exception) if it raised; without fail, the exception propagates
+    pipeline = models.spacy_name(plan.stages)
+
+    # cached subgroups of each text, texts with any subgroup missing get annotated
+    todo = []
+    for i, text in enumerate(texts):
+        known = _lookup(text, plan.groups, pipeline) if isinstance(text, str) else {}
+        if len(known) == len(plan.groups):
+            emit(i, known)
+        else:
+            todo.append((i, known))
+    if not todo:
+        return
+    NLP = models.get(pipeline)
+
+    # what NLP.pipe would raise on comes out of the generator and ends the whole call, so check it first
+    checked = []
+    for i, known in todo:
+        try:
+            _check_text(texts[i], NLP)
+        except (TypeError, ValueError) as e:
+            _log_failure(texts[i], e)
+            if fail is None:
+                raise
+            fail(i, e)
+            continue
+        checked.append((i, known))
+    todo = checked
+
+    def flush(batch, indexes):
+        failed = _extract_batch(batch, plan, parse_batch_size, store)
+        for i, (LingFeat, known), error in zip(indexes, batch, failed):
+            if error is None:
+                emit(i, known)
+            elif fail is None:
+                raise error
+            else:
+                fail(i, error)
+
+    NLP_docs = stats.timed_iter(
+        "spacy", NLP.pipe((texts[i] for i, known in todo), batch_size=batch_size, n_process=n_process))
+    batch = []
+    indexes = []
+    for (i, known), NLP_doc in zip(todo, NLP_docs):
+        LingFeat = pass_text(texts[i], NLP_doc=NLP_doc)
+        LingFeat.pipeline = pipeline
+        try:
+            LingFeat.preprocess()
+        except Exception as e:
+            _log_failure(texts[i], e)
+            if fail is None:
+                raise
+            fail(i, e)
+            continue
+        batch.append((LingFeat, known))
+        indexes.append(i)
+        if len(batch) == batch_size:
+            flush(batch, indexes)
+            batch = []
+            indexes = []
+    if batch:
+        flush(batch, indexes)
+
+
+
+"""
+Extract features again from the annotations in a store, without running spacy
+** SuPar runs only for texts saved without parse trees, and those trees are saved back
+
+input :
+- store: lingfeat.annotations.AnnotationStore
+- groups (default None): subgroups to extract, e.g. ["TraF", "WorF"]
+- features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+- batch_size (default 64): number of texts per SuPar call and lexicon batch
+- parse_batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+- sentence_splitter (default "parser"): as in extract, texts stored with the other splitter raise ValueError
+
+output (type -> iterator of (text, dictionary)):
+- each stored text with its requested features, in the order texts were stored
+"""
+def extract_stored(store, groups=None, features=None, batch_size=64, parse_batch_size=PARSE_BATCH_SIZE,
+                   sentence_splitter="parser"):
+    plan = Plan(groups, features, sentence_splitter)
+    batch = []
+    for record in store.records():
+        LingFeat = pass_text._from_record(record)
+        _check_annotations(LingFeat, plan)
+        LingFeat.preprocess()
+        known = {} if LingFeat.pipeline is None else _lookup(LingFeat.origin_doc, plan.groups, LingFeat.pipeline)
+        batch.append((LingFeat, known))
+        if len(batch) == batch_size:
+            for item in _extract_stored_batch(batch, plan, parse_batch_size, store):
+                yield item
+            batch = []
+    if batch:
+        for item in _extract_stored_batch(batch, plan, parse_batch_size, store):
+            yield item
+
+
+def _extract_stored_batch(batch, plan, parse_batch_size, store):
+    unparsed = [LingFeat for LingFeat, results in batch if LingFeat.parsed_trees is None]
+    for error in _extract_batch(batch, plan, parse_batch_size):
+        if error is not None:
+            raise error
+    newly_parsed = [LingFeat for LingFeat in unparsed if LingFeat.parsed_trees is not None]
+    if newly_parsed:
+        _save(newly_parsed, store)
+    return [(LingFeat.origin_doc, plan.select(_merge(results, plan.groups))) for LingFeat, results in batch]
+
+
+def _check_annotations(LingFeat, plan):
+    # stored Docs made by a pruned pipeline cannot serve subgroups needing what was pruned
+    if LingFeat.pipeline is None:
+        return
+    needed = models.spacy_components(plan.stages)
+    made_with = models.pipeline_components(LingFeat.pipeline)
+    lacking = needed - made_with
+    if lacking:
+        raise ValueError("Stored annotations of {!r} were made without: {}".format(
+            LingFeat.origin_doc[:50], ", ".join(sorted(lacking))))
+    # nor can sentences from one splitter serve a request for the other's
+    if ("senter" in needed) != ("senter" in made_with):
+        raise ValueError("Stored annotations of {!r} were split into sentences by the {}".format(
+            LingFeat.origin_doc[:50], "senter" if "senter" in made_with else "parser"))
+
+
+def _save(LingFeats, store):
+    store.save_many([
+        (LingFeat.origin_doc, LingFeat.NLP_doc, LingFeat.parsed_trees, LingFeat.pipeline) for LingFeat in LingFeats])
+
+
+def _extract_batch(batch, plan, parse_batch_size, store=None):
+    # fills in the missing subgroups of each (pass_text, subgroup -> result) pair
+    # ** returns the exception of each text that failed, None for the others: a failing text leaves the rest be
+    missing = [[group for group in plan.groups if group not in results] for LingFeat, results in batch]
+    failed = [None] * len(batch)
+
+    to_parse = [LingFeat for (LingFeat, results), groups in zip(batch, missing)
+                if LingFeat.parsed_trees is None and ("PhrF" in groups or "TrSF" in groups)]
+    if to_parse:
+        try:
+            parsed_tree_lists = Synta_parse.parse_many(
+                models.get("supar"), [LingFeat.sent_token_list for LingFeat in to_parse], parse_batch_size)
+            for LingFeat, parsed_trees in zip(to_parse, parsed_tree_lists):
+                LingFeat.parsed_trees = parsed_trees
+        except Exception:
+            # each text is parsed again on its own below, which finds the one failing
+            log.warning("batched SuPar call failed, parsing %d texts one by one", len(to_parse), exc_info=True)
+
+    # lexicon groups score the whole batch at once
+    for group, module in (("PsyF", LxSem_PsyF), ("WorF", LxSem_WorF)):
+        members = [j for j, groups in enumerate(missing) if group in groups]
+        if not members:
+            continue
+        try:
+            with stats.stage(group):
+                scored = module.retrieve_many(
+                    [batch[j][0].token_list for j in members],
+                    [batch[j][0].n_token for j in members],
+                    [batch[j][0].n_sent for j in members])
+        except Exception:
+            # left to each text on its own below
+            continue
+        for j, result in zip(members, scored):
+            LingFeat, results = batch[j]
+            results[group] = _store(LingFeat, group, nan_check(result))
+
+    # topic groups infer the whole batch at once, one call per LDA model
+    for group, module in (("WoKF", AdSem_WoKF), ("WBKF", AdSem_WBKF), ("OSKF", AdSem_OSKF)):
+        members = [j for j, groups in enumerate(missing) if group in groups]
+        if not members:
+            continue
+        try:
+            with stats.stage(group):
+                inferred = module.retrieve_many([batch[j][0].token_list for j in members])
+        except Exception:
+            # left to each text on its own below
+            continue
+        for j, result in zip(members, inferred):
+            LingFeat, results = batch[j]
+            results[group] = _store(LingFeat, group, nan_check(result))
+
+    for j, ((LingFeat, results), groups) in enumerate(zip(batch, missing)):
+        try:
+            if LingFeat.parsed_trees is None and ("PhrF" in groups or "TrSF" in groups):
+                LingFeat.parse(parse_batch_size)
+            for group in groups:
+                if group not in results:
+                    results[group] = _compute(LingFeat, group)
+        except Exception as e:
+            failed[j] = e
+            _log_failure(LingFeat.origin_doc, e)
+
+    if store is not None:
+        _save([LingFeat for LingFeat, results in batch], store)
+    return failed
+
+
+def _check_text(text, NLP):
+    # raise what spacy would for a text it cannot annotate
+    if not isinstance(text, str):
+        raise TypeError("Text must be a string, not {}".format(type(text).__name__))
+    if len(text) > NLP.max_length:
+        raise ValueError("Text of {} characters is over spacy's max_length {}, extract it with "
+                         "lingfeat.longdoc.extract_long".format(len(text), NLP.max_length))
+
+
+def _log_failure(text, error):
+    stats.count("failed_documents")
+    log.warning("extraction failed for %r: %s: %s", text[:50] if isinstance(text, str) else text,
+                type(error).__name__, error)
+
+
+def _lookup(text, groups, pipeline):
+    # subgroup -> cached result, empty while caching is off
+    store = cache.active()
+    if store is None:
+        return {}
+    known = {}
+    for group in groups:
+        result = store.get(text, group, cache.variant(group, pipeline))
+        if result is not None:
+            known[group] = result
+    return known
+
+
+def _compute(LingFeat, group):
+    # run the subgroup method past its cache check, then store the result
+    result = getattr(pass_text, group + "_").compute(LingFeat)
+    return _store(LingFeat, group, result)
+
+
+def _store(LingFeat, group, result):
+    store = cache.active()
+    if store is not None and LingFeat.pipeline is not None:
+        store.put(LingFeat.origin_doc, group, cache.variant(group, LingFeat.pipeline, LingFeat.short), result)
+    return result
+
+
+def _merge(results, groups):
+    merged = {}
+    for group in groups:
+        merged.update(results[group])
+    return merged
+
+
+
+"""
+Load the models needed by the given feature subgroups now, instead of on first use
+
+input :
+- groups (default all): feature subgroups to prepare, e.g. ["PhrF", "TrSF"]
+- sentence_splitter (default "parser"): as in extract
+"""
+def warmup(groups=FEATURE_GROUPS, sentence_splitter="parser"):
+    plan = Plan(groups, sentence_splitter=sentence_splitter)
+    models.get_spacy(plan.stages)
+    models.preload(plan.models)
@@ -0,0 +1,281 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: incremental.py (Incremental Re-extraction of Edited Texts)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Keeps a text as a list of sentences, each with its own spacy annotation, SuPar tree and
+counts. After an edit, only the sentences around the changed characters are annotated
+again, and SuPar parses only sentences whose words changed.
+- PhrF, TrSF, POSF, PsyF, WorF, ShaF and TraF are sums over sentences: they are added up
+again from the counts kept per sentence
+- EnDF, EnGF, VarF, TTRF, WoKF, WBKF and OSKF need the whole document: they are computed
+again only when asked for after an edit
+** spacy sees the edited sentences with one sentence of context on each side, not the whole
+text, so annotations depending on text further away can differ from a fresh extract
+"""
+import bisect
+import itertools
+
+from lingfeat import models
+from lingfeat import stats
+from lingfeat import extractor
+from lingfeat.planner import Plan, GROUP_MODELS
+from lingfeat.scanner import DocScan
+from lingfeat.utils import nan_check, count_syllables
+
+import lingfeat._Syntactic.POSF as Synta_POSF
+import lingfeat._Syntactic.PhrF as Synta_PhrF
+import lingfeat._Syntactic.TrSF as Synta_TrSF
+import lingfeat._Syntactic.parse as Synta_parse
+import lingfeat._LexicoSemantic.PsyF as LxSem_PsyF
+import lingfeat._LexicoSemantic.WorF as LxSem_WorF
+import lingfeat._ShallowTraditional.ShaF as ShaTr_ShaF
+import lingfeat._ShallowTraditional.TraF as ShaTr_TraF
+
+# subgroups added up from per-sentence counts, the others are computed over the whole document
+SENTENCE_GROUPS = ("PhrF", "TrSF", "POSF", "PsyF", "WorF", "ShaF", "TraF")
+
+# subgroups counted from SuPar trees: module, number of totals
+_PARSED_GROUPS = {"PhrF": (Synta_PhrF, len(Synta_PhrF.PHRASE_LABELS)), "TrSF": (Synta_TrSF, 2)}
+
+_LEXICON_GROUPS = {"PsyF": LxSem_PsyF, "WorF": LxSem_WorF}
+
+
+class _Sentence:
+    """
+    saves :
+    - self.text: characters of the text from this sentence up to the next one
+    - self.NLP_doc: spacy Doc of this sentence alone
+    - self.words: alphabetic tokens, this sentence's part of sent_token_list
+    - self.lemmas: lemmas of alphabetic tokens of 3+ letters, this sentence's part of token_list
+    - self.tree: SuPar tree, None until parsed or if 3 words or fewer
+    - self.counts: subgroup -> counts of this sentence, filled on first use
+    """
+    __slots__ = ("text", "NLP_doc", "words", "lemmas", "tree", "counts")
+
+    def __init__(self, text, NLP_doc):
+        doc_scan = DocScan(NLP_doc)
+        self.text = text
+        self.NLP_doc = NLP_doc
+        self.words = doc_scan.alpha_text
+        self.lemmas = [lemma for word, lemma in zip(doc_scan.alpha_text, doc_scan.alpha_lemma) if len(word) >= 3]
+        self.tree = None
+        self.counts = {"POSF": (doc_scan.pos_counts, doc_scan.n_doc_token)}
+
+    @property
+    def parsed(self):
+        # preprocess keeps only sentences of more than 3 words for parsing and TraF
+        return len(self.words) > 3
+
+
+class IncrementalDocument:
+    """
+    A text that is edited over time, re-extracted after each edit without annotating it all again
+    ** not thread-safe, use one object per thread
+
+    input :
+    - text (default ""): original input text
+    - groups (default None): subgroups that will be extracted, picks the spacy pipeline; every subgroup if None
+
+    saves :
+    - self.text
+    - self.pipeline: registry name of the spacy pipeline annotating the text
+    """
+    def __init__(self, text="", groups=None):
+        self.pipeline = models.spacy_name(Plan(groups).stages)
+        self.text = ""
+        self._sentences = []
+        self._starts = []
+        self._results = {}
+        self._LingFeat = None
+        self.update(text)
+
+    def __len__(self):
+        return len(self._sentences)
+
+    @property
+    def sentences(self):
+        """Text of each sentence, trailing whitespace included."""
+        return [sentence.text for sentence in self._sentences]
+
+    """
+    Replace the text, annotating again only the sentences around what changed
+    ** SuPar trees of re-annotated sentences whose words did not change are kept
+
+    input :
+    - text: the edited text
+
+    output:
+    - number of sentences annotated again
+    """
+    def update(self, text):
+        old = self.text
+        if text == old:
+            return 0
+        self._results = {}
+        self._LingFeat = None
+
+        if not self._sentences:
+            sentences = self._annotate(text, {})
+            self._sentences = sentences
+        else:
+            # the edit lies between the common prefix and the common suffix of old and new text
+            prefix = _common_prefix(old, text)
+            suffix = _common_prefix(old[prefix:][::-1], text[prefix:][::-1])
+            first = bisect.bisect_right(self._starts, prefix) - 1
+            last = bisect.bisect_right(self._starts, max(len(old) - suffix - 1, prefix)) - 1
+
+            # one sentence of context on each side, an edit can merge or split its neighbours
+            a = max(first - 1, 0)
+            b = min(last + 2, len(self._sentences))
+            start = self._starts[a]
+            end = (self._starts[b] if b < len(self._starts) else len(old)) + len(text) - len(old)
+
+            trees = {tuple(sentence.words): sentence.tree for sentence in self._sentences[a:b] if sentence.tree is not None}
+            sentences = self._annotate(text[start:end], trees)
+            self._sentences[a:b] = sentences
+
+        self.text = text
+        self._starts = list(itertools.accumulate([0] + [len(sentence.text) for sentence in self._sentences[:-1]]))
+        return len(sentences)
+
+    def _annotate(self, text, trees):
+        # split a stretch of text into _Sentences, reusing the trees of unchanged word sequences
+        if not text:
+            return []
+        NLP = models.get(self.pipeline)
+        with stats.stage("spacy"):
+            NLP_doc = NLP(text)
+        sents = list(NLP_doc.sents)
+        stats.count("sentences_annotated", len(sents))
+        sentences = []
+        for k, sent in enumerate(sents):
+            start = 0 if k == 0 else sent.start_char
+            end = sents[k + 1].start_char if k + 1 < len(sents) else len(text)
+            sentence = _Sentence(text[start:end], sent.as_doc())
+            sentence.tree = trees.get(tuple(sentence.words))
+            sentences.append(sentence)
+        return sentences
+
+    """
+    Extract features of the current text
+    ** results are kept until the next edit, so asking again costs nothing
+
+    input :
+    - groups (default None): subgroups to extract, e.g. ["TraF", "WorF"]
+    - features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+    - parse_batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+
+    output (type -> dictionary):
+    - the requested features
+    """
+    def extract(self, groups=None, features=None, parse_batch_size=extractor.PARSE_BATCH_SIZE):
+        plan = Plan(groups, features)
+        lacking = models.spacy_components(plan.stages) - models.pipeline_components(self.pipeline)
+        if lacking:
+            raise ValueError("IncrementalDocument was made for other subgroups, its spacy pipeline lacks: {}".format(
+                ", ".join(sorted(lacking))))
+
+        missing = [group for group in plan.groups if group not in self._results]
+        if any(group in _PARSED_GROUPS for group in missing):
+            self._parse(parse_batch_size)
+        for group in missing:
+            if group in SENTENCE_GROUPS:
+                with stats.stage(group):
+                    self._results[group] = nan_check(self._add_up(group))
+            else:
+                self._results[group] = getattr(extractor.pass_text, group + "_").compute(self._document())
+        return plan.select(extractor._merge(self._results, plan.groups))
+
+    def _parse(self, batch_size):
+        # one SuPar call for every sentence without a tree
+        unparsed = [sentence for sentence in self._sentences if sentence.parsed and sentence.tree is None]
+        if unparsed:
+            trees = Synta_parse.parse(models.get("supar"), [sentence.words for sentence in unparsed], batch_size)
+            for sentence, tree in zip(unparsed, trees):
+                sentence.tree = tree
+
+    def _add_up(self, group):
+        # a sentence subgroup's result from the counts of every sentence, counting new sentences first
+        sentences = self._sentences
+        n_sent = 1 + len(sentences)
+        n_token = 1 + sum(len(sentence.lemmas) for sentence in sentences)
+
+        if group in _LEXICON_GROUPS:
+            DB = models.get(GROUP_MODELS[group][0])
+            uncounted = [sentence for sentence in sentences if group not in sentence.counts]
+            if uncounted:
+                for sentence, scores in zip(uncounted, DB.sum_scores([sentence.lemmas for sentence in uncounted])):
+                    sentence.counts[group] = scores
+            totals = DB.scores[DB.unknown].copy()  # the all-zero row of unlisted tokens
+            for sentence in sentences:
+                totals += sentence.counts[group]
+            return _LEXICON_GROUPS[group].from_totals(totals.tolist(), n_token, n_sent)
+
+        if group == "POSF":
+            pos_counts = {}
+            n_doc_token = 0
+            for sentence in sentences:
+                counts, n = sentence.counts["POSF"]
+                for tag, count in counts.items():
+                    pos_counts[tag] = pos_counts.get(tag, 0) + count
+                n_doc_token += n
+            return Synta_POSF.from_counts(pos_counts, n_doc_token, n_token, n_sent)
+
+        if group == "ShaF":
+            for sentence in sentences:
+                if "ShaF" not in sentence.counts:
+                    sentence.counts["ShaF"] = (len(sentence.text.replace(" ", "")),
+                                               sum(count_syllables(lemma) for lemma in sentence.lemmas))
+            totals = [sum(sentence.counts["ShaF"][i] for sentence in sentences) for i in range(2)]
+            return ShaTr_ShaF.from_totals(totals, n_token, n_sent)
+
+        parsed = [sentence for sentence in sentences if sentence.parsed]
+        if group == "TraF":
+            for sentence in parsed:
+                if "TraF" not in sentence.counts:
+                    sentence.counts["TraF"] = ShaTr_TraF.sentence_counts(sentence.words)
+            return ShaTr_TraF.retrieve(self.text, None, n_sent, n_token,
+                                       sent_counts=[sentence.counts["TraF"] for sentence in parsed])
+
+        module, width = _PARSED_GROUPS[group]
+        totals = [0] * width
+        for sentence in parsed:
+            if group not in sentence.counts:
+                sentence.counts[group] = module.tree_counts(sentence.tree)
+            for i, count in enumerate(sentence.counts[group]):
+                totals[i] += count
+        return module.from_totals(totals, n_token, n_sent)
+
+    def _document(self):
+        # pass_text over the whole current text, rebuilt from the sentence Docs after an edit
+        if self._LingFeat is None:
+            from spacy.tokens import Doc
+            if self._sentences:
+                NLP_doc = Doc.from_docs([sentence.NLP_doc for sentence in self._sentences], ensure_whitespace=False)
+            else:
+                NLP_doc = models.get(self.pipeline)(self.text)
+            LingFeat = extractor.pass_text(self.text, NLP_doc=NLP_doc)
+            LingFeat.pipeline = self.pipeline
+            LingFeat.preprocess()
+            self._LingFeat = LingFeat
+        return self._LingFeat
+
+
+def _common_prefix(a, b):
+    # length of the longest common prefix, comparing slices by halves
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -0,0 +1,306 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: longdoc.py (Chunked Extraction of Long Documents)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Book-length texts are split into chunks at paragraph breaks (else after a sentence, else
+at whitespace), and each chunk goes through spacy and SuPar on its own. Only counts are
+carried from chunk to chunk, never a Doc or a tree, so memory is one chunk's annotations
+plus counters that grow with the text:
+- sums over sentences and tokens (POSF, PhrF, TrSF, ShaF, PsyF, WorF) are added up
+- TraF keeps one number per sentence of over 3 words, for SMOG
+- TTRF, VarF, EnDF and the topic subgroups keep counts per word, lemma or entity
+- EnGF keeps its entity ids, the token offset, and a cell of 17 bytes per noun or pronoun of
+the whole text: grid columns are token positions below the final sentence count, which is
+known only at the end, so no cell can be dropped before then. Only the cells under it are
+made into the grid (see EntityGrid.from_cells)
+** a sentence is never split between chunks unless a paragraph is longer than chunk_chars
+"""
+import re
+import array
+import bisect
+from collections import Counter
+
+from lingfeat import models
+from lingfeat import stats
+from lingfeat.planner import Plan, GROUP_MODELS
+from lingfeat.scanner import DocScan
+from lingfeat.utils import nan_check, count_syllables
+from lingfeat.extractor import PARSE_BATCH_SIZE
+
+import lingfeat._AdvancedSemantic.WoKF as AdSem_WoKF
+import lingfeat._AdvancedSemantic.WBKF as AdSem_WBKF
+import lingfeat._AdvancedSemantic.OSKF as AdSem_OSKF
+import lingfeat._Discourse.EnDF as Disco_EnDF
+import lingfeat._Discourse.EnGF as Disco_EnGF
+import lingfeat._Syntactic.POSF as Synta_POSF
+import lingfeat._Syntactic.PhrF as Synta_PhrF
+import lingfeat._Syntactic.TrSF as Synta_TrSF
+import lingfeat._Syntactic.parse as Synta_parse
+import lingfeat._LexicoSemantic.TTRF as LxSem_TTRF
+import lingfeat._LexicoSemantic.VarF as LxSem_VarF
+import lingfeat._LexicoSemantic.PsyF as LxSem_PsyF
+import lingfeat._LexicoSemantic.WorF as LxSem_WorF
+import lingfeat._ShallowTraditional.ShaF as ShaTr_ShaF
+import lingfeat._ShallowTraditional.TraF as ShaTr_TraF
+
+# default chunk size in characters, well under spacy's max_length of 1,000,000
+CHUNK_CHARS = 100000
+
+# sentence-final punctuation, closing quotes or brackets, then whitespace
+_SENTENCE_END = re.compile(r'[.!?]["\')\]]*\s')
+
+_TOPIC_GROUPS = {"WoKF": AdSem_WoKF, "WBKF": AdSem_WBKF, "OSKF": AdSem_OSKF}
+
+_LEXICON_GROUPS = {"PsyF": LxSem_PsyF, "WorF": LxSem_WorF}
+
+
+"""
+Split a long text into chunks of about chunk_chars characters, reading it as a stream
+
+input :
+- source: the text, or an iterable of its pieces in order, e.g. a text file object
+- chunk_chars (default 100000): most characters in a chunk, unless no cut point is found before
+
+output (type -> iterator of str):
+- chunks that join back into the text
+"""
+def chunks(source, chunk_chars=CHUNK_CHARS):
+    if isinstance(source, str):
+        text = source
+        source = (text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars))
+    pieces = []
+    size = 0
+    for piece in source:
+        pieces.append(piece)
+        size += len(piece)
+        if size <= chunk_chars:
+            continue
+        buffer = "".join(pieces)
+        while len(buffer) > chunk_chars:
+            cut = _cut(buffer, chunk_chars)
+            if cut is None:
+                # the whitespace at the cut may go on in the next piece
+                break
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+        pieces = [buffer]
+        size = len(buffer)
+    buffer = "".join(pieces)
+    if buffer:
+        yield buffer
+
+
+def _cut(buffer, limit):
+    # where to end a chunk: at a blank line, else after a sentence, else at whitespace, else at limit
+    # ** None if the whitespace at the cut runs to the end of the buffer
+    cut = buffer.rfind("\n\n", 0, limit)
+    if cut <= 0:
+        ends = [match.end() - 1 for match in _SENTENCE_END.finditer(buffer, 0, limit)]
+        if ends:
+            cut = ends[-1]
+        else:
+            cut = max(buffer.rfind(" ", 0, limit), buffer.rfind("\n", 0, limit))
+    if cut <= 0:
+        return limit
+    # the whitespace at the cut stays with this chunk: spacy attaches a space to the token before it,
+    # so the next chunk starting with one would make an extra token
+    while cut < len(buffer) and buffer[cut].isspace():
+        cut += 1
+    return cut if cut < len(buffer) else None
+
+
+def _space_tail(NLP_doc):
+    # whether the last sentence of a Doc is whitespace only
+    i = len(NLP_doc)
+    while i > 0 and NLP_doc[i - 1].is_space:
+        i -= 1
+    return i < len(NLP_doc) and (i == 0 or NLP_doc[i].is_sent_start)
+
+
+class _Totals:
+    """
+    Counts of the chunks read so far, only those the planned subgroups need
+
+    saves :
+    - self.n_doc_sent, self.n_doc_token: spacy sentences and tokens
+    - self.n_words: alphabetic tokens of 3+ letters, the length of token_list
+    """
+    def __init__(self, groups):
+        self.groups = set(groups)
+        self.space_tail = False
+        self.n_doc_sent = 0
+        self.n_doc_token = 0
+        self.n_words = 0
+        self.pos_counts = Counter()
+        self.tree_totals = {"PhrF": [0] * len(Synta_PhrF.PHRASE_LABELS), "TrSF": [0, 0]}
+        self.lexicon_totals = {}
+        # TraF: syllables, characters and words of 3+ syllables, then 2+ syllable words per parsed sentence
+        self.syllable_totals = [0, 0, 0]
+        self.poly_counts = array.array('l')
+        # ShaF: characters other than spaces, syllables of token_list
+        self.shallow_totals = [0, 0]
+        # TTRF and topic subgroups: token -> count, first position in token_list
+        self.token_counts = Counter()
+        self.first_positions = {}
+        # VarF: tag -> lemma id -> count
+        self.lemma_counts = {tag: Counter() for tag in ("NOUN", "VERB", "ADJ", "ADV")}
+        # EnDF
+        self.ent_counts = Counter()
+        # EnGF: uppercased text -> entity id, and cells (entity, token position, role code) as flat arrays
+        self.entity_ids = {}
+        self.cell_entities = array.array('l')
+        self.cell_positions = array.array('q')
+        self.cell_codes = array.array('b')
+
+    def add(self, text, NLP_doc, parse_batch_size):
+        groups = self.groups
+        doc_scan = DocScan(NLP_doc)
+        if self.space_tail:
+            # in the whole text, the previous chunk's trailing whitespace is part of a neighbouring sentence
+            self.n_doc_sent -= 1
+        self.space_tail = _space_tail(NLP_doc)
+
+        # preprocess of this chunk alone
+        sent_token_list = [[] for i in range(doc_scan.n_doc_sent)]
+        token_list = []
+        for i, word, lemma in zip(doc_scan.alpha_sent, doc_scan.alpha_text, doc_scan.alpha_lemma):
+            sent_token_list[i].append(word)
+            if len(word) >= 3:
+                token_list.append(lemma)
+        sent_token_list = [sent for sent in sent_token_list if len(sent) > 3]
+
+        if "POSF" in groups:
+            self.pos_counts.update(doc_scan.pos_counts)
+        if "PhrF" in groups or "TrSF" in groups:
+            for parsed_tree in Synta_parse.parse(models.get("supar"), sent_token_list, parse_batch_size):
+                for group, module in (("PhrF", Synta_PhrF), ("TrSF", Synta_TrSF)):
+                    if group in groups:
+                        totals = self.tree_totals[group]
+                        for i, count in enumerate(module.tree_counts(parsed_tree)):
+                            totals[i] += count
+        for group in _LEXICON_GROUPS:
+            if group in groups:
+                scores = models.get(GROUP_MODELS[group][0]).sum_scores([token_list])[0]
+                if group in self.lexicon_totals:
+                    self.lexicon_totals[group] += scores
+                else:
+                    self.lexicon_totals[group] = scores
+        if "TraF" in groups:
+            for sent in sent_token_list:
+                n_syll, n_char, n_diff_token, n_poly_token = ShaTr_TraF.sentence_counts(sent)
+                self.syllable_totals[0] += n_syll
+                self.syllable_totals[1] += n_char
+                self.syllable_totals[2] += n_diff_token
+                self.poly_counts.append(n_poly_token)
+        if "ShaF" in groups:
+            self.shallow_totals[0] += len(text.replace(" ", ""))
+            self.shallow_totals[1] += sum(count_syllables(token) for token in token_list)
+        if "TTRF" in groups or groups.intersection(_TOPIC_GROUPS):
+            self.token_counts.update(token_list)
+            for position, token in enumerate(token_list, self.n_words):
+                self.first_positions.setdefault(token, position)
+        if "VarF" in groups:
+            import numpy as np
+            for tag, lemmas in doc_scan.lemmas_by_pos.items():
+                # lemma ids are string hashes, the same in every chunk
+                ids, counts = np.unique(lemmas, return_counts=True)
+                self.lemma_counts[tag].update(dict(zip(ids.tolist(), counts.tolist())))
+        if "EnDF" in groups:
+            self.ent_counts.update(doc_scan.ent_texts)
+        if "EnGF" in groups:
+            for position, entity, dep in doc_scan.noun_roles:
+                self.cell_entities.append(self.entity_ids.setdefault(entity, len(self.entity_ids)))
+                self.cell_positions.append(self.n_doc_token + position)
+                self.cell_codes.append(Disco_EnGF.ROLE_CODES[Disco_EnGF.dependency_mapping(dep)])
+
+        self.n_doc_sent += doc_scan.n_doc_sent
+        self.n_doc_token += doc_scan.n_doc_token
+        self.n_words += len(token_list)
+
+    def result(self, group):
+        # the features of a subgroup over every chunk read
+        n_sent = 1 + self.n_doc_sent
+        n_token = 1 + self.n_words
+        if group == "POSF":
+            return Synta_POSF.from_counts(self.pos_counts, self.n_doc_token, n_token, n_sent)
+        if group == "PhrF":
+            return Synta_PhrF.from_totals(self.tree_totals["PhrF"], n_token, n_sent)
+        if group == "TrSF":
+            return Synta_TrSF.from_totals(self.tree_totals["TrSF"], n_token, n_sent)
+        if group in _LEXICON_GROUPS:
+            totals = self.lexicon_totals.get(group)
+            if totals is None:
+                return _LEXICON_GROUPS[group].retrieve([], n_token, n_sent)
+            return _LEXICON_GROUPS[group].from_totals(totals.tolist(), n_token, n_sent)
+        if group == "TraF":
+            totals = self.syllable_totals + [ShaTr_TraF.smog_poly_count(self.poly_counts, n_sent)]
+            return ShaTr_TraF.from_totals(totals, n_sent, n_token)
+        if group == "ShaF":
+            return ShaTr_ShaF.from_totals(self.shallow_totals, n_token, n_sent)
+        if group == "TTRF":
+            once_positions = sorted(
+                self.first_positions[token] for token, count in self.token_counts.items() if count == 1)
+            return LxSem_TTRF.from_once(n_token, self.n_words, once_positions)
+        if group in _TOPIC_GROUPS:
+            # the topic models read a bag of words, the counts are enough
+            return _TOPIC_GROUPS[group].retrieve(self.token_counts)
+        if group == "VarF":
+            once = {tag: sum(1 for count in counts.values() if count == 1) for tag, counts in self.lemma_counts.items()}
+            total = {tag: sum(counts.values()) for tag, counts in self.lemma_counts.items()}
+            return LxSem_VarF.from_counts(once, total)
+        if group == "EnDF":
+            to_UEnti_C = sum(1 for count in self.ent_counts.values() if count == 1)
+            return Disco_EnDF.from_counts(sum(self.ent_counts.values()), to_UEnti_C, n_sent, n_token)
+        if group == "EnGF":
+            # grid columns are token positions, so only tokens before position n_sent fill a cell
+            end = bisect.bisect_left(self.cell_positions, n_sent)
+            cells = zip(self.cell_entities[:end], self.cell_positions[:end], self.cell_codes[:end])
+            return Disco_EnGF.EntityGrid.from_cells(len(self.entity_ids), cells, n_sent).retrieve()
+        raise ValueError("Unknown feature group: {}".format(group))
+
+
+"""
+Extract features from a text too long for one spacy Doc, chunk by chunk
+** features are those of the whole text, combined from the counts of every chunk
+** memory grows with the text through the counters listed at the top of this file, most of
+all EnGF's cells: about 17 bytes per noun or pronoun
+
+input :
+- source: the text, or an iterable of its pieces in order, e.g. a text file object
+- groups (default None): subgroups to extract, e.g. ["TraF", "WorF"]
+- features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+- chunk_chars (default 100000): most characters spacy annotates at once
+- parse_batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+
+output (type -> dictionary):
+- the requested features
+"""
+def extract_long(source, groups=None, features=None, chunk_chars=CHUNK_CHARS, parse_batch_size=PARSE_BATCH_SIZE):
+    plan = Plan(groups, features)
+    NLP = models.get(models.spacy_name(plan.stages))
+    if chunk_chars > NLP.max_length:
+        raise ValueError("chunk_chars {} is over spacy's max_length {}".format(chunk_chars, NLP.max_length))
+
+    totals = _Totals(plan.groups)
+    for chunk in chunks(source, chunk_chars):
+        with stats.stage("spacy"):
+            NLP_doc = NLP(chunk)
+        stats.count("chunks")
+        stats.count("tokens_processed", len(NLP_doc))
+        totals.add(chunk, NLP_doc, parse_batch_size)
+        del NLP_doc
+    stats.count("documents")
+
+    result = {}
+    for group in plan.groups:
+        with stats.stage(group):
+            result.update(nan_check(totals.result(group)))
+    return plan.select(result)
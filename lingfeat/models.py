@@ -0,0 +1,262 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: models.py (Lazy Model Registry)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Heavy models (spaCy, SuPar, LDA, lexicons) are imported and loaded the first time they are
+asked for, then kept for the life of the process.
+"""
+import os
+import hashlib
+import threading
+
+from lingfeat import stats
+
+# current path
+dir_path = os.path.dirname(os.path.realpath(__file__))
+
+# name -> function that imports and loads the model
+_loaders = {}
+
+# name -> loaded model
+_models = {}
+
+# name -> lock held while that model loads, so two threads never load it twice
+_locks = {}
+_registry_lock = threading.Lock()
+
+# name -> function listing the files a model is loaded from, see fingerprint()
+_files = {}
+
+# name -> fingerprint, computed once per process
+_fingerprints = {}
+
+
+def register(name):
+    """Register the decorated function as the loader of model `name`."""
+    def decorator(loader):
+        _loaders[name] = loader
+        return loader
+    return decorator
+
+
+def _lock_for(name):
+    with _registry_lock:
+        if name not in _locks:
+            _locks[name] = threading.Lock()
+        return _locks[name]
+
+
+def get(name):
+    """Return model `name`, loading it on first use."""
+    try:
+        return _models[name]
+    except KeyError:
+        pass
+    if name not in _loaders:
+        raise KeyError("Unknown model: {}".format(name))
+    with _lock_for(name):
+        if name not in _models:
+            with stats.stage("load:" + name):
+                _models[name] = _loaders[name]()
+            stats.count("models_loaded")
+        return _models[name]
+
+
+def is_loaded(name):
+    return name in _models
+
+
+def preload(names):
+    """Load every model in `names` now instead of on first use."""
+    for name in names:
+        get(name)
+
+
+def evict(names=None):
+    """Drop models from the registry (all of them if names is None); they reload on next use."""
+    if names is None:
+        names = list(_models)
+    for name in names:
+        with _lock_for(name):
+            _models.pop(name, None)
+
+
+def _package_version(package):
+    try:
+        from importlib.metadata import version
+    except ImportError:
+        # python < 3.8
+        from pkg_resources import get_distribution
+        version = lambda package: get_distribution(package).version
+    try:
+        return version(package)
+    except Exception:
+        return "missing"
+
+
+def _file_checksum(path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return "missing"
+    return digest.hexdigest()
+
+
+def fingerprint(name):
+    """
+    String that changes whenever model `name` would give different output, without loading it
+    ** spacy and SuPar are identified by package versions, LDA models and lexicons by file checksums
+    """
+    try:
+        return _fingerprints[name]
+    except KeyError:
+        pass
+    if name == "spacy" or name.startswith("spacy/"):
+        value = "{} spacy={} {}={}".format(
+            name, _package_version("spacy"), SPACY_MODEL, _package_version(SPACY_MODEL))
+    elif name == "supar":
+        value = "supar supar={} crf-con-en".format(_package_version("supar"))
+    elif name in _files:
+        value = name + " " + " ".join(
+            os.path.basename(path) + "=" + _file_checksum(path) for path in _files[name]())
+    else:
+        raise KeyError("Unknown model: {}".format(name))
+    _fingerprints[name] = value
+    return value
+
+
+# spacy pipeline, registered as "spacy" with every component and "spacy/<components>" when pruned
+SPACY_MODEL = 'en_core_web_sm'
+SPACY_COMPONENTS = ("tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner")
+
+# spacy components each annotation stage needs, see lingfeat/planner.py
+# ** by default sentences come from the dependency parser, as in the full pipeline: every subgroup
+# depends on n_sent, so a lighter segmenter would change values with the rest of the request.
+# The senter stage is the opt-in exception, and its pipelines are registered under other names
+STAGE_COMPONENTS = {
+    "sentences": ("tok2vec", "parser"),
+    "senter": ("senter",),
+    "tagger": ("tok2vec", "tagger", "attribute_ruler", "lemmatizer"),
+    "parser": ("tok2vec", "parser"),
+    "ner": ("ner",),
+}
+FULL_COMPONENTS = frozenset(("tok2vec", "tagger", "attribute_ruler", "lemmatizer", "parser", "ner"))
+
+
+def spacy_components(stages):
+    """spacy components to run for the given annotation stages, the same sentences whatever the stages."""
+    components = set()
+    for stage in stages:
+        components.update(STAGE_COMPONENTS.get(stage, ()))
+    return frozenset(components)
+
+
+def _spacy_loader(components):
+    def load():
+        import spacy
+        exclude = [name for name in SPACY_COMPONENTS + ("senter",) if name not in components]
+        NLP = spacy.load(SPACY_MODEL, exclude=exclude)
+        if "senter" in components:
+            # shipped disabled, never together with the parser, see lingfeat.planner.Plan
+            NLP.enable_pipe("senter")
+        return NLP
+    return load
+
+
+register("spacy")(_spacy_loader(FULL_COMPONENTS))
+
+
+def spacy_name(stages=None):
+    """Registry name of the spacy pipeline for the given annotation stages (every component if None)."""
+    if stages is None:
+        return "spacy"
+    components = spacy_components(stages)
+    if components == FULL_COMPONENTS:
+        return "spacy"
+    name = "spacy/" + "+".join(sorted(components))
+    with _registry_lock:
+        if name not in _loaders:
+            _loaders[name] = _spacy_loader(components)
+    return name
+
+
+def pipeline_components(name):
+    """spacy components of the pipeline registered as `name` by spacy_name()."""
+    if name == "spacy":
+        return FULL_COMPONENTS
+    return frozenset(name[len("spacy/"):].split("+"))
+
+
+def get_spacy(stages=None):
+    """Return the spacy pipeline for the given annotation stages (every component if None), one cached variant per component set."""
+    return get(spacy_name(stages))
+
+
+@register("supar")
+def _load_supar():
+    # silence supar progress bars, must happen before supar is imported
+    import tqdm
+    def nop(it, *a, **k):
+        return it
+    tqdm.tqdm = nop
+    from supar import Parser
+    return Parser.load('crf-con-en')
+
+
+# topic models behind WoKF_, WBKF_ and OSKF_, registered as "lda/<corpus><n_topic>"
+LDA_CORPORA = ("enwiki", "weebit", "onestop")
+LDA_N_TOPICS = (50, 100, 150, 200)
+
+
+def lda_name(corpus, n_topic):
+    return "lda/" + corpus + str(n_topic)
+
+
+def _lda_files(path):
+    # gensim saves large arrays next to the model, e.g. <path>.expElogbeta.npy
+    directory, base = os.path.split(path)
+    if not os.path.isdir(directory):
+        return [path]
+    return [path] + sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.startswith(base + "."))
+
+
+def _lda_loader(path):
+    def load():
+        import gensim
+        return gensim.models.ldamodel.LdaModel.load(path)
+    return load
+
+
+for _corpus in LDA_CORPORA:
+    for _n_topic in LDA_N_TOPICS:
+        _path = dir_path + "/_AdvancedSemantic/model/" + _corpus + str(_n_topic)
+        register(lda_name(_corpus, _n_topic))(_lda_loader(_path))
+        _files[lda_name(_corpus, _n_topic)] = lambda _path=_path: _lda_files(_path)
+
+
+# word score lexicons behind WorF_ and PsyF_, score columns in the order the feature modules sum them
+_files["lexicon/subtlexus"] = lambda: [dir_path + '/_LexicoSemantic/resources/SUBTLEXus.csv']
+_files["lexicon/aoakuperman"] = lambda: [dir_path + '/_LexicoSemantic/resources/AoAKuperman.csv']
+
+
+@register("lexicon/subtlexus")
+def _load_subtlexus():
+    from lingfeat._LexicoSemantic.lexicon import Lexicon
+    return Lexicon(dir_path + '/_LexicoSemantic/resources/SUBTLEXus.csv', 'Word_lowercased', (1, 2, 3, 4, 5, 6, 7, 8))
+
+
+@register("lexicon/aoakuperman")
+def _load_aoakuperman():
+    from lingfeat._LexicoSemantic.lexicon import Lexicon
+    return Lexicon(dir_path + '/_LexicoSemantic/resources/AoAKuperman.csv', 'Word', (7, 9, 11, 12, 13))
@@ -0,0 +1,143 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: parallel.py (Multi-process Corpus Runner)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Spreads extract_many over a pool of worker processes. Each worker loads its models
+once, in the pool initializer, and receives documents in chunks.
+"""
+import os
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from lingfeat import cache
+from lingfeat.planner import Plan
+
+# set in each worker by _init_worker
+_worker_options = None
+
+
+def rss_mb():
+    """Resident memory of this process in MB."""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # no /proc (e.g. macOS): fall back to the peak, which is in bytes there
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _init_worker(groups, features, parse_batch_size, cache_settings, errors, sentence_splitter):
+    global _worker_options
+    from lingfeat import extractor, cache
+    _worker_options = (groups, features, parse_batch_size, errors, sentence_splitter)
+    if cache_settings is not None:
+        cache.enable(*cache_settings)
+    extractor.warmup(Plan(groups, features).groups, sentence_splitter)
+
+
+def _work(chunk):
+    from lingfeat import extractor
+    groups, features, parse_batch_size, errors, sentence_splitter = _worker_options
+    results = extractor.extract_many(
+        chunk, groups, features, batch_size=len(chunk), parse_batch_size=parse_batch_size, errors=errors,
+        sentence_splitter=sentence_splitter)
+    return results, rss_mb()
+
+
+def _chunks(texts, chunk_size):
+    texts = iter(texts)
+    while True:
+        chunk = list(itertools.islice(texts, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def extract(texts, groups=None, features=None, n_workers=None, chunk_size=64,
+            max_docs_per_worker=None, max_rss_mb=None, parse_batch_size=5000, mp_context=None, errors="raise",
+            sentence_splitter="parser"):
+    """
+    Extract features from many texts with a pool of worker processes
+
+    input :
+    - texts: iterable of original input texts, read lazily
+    - groups, features, sentence_splitter: as in extractor.extract
+    - n_workers (default os.cpu_count()): number of worker processes
+    - chunk_size (default 64): number of texts sent to a worker at a time
+    - max_docs_per_worker (default None): replace the pool once it has handled this many texts per worker
+    - max_rss_mb (default None): replace the pool once a worker reports more resident memory than this
+    - parse_batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+    - mp_context (default None): multiprocessing context for the pool
+    - errors (default "raise"): as in extractor.extract_many, a function must be picklable
+    ** the pool is recycled as a whole: it stops taking chunks, finishes the ones in flight,
+    and a fresh pool with freshly loaded models takes over
+    ** if lingfeat.cache is enabled here, workers use the same cache file
+
+    output (type -> iterator of dictionary):
+    - one dictionary per text, in input order
+    """
+    # fail early on unknown subgroups or feature codes
+    Plan(groups, features, sentence_splitter)
+    if errors not in ("raise", "skip", "nan") and not callable(errors):
+        raise ValueError("errors must be 'raise', 'skip', 'nan' or a function, not {!r}".format(errors))
+    n_workers = n_workers or os.cpu_count() or 1
+    chunks = _chunks(texts, chunk_size)
+    store = cache.active()
+    cache_settings = None if store is None else (store.path, store.max_bytes)
+    initargs = (groups, features, parse_batch_size, cache_settings, errors, sentence_splitter)
+
+    # futures in submission order, at most two chunks per worker in flight
+    pending = deque()
+    executor = None
+    exhausted = False
+    try:
+        while True:
+            if exhausted and not pending:
+                break
+            if executor is None:
+                executor = ProcessPoolExecutor(
+                    max_workers=n_workers, mp_context=mp_context,
+                    initializer=_init_worker, initargs=initargs)
+                docs_in_pool = 0
+                recycle = False
+
+            while not exhausted and not recycle and len(pending) < 2 * n_workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending.append(executor.submit(_work, chunk))
+                docs_in_pool += len(chunk)
+                if max_docs_per_worker is not None and docs_in_pool >= max_docs_per_worker * n_workers:
+                    recycle = True
+
+            if not pending:
+                continue
+
+            results, worker_rss_mb = pending.popleft().result()
+            for result in results:
+                yield result
+            if max_rss_mb is not None and worker_rss_mb > max_rss_mb:
+                recycle = True
+
+            if recycle and not pending:
+                executor.shutdown(wait=True)
+                executor = None
+    finally:
+        if executor is not None:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
@@ -0,0 +1,134 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: planner.py (Feature Group Planner)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Works out which subgroups, annotation stages and models a request for subgroups
+or individual feature codes needs, so nothing else runs.
+"""
+from lingfeat import models
+from lingfeat.schema import FEATURE_GROUPS, FEATURES, FEATURE_GROUP
+
+# annotation stages
+# - sentences: sentence boundaries from the dependency parser
+# - senter: sentence boundaries from spacy's faster segmenter, in place of sentences when asked for
+# - tagger: part-of-speech tags and lemmas
+# - parser: dependency labels
+# - ner: named entities
+# - supar: constituency trees
+# - lda: topic inference
+# - lexicon: word score lookup
+STAGES = ("sentences", "senter", "tagger", "parser", "ner", "supar", "lda", "lexicon")
+
+# where sentence boundaries can come from, see Plan
+SENTENCE_SPLITTERS = ("parser", "senter")
+
+# stages each subgroup needs
+GROUP_STAGES = {
+    "WoKF": ("sentences", "tagger", "lda"),
+    "WBKF": ("sentences", "tagger", "lda"),
+    "OSKF": ("sentences", "tagger", "lda"),
+    "EnDF": ("sentences", "ner"),
+    "EnGF": ("sentences", "tagger", "parser"),
+    "PhrF": ("sentences", "supar"),
+    "TrSF": ("sentences", "supar"),
+    "POSF": ("sentences", "tagger"),
+    "TTRF": ("sentences", "tagger"),
+    "VarF": ("sentences", "tagger"),
+    "PsyF": ("sentences", "tagger", "lexicon"),
+    "WorF": ("sentences", "tagger", "lexicon"),
+    "ShaF": ("sentences", "tagger"),
+    "TraF": ("sentences",),
+}
+
+# heavy models each subgroup needs on top of spacy, loaded on first use
+GROUP_MODELS = {
+    "WoKF": tuple(models.lda_name("enwiki", n_topic) for n_topic in models.LDA_N_TOPICS),
+    "WBKF": tuple(models.lda_name("weebit", n_topic) for n_topic in models.LDA_N_TOPICS),
+    "OSKF": tuple(models.lda_name("onestop", n_topic) for n_topic in models.LDA_N_TOPICS),
+    "PhrF": ("supar",),
+    "TrSF": ("supar",),
+    "PsyF": ("lexicon/aoakuperman",),
+    "WorF": ("lexicon/subtlexus",),
+}
+
+
+class Plan:
+    """
+    input :
+    - groups (default None): subgroups to extract, e.g. ["TraF", "WorF"]
+    - features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+    - sentence_splitter (default "parser"): "parser" for the dependency parser's sentences, the same
+    whatever the subgroups; "senter" for spacy's faster segmenter, which skips the parser and gives
+    slightly different sentences
+    ** "senter" cannot plan EnGF: the parser it needs splits sentences again wherever it likes
+    ** with neither groups nor features, every subgroup is planned; with both, their union is
+
+    saves :
+    - self.groups: subgroups to run, in FEATURE_GROUPS order
+    - self.features: feature codes to return, in schema order, None for every code of self.groups
+    - self.columns: feature codes to return, in schema order, never None
+    - self.stages: annotation stages the subgroups need
+    - self.sentence_splitter
+    - self.models: registry names of the models the subgroups need
+    """
+    def __init__(self, groups=None, features=None, sentence_splitter="parser"):
+        if sentence_splitter not in SENTENCE_SPLITTERS:
+            raise ValueError("Unknown sentence splitter: {}".format(sentence_splitter))
+        wanted = set()
+        if groups is not None:
+            for group in groups:
+                if group not in FEATURES:
+                    raise ValueError("Unknown feature group: {}".format(group))
+                wanted.add(group)
+        if features is not None:
+            for feature in features:
+                if feature not in FEATURE_GROUP:
+                    raise ValueError("Unknown feature: {}".format(feature))
+                wanted.add(FEATURE_GROUP[feature])
+        if groups is None and features is None:
+            wanted = set(FEATURE_GROUPS)
+
+        self.groups = tuple(group for group in FEATURE_GROUPS if group in wanted)
+
+        if features is None:
+            self.features = None
+        else:
+            whole_groups = set(groups or ())
+            requested = set(features)
+            self.features = tuple(
+                feature for group in self.groups for feature in FEATURES[group]
+                if group in whole_groups or feature in requested)
+
+        if self.features is None:
+            self.columns = tuple(feature for group in self.groups for feature in FEATURES[group])
+        else:
+            self.columns = self.features
+
+        self.sentence_splitter = sentence_splitter
+        self.stages = frozenset(stage for group in self.groups for stage in GROUP_STAGES[group])
+        if sentence_splitter == "senter":
+            needs_parser = [group for group in self.groups if "parser" in GROUP_STAGES[group]]
+            if needs_parser:
+                raise ValueError("sentence_splitter 'senter' cannot be used with subgroups needing the parser: {}".format(
+                    ", ".join(needs_parser)))
+            self.stages = (self.stages - {"sentences"}) | {"senter"}
+
+        self.models = []
+        for group in self.groups:
+            for name in GROUP_MODELS.get(group, ()):
+                if name not in self.models:
+                    self.models.append(name)
+
+    def select(self, result):
+        """Keep only the planned feature codes of a merged subgroup result."""
+        if self.features is None:
+            return result
+        return {feature: result[feature] for feature in self.features}
@@ -0,0 +1,81 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: scanner.py (Single-pass Doc Scanner)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Reads the token attributes of a spaCy Doc once, as integer arrays, and keeps what
+preprocess, POSF, VarF, EnDF and EnGF need so none of them walks the Doc again.
+"""
+
+# tags VarF keeps lemmas for
+VARIATION_TAGS = ("NOUN", "VERB", "ADJ", "ADV")
+
+# tags EnGF treats as entities
+NOUN_TAGS = ("NOUN", "PRON", "PROPN")
+
+
+class DocScan:
+    """
+    saves :
+    - self.n_doc_token: number of spacy tokens, punctuation included
+    - self.pos_counts: part-of-speech tag -> count
+    - self.lemmas_by_pos: tag -> numpy array of lemma ids, for VARIATION_TAGS
+    - self.n_doc_sent: number of spacy sentences
+    - self.alpha_sent: sentence index of each alphabetic token
+    - self.alpha_text: text of each alphabetic token
+    - self.alpha_lemma: lowercased lemma of each alphabetic token
+    - self.noun_roles: (token index, uppercased text, dependency tag) of each NOUN_TAGS token
+    - self.ent_texts: text of each entity mention
+    """
+    def __init__(self, NLP_doc):
+        import numpy as np
+        from spacy.attrs import ORTH, LEMMA, POS, DEP, IS_ALPHA
+
+        strings = NLP_doc.vocab.strings
+        pos_id = {tag: strings[tag] for tag in VARIATION_TAGS + NOUN_TAGS}
+
+        self.n_doc_token = len(NLP_doc)
+        self.pos_counts = {strings[pos]: count for pos, count in NLP_doc.count_by(POS).items()}
+
+        array = NLP_doc.to_array([ORTH, LEMMA, POS, DEP, IS_ALPHA])
+        orth = array[:, 0]
+        lemma = array[:, 1]
+        pos = array[:, 2]
+        dep = array[:, 3]
+        is_alpha = array[:, 4]
+
+        self.lemmas_by_pos = {tag: lemma[pos == pos_id[tag]] for tag in VARIATION_TAGS}
+
+        # sentence index of every token
+        sent_starts = [sent.start for sent in NLP_doc.sents]
+        self.n_doc_sent = len(sent_starts)
+        sent_index = np.searchsorted(sent_starts, np.arange(self.n_doc_token), side='right') - 1
+
+        # ids repeat a lot, look each one up in the string store once
+        string_of = {}
+        def lookup(key):
+            try:
+                return string_of[key]
+            except KeyError:
+                string_of[key] = strings[key]
+                return string_of[key]
+
+        alpha_positions = np.flatnonzero(is_alpha)
+        self.alpha_sent = sent_index[alpha_positions].tolist()
+        self.alpha_text = [lookup(key) for key in orth[alpha_positions].tolist()]
+        self.alpha_lemma = [lookup(key).lower() for key in lemma[alpha_positions].tolist()]
+
+        noun_positions = np.flatnonzero(np.isin(pos, [pos_id[tag] for tag in NOUN_TAGS]))
+        self.noun_roles = [
+            (position, lookup(text_key).upper(), lookup(dep_key) if dep_key else "")
+            for position, text_key, dep_key in zip(
+                noun_positions.tolist(), orth[noun_positions].tolist(), dep[noun_positions].tolist())]
+
+        self.ent_texts = [ent.text for ent in NLP_doc.ents]
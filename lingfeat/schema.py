@@ -0,0 +1,184 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: schema.py (Feature Schema)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Every feature code, grouped by the subgroup that computes it, in the order the
+subgroups return them, and the fixed column layout of feature arrays.
+"""
+from collections import namedtuple
+from collections.abc import Mapping
+
+# feature subgroups, in the order they are documented in extractor.py
+FEATURE_GROUPS = ("WoKF", "WBKF", "OSKF", "EnDF", "EnGF", "PhrF", "TrSF", "POSF", "TTRF", "VarF", "PsyF", "WorF", "ShaF", "TraF")
+
+# subgroup -> feature codes
+FEATURES = {
+    # Wiki Knowledge Features -> 16
+    "WoKF": (
+        "WRich05_S", "WRich10_S", "WRich15_S", "WRich20_S",
+        "WClar05_S", "WClar10_S", "WClar15_S", "WClar20_S",
+        "WNois05_S", "WNois10_S", "WNois15_S", "WNois20_S",
+        "WTopc05_S", "WTopc10_S", "WTopc15_S", "WTopc20_S",
+    ),
+    # WeeBit Corpus Knowledge Features -> 16
+    "WBKF": (
+        "BRich05_S", "BRich10_S", "BRich15_S", "BRich20_S",
+        "BClar05_S", "BClar10_S", "BClar15_S", "BClar20_S",
+        "BNois05_S", "BNois10_S", "BNois15_S", "BNois20_S",
+        "BTopc05_S", "BTopc10_S", "BTopc15_S", "BTopc20_S",
+    ),
+    # OneStopEng Corpus Knowledge Features -> 16
+    "OSKF": (
+        "ORich05_S", "ORich10_S", "ORich15_S", "ORich20_S",
+        "OClar05_S", "OClar10_S", "OClar15_S", "OClar20_S",
+        "ONois05_S", "ONois10_S", "ONois15_S", "ONois20_S",
+        "OTopc05_S", "OTopc10_S", "OTopc15_S", "OTopc20_S",
+    ),
+    # Entity Density Features -> 6
+    "EnDF": (
+        "to_EntiM_C", "as_EntiM_C", "at_EntiM_C", "to_UEnti_C",
+        "as_UEnti_C", "at_UEnti_C",
+    ),
+    # Entity Grid Features -> 22
+    "EnGF": (
+        "ra_SSTo_C", "ra_SOTo_C", "ra_SXTo_C", "ra_SNTo_C",
+        "ra_OSTo_C", "ra_OOTo_C", "ra_OXTo_C", "ra_ONTo_C",
+        "ra_XSTo_C", "ra_XOTo_C", "ra_XXTo_C", "ra_XNTo_C",
+        "ra_NSTo_C", "ra_NOTo_C", "ra_NXTo_C", "ra_NNTo_C",
+        "LoCohPA_S", "LoCohPW_S", "LoCohPU_S", "LoCoDPA_S",
+        "LoCoDPW_S", "LoCoDPU_S",
+    ),
+    # Phrasal Features -> 48
+    "PhrF": (
+        "to_NoPhr_C", "as_NoPhr_C", "at_NoPhr_C", "ra_NoVeP_C",
+        "ra_NoSuP_C", "ra_NoPrP_C", "ra_NoAjP_C", "ra_NoAvP_C",
+        "to_VePhr_C", "as_VePhr_C", "at_VePhr_C", "ra_VeNoP_C",
+        "ra_VeSuP_C", "ra_VePrP_C", "ra_VeAjP_C", "ra_VeAvP_C",
+        "to_SuPhr_C", "as_SuPhr_C", "at_SuPhr_C", "ra_SuNoP_C",
+        "ra_SuVeP_C", "ra_SuPrP_C", "ra_SuAjP_C", "ra_SuAvP_C",
+        "to_PrPhr_C", "as_PrPhr_C", "at_PrPhr_C", "ra_PrNoP_C",
+        "ra_PrVeP_C", "ra_PrSuP_C", "ra_PrAjP_C", "ra_PrAvP_C",
+        "to_AjPhr_C", "as_AjPhr_C", "at_AjPhr_C", "ra_AjNoP_C",
+        "ra_AjVeP_C", "ra_AjSuP_C", "ra_AjPrP_C", "ra_AjAvP_C",
+        "to_AvPhr_C", "as_AvPhr_C", "at_AvPhr_C", "ra_AvNoP_C",
+        "ra_AvVeP_C", "ra_AvSuP_C", "ra_AvPrP_C", "ra_AvAjP_C",
+    ),
+    # Tree Structure Features -> 6
+    "TrSF": (
+        "to_TreeH_C", "as_TreeH_C", "at_TreeH_C", "to_FTree_C",
+        "as_FTree_C", "at_FTree_C",
+    ),
+    # Part-of-Speech Features -> 55
+    "POSF": (
+        "to_NoTag_C", "as_NoTag_C", "at_NoTag_C", "ra_NoAjT_C",
+        "ra_NoVeT_C", "ra_NoAvT_C", "ra_NoSuT_C", "ra_NoCoT_C",
+        "to_VeTag_C", "as_VeTag_C", "at_VeTag_C", "ra_VeAjT_C",
+        "ra_VeNoT_C", "ra_VeAvT_C", "ra_VeSuT_C", "ra_VeCoT_C",
+        "to_AjTag_C", "as_AjTag_C", "at_AjTag_C", "ra_AjNoT_C",
+        "ra_AjVeT_C", "ra_AjAvT_C", "ra_AjSuT_C", "ra_AjCoT_C",
+        "to_AvTag_C", "as_AvTag_C", "at_AvTag_C", "ra_AvAjT_C",
+        "ra_AvNoT_C", "ra_AvVeT_C", "ra_AvSuT_C", "ra_AvCoT_C",
+        "to_SuTag_C", "as_SuTag_C", "at_SuTag_C", "ra_SuAjT_C",
+        "ra_SuNoT_C", "ra_SuVeT_C", "ra_SuAvT_C", "ra_SuCoT_C",
+        "to_CoTag_C", "as_CoTag_C", "at_CoTag_C", "ra_CoAjT_C",
+        "ra_CoNoT_C", "ra_CoVeT_C", "ra_CoAvT_C", "ra_CoSuT_C",
+        "to_ContW_C", "as_ContW_C", "at_ContW_C", "to_FuncW_C",
+        "as_FuncW_C", "at_FuncW_C", "ra_CoFuW_C",
+    ),
+    # Type Token Ratio Features -> 5
+    "TTRF": (
+        "SimpTTR_S", "CorrTTR_S", "BiLoTTR_S", "UberTTR_S",
+        "MTLDTTR_S",
+    ),
+    # Variation Ratio Features -> 12
+    "VarF": (
+        "SimpNoV_S", "SquaNoV_S", "CorrNoV_S", "SimpVeV_S",
+        "SquaVeV_S", "CorrVeV_S", "SimpAjV_S", "SquaAjV_S",
+        "CorrAjV_S", "SimpAvV_S", "SquaAvV_S", "CorrAvV_S",
+    ),
+    # Psycholinguistic Features -> 15
+    "PsyF": (
+        "to_AAKuW_C", "as_AAKuW_C", "at_AAKuW_C", "to_AAKuL_C",
+        "as_AAKuL_C", "at_AAKuL_C", "to_AABiL_C", "as_AABiL_C",
+        "at_AABiL_C", "to_AABrL_C", "as_AABrL_C", "at_AABrL_C",
+        "to_AACoL_C", "as_AACoL_C", "at_AACoL_C",
+    ),
+    # Word Frequency Features -> 24
+    "WorF": (
+        "to_SbFrQ_C", "as_SbFrQ_C", "at_SbFrQ_C", "to_SbCDC_C",
+        "as_SbCDC_C", "at_SbCDC_C", "to_SbFrL_C", "as_SbFrL_C",
+        "at_SbFrL_C", "to_SbCDL_C", "as_SbCDL_C", "at_SbCDL_C",
+        "to_SbSBW_C", "as_SbSBW_C", "at_SbSBW_C", "to_SbL1W_C",
+        "as_SbL1W_C", "at_SbL1W_C", "to_SbSBC_C", "as_SbSBC_C",
+        "at_SbSBC_C", "to_SbL1C_C", "as_SbL1C_C", "at_SbL1C_C",
+    ),
+    # Shallow Features -> 8
+    "ShaF": (
+        "TokSenM_S", "TokSenS_S", "TokSenL_S", "as_Token_C",
+        "as_Sylla_C", "at_Sylla_C", "as_Chara_C", "at_Chara_C",
+    ),
+    # Traditional Formulas Features -> 6
+    "TraF": (
+        "FleschG_S", "AutoRea_S", "ColeLia_S", "SmogInd_S",
+        "Gunning_S", "LinseaW_S",
+    ),
+}
+
+# feature code -> subgroup
+FEATURE_GROUP = {feature: group for group in FEATURE_GROUPS for feature in FEATURES[group]}
+
+# bump whenever a feature code is added, removed, renamed or moved: column indexes change with it
+SCHEMA_VERSION = 1
+
+# every feature code, in FEATURE_GROUPS order, the columns of a full feature array
+COLUMNS = tuple(feature for group in FEATURE_GROUPS for feature in FEATURES[group])
+
+# feature code -> column index in COLUMNS
+COLUMN_INDEX = {feature: index for index, feature in enumerate(COLUMNS)}
+
+# feature code -> dtype, counts included: they are divided and averaged alongside everything else
+FEATURE_DTYPE = {feature: "float64" for feature in COLUMNS}
+
+Column = namedtuple("Column", ("name", "index", "group", "dtype"))
+
+# one Column per feature code, in COLUMNS order
+SCHEMA = tuple(Column(feature, COLUMN_INDEX[feature], FEATURE_GROUP[feature], FEATURE_DTYPE[feature]) for feature in COLUMNS)
+
+# columns tuple -> feature code -> index, for FeatureView
+_indexes = {COLUMNS: COLUMN_INDEX}
+
+
+class FeatureView(Mapping):
+    """
+    Read-only dictionary view of one row of a feature array, nothing is copied
+
+    input :
+    - row: one row of an array from extractor.extract_array
+    - columns (default COLUMNS): feature codes of the array columns
+    """
+    def __init__(self, row, columns=COLUMNS):
+        self.row = row
+        self.columns = columns
+        if columns not in _indexes:
+            _indexes[columns] = {feature: index for index, feature in enumerate(columns)}
+        self.index = _indexes[columns]
+
+    def __getitem__(self, feature):
+        return self.row[self.index[feature]].item()
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -0,0 +1,209 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: sentences.py (Per-sentence Features)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Features of every sentence of a text from one pass over the document: one spacy call, one
+SuPar call and one lexicon lookup for all sentences. The subgroups here are sums over
+sentences, so each sentence keeps a row of additive counts; its features and those of any
+set of sentences, the whole document included, are computed from the summed rows.
+"""
+from lingfeat import models
+from lingfeat import stats
+from lingfeat.extractor import pass_text, PARSE_BATCH_SIZE
+from lingfeat.incremental import SENTENCE_GROUPS
+from lingfeat.planner import Plan, GROUP_MODELS
+from lingfeat.utils import nan_check, count_syllables
+
+import lingfeat._Syntactic.POSF as Synta_POSF
+import lingfeat._Syntactic.PhrF as Synta_PhrF
+import lingfeat._Syntactic.TrSF as Synta_TrSF
+import lingfeat._LexicoSemantic.PsyF as LxSem_PsyF
+import lingfeat._LexicoSemantic.WorF as LxSem_WorF
+import lingfeat._ShallowTraditional.ShaF as ShaTr_ShaF
+import lingfeat._ShallowTraditional.TraF as ShaTr_TraF
+
+# tags POSF counts, see POSF.from_counts
+POS_TAGS = ("NOUN", "VERB", "ADJ", "ADV", "SCONJ", "CCONJ", "NUM")
+
+# additive counts kept per sentence for each subgroup, in the order its from_totals reads them
+COUNT_COLUMNS = {
+    "PhrF": Synta_PhrF.PHRASE_LABELS,
+    "TrSF": ("tree_height", "tree_length"),
+    "POSF": POS_TAGS + ("n_doc_token",),
+    "PsyF": ("to_AAKuW_C", "to_AAKuL_C", "to_AABiL_C", "to_AABrL_C", "to_AACoL_C"),
+    "WorF": ("to_SbFrQ_C", "to_SbCDC_C", "to_SbFrL_C", "to_SbCDL_C", "to_SbSBW_C", "to_SbL1W_C", "to_SbSBC_C", "to_SbL1C_C"),
+    "ShaF": ("n_char", "n_lemma_syll"),
+    "TraF": ("n_syll", "n_word_char", "n_diff_token", "n_poly_token"),
+}
+
+# counts kept for every subgroup: token_list length, and whether the sentence has over 3 words
+# (preprocess keeps only those in sent_token_list, for SuPar and TraF)
+SHARED_COLUMNS = ("n_words", "parsed")
+
+
+class SentenceFeatures:
+    """
+    Result of extract_sentences
+
+    saves :
+    - self.sentences: text of each sentence, trailing whitespace included
+    - self.columns: feature code of each column of self.array
+    - self.array: sentences x features, each sentence scored as a text of its own
+    - self.count_columns: name of each column of self.counts
+    - self.counts: sentences x additive counts, what self.array and document() are computed from
+    """
+    def __init__(self, plan, sentences, counts, count_columns, dtype):
+        import numpy as np
+        self._plan = plan
+        self._index = {name: i for i, name in enumerate(count_columns)}
+        self.sentences = sentences
+        self.count_columns = count_columns
+        self.counts = counts
+        self.columns = plan.columns
+
+        self.array = np.empty((len(sentences), len(self.columns)), dtype=dtype)
+        for i in range(len(sentences)):
+            result = self._result(counts[i:i + 1])
+            self.array[i] = [result[feature] for feature in self.columns]
+
+    """
+    Features of a set of sentences taken as one text, added up from their count rows
+    ** with every row, the values pass_text gives for the whole document
+
+    input :
+    - rows (default None): sentence indexes, a slice or a boolean mask; every sentence if None
+
+    output (type -> dictionary):
+    - the requested features
+    """
+    def document(self, rows=None):
+        counts = self.counts if rows is None else self.counts[rows]
+        return self._result(counts)
+
+    def _result(self, counts):
+        totals = counts.sum(axis=0)
+        index = self._index
+        n_sent = 1 + len(counts)
+        n_token = 1 + int(totals[index["n_words"]])
+
+        result = {}
+        for group in self._plan.groups:
+            columns = [index[name] for name in COUNT_COLUMNS[group]]
+            group_totals = totals[columns].tolist()
+            if group == "POSF":
+                pos_counts = dict(zip(POS_TAGS, group_totals))
+                group_result = Synta_POSF.from_counts(pos_counts, group_totals[-1], n_token, n_sent)
+            elif group == "TraF":
+                # SMOG picks sentences by position among those over 3 words
+                parsed = counts[:, index["parsed"]] > 0
+                poly_counts = counts[parsed, columns[3]].tolist()
+                group_totals[3] = ShaTr_TraF.smog_poly_count(poly_counts, n_sent)
+                group_result = ShaTr_TraF.from_totals(group_totals, n_sent, n_token)
+            else:
+                group_result = _MODULES[group].from_totals(group_totals, n_token, n_sent)
+            result.update(nan_check(group_result))
+        return self._plan.select(result)
+
+
+_MODULES = {"PhrF": Synta_PhrF, "TrSF": Synta_TrSF, "PsyF": LxSem_PsyF, "WorF": LxSem_WorF, "ShaF": ShaTr_ShaF}
+
+
+"""
+Extract features of every sentence of a text, from one pass over the document
+** only subgroups that are sums over sentences: PhrF, TrSF, POSF, PsyF, WorF, ShaF, TraF
+
+input :
+- text: original input text to analyze
+- groups (default None): subgroups to extract, all of SENTENCE_GROUPS if neither groups nor features is given
+- features (default None): individual feature codes to extract, e.g. ["FleschG_S", "to_SbFrQ_C"]
+- dtype (default "float64"): dtype of the features array
+- parse_batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+
+output (type -> SentenceFeatures):
+- .array of sentences x features, and .document() for the text as a whole
+"""
+def extract_sentences(text, groups=None, features=None, dtype="float64", parse_batch_size=PARSE_BATCH_SIZE):
+    import numpy as np
+    from spacy.attrs import POS
+
+    if groups is None and features is None:
+        groups = SENTENCE_GROUPS
+    plan = Plan(groups, features)
+    others = [group for group in plan.groups if group not in SENTENCE_GROUPS]
+    if others:
+        raise ValueError("Not a sum over sentences, extract per document instead: {}".format(", ".join(others)))
+
+    pipeline = models.spacy_name(plan.stages)
+    NLP = models.get(pipeline)
+    with stats.document(text):
+        with stats.stage("spacy"):
+            NLP_doc = NLP(text)
+        LingFeat = pass_text(text, NLP_doc=NLP_doc)
+        LingFeat.pipeline = pipeline
+        LingFeat.preprocess()
+        doc_scan = LingFeat.scan()
+
+        sents = list(NLP_doc.sents)
+        n = len(sents)
+        sentences = []
+        for k, sent in enumerate(sents):
+            start = 0 if k == 0 else sent.start_char
+            end = sents[k + 1].start_char if k + 1 < n else len(text)
+            sentences.append(text[start:end])
+
+        # words and token_list lemmas of each sentence, as preprocess makes them
+        words = [[] for i in range(n)]
+        lemmas = [[] for i in range(n)]
+        for i, word, lemma in zip(doc_scan.alpha_sent, doc_scan.alpha_text, doc_scan.alpha_lemma):
+            words[i].append(word)
+            if len(word) >= 3:
+                lemmas[i].append(lemma)
+        parsed = [len(sent_words) > 3 for sent_words in words]
+
+        count_columns = SHARED_COLUMNS + tuple(name for group in plan.groups for name in COUNT_COLUMNS[group])
+        index = {name: i for i, name in enumerate(count_columns)}
+        counts = np.zeros((n, len(count_columns)), dtype=np.float64)
+        counts[:, index["n_words"]] = [len(sent_lemmas) for sent_lemmas in lemmas]
+        counts[:, index["parsed"]] = parsed
+
+        def block(group):
+            start = index[COUNT_COLUMNS[group][0]]
+            return slice(start, start + len(COUNT_COLUMNS[group]))
+
+        for group in plan.groups:
+            with stats.stage(group):
+                if group == "POSF":
+                    sent_starts = np.array([sent.start for sent in sents])
+                    sent_index = np.searchsorted(sent_starts, np.arange(len(NLP_doc)), side='right') - 1
+                    pos = NLP_doc.to_array([POS])
+                    strings = NLP_doc.vocab.strings
+                    for tag in POS_TAGS:
+                        counts[:, index[tag]] = np.bincount(sent_index[pos == strings[tag]], minlength=n)
+                    counts[:, index["n_doc_token"]] = [len(sent) for sent in sents]
+                elif group in ("PhrF", "TrSF"):
+                    # trees of sentences over 3 words, in order, from one SuPar call
+                    module = _MODULES[group]
+                    rows = [i for i in range(n) if parsed[i]]
+                    for i, parsed_tree in zip(rows, LingFeat.parse(parse_batch_size)):
+                        counts[i, block(group)] = module.tree_counts(parsed_tree)
+                elif group in ("PsyF", "WorF"):
+                    if n:
+                        counts[:, block(group)] = models.get(GROUP_MODELS[group][0]).sum_scores(lemmas)
+                elif group == "ShaF":
+                    counts[:, index["n_char"]] = [len(sentence.replace(" ", "")) for sentence in sentences]
+                    counts[:, index["n_lemma_syll"]] = [
+                        sum(count_syllables(lemma) for lemma in sent_lemmas) for sent_lemmas in lemmas]
+                elif group == "TraF":
+                    for i in range(n):
+                        if parsed[i]:
+                            counts[i, block(group)] = ShaTr_TraF.sentence_counts(words[i])
+
+    return SentenceFeatures(plan, sentences, counts, count_columns, dtype)
@@ -0,0 +1,280 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: server.py (Local HTTP Extraction Service)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+usage:
+    lingfeat serve [--port 8080] [--max-batch 64] [--max-wait-ms 5] [--max-queue 1024]
+
+endpoints:
+- POST /extract  {"text": "...", "groups": ["TraF"], "features": ["FleschG_S"]} -> {"features": {...}}
+- GET /health    -> {"status": "ok", ...}
+- GET /stats     -> request, batch and queue counters (plus lingfeat.stats and cache stats when enabled)
+
+Requests that arrive within max_wait_ms of each other, up to max_batch, are merged:
+requests for the same subgroups share one extract_many call, so spacy annotates them in
+one NLP.pipe call and SuPar parses them in one predict call. A request is never run with
+another's subgroups, so its values and cost do not depend on concurrent traffic, and a
+text that fails only fails its own request. Texts over spacy's max_length get 413
+before they are queued. The queue is bounded: when full, requests get 503 at once.
+"""
+import json
+import time
+import queue
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from lingfeat import cache
+from lingfeat import models
+from lingfeat import stats
+from lingfeat import extractor
+from lingfeat.planner import Plan
+
+log = logging.getLogger("lingfeat.server")
+
+# largest request body accepted, in bytes
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class _Job:
+    __slots__ = ("text", "plan", "done", "result", "error")
+
+    def __init__(self, text, plan):
+        self.text = text
+        self.plan = plan
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Failed:
+    # what extract_many puts in place of the result of a text that raised
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = "{}: {}".format(type(error).__name__, error)
+
+
+class Batcher:
+    """
+    Merges queued extraction jobs into batches, run on one background thread
+
+    input :
+    - max_batch (default 64): most texts in one batch
+    - max_wait_ms (default 5): how long the first job of a batch waits for company
+    - max_queue (default 1024): most jobs waiting, submit raises queue.Full past it
+    - parse_batch_size (default 5000): number of tokens SuPar puts in one tensor batch
+    """
+    def __init__(self, max_batch=64, max_wait_ms=5, max_queue=1024, parse_batch_size=extractor.PARSE_BATCH_SIZE):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.parse_batch_size = parse_batch_size
+        self.queue = queue.Queue(max_queue)
+        self.counters = {"requests": 0, "rejected": 0, "failed": 0, "batches": 0, "batched_texts": 0, "largest_batch": 0}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name="lingfeat-batcher", daemon=True)
+        self._thread.start()
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def submit(self, text, plan):
+        """Queue one text, returns a job whose done event is set once result or error is filled."""
+        job = _Job(text, plan)
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            self._count("rejected")
+            raise
+        self._count("requests")
+        return job
+
+    def stop(self):
+        self.queue.put(None)
+        self._thread.join()
+
+    def _loop(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            batch = [job]
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+            self._run(batch)
+            if stopping:
+                return
+
+    def _run(self, batch):
+        # one extract_many call per (subgroups, spacy pipeline), each job then keeps only its own columns
+        together = {}
+        for job in batch:
+            key = (job.plan.groups, models.spacy_name(job.plan.stages))
+            together.setdefault(key, []).append(job)
+        try:
+            for (groups, pipeline), jobs in together.items():
+                self._run_together(groups, jobs)
+        finally:
+            with self._lock:
+                self.counters["batches"] += 1
+                self.counters["batched_texts"] += len(batch)
+                self.counters["largest_batch"] = max(self.counters["largest_batch"], len(batch))
+            for job in batch:
+                job.done.set()
+
+    def _run_together(self, groups, jobs):
+        try:
+            results = extractor.extract_many(
+                [job.text for job in jobs], groups=list(groups),
+                batch_size=len(jobs), parse_batch_size=self.parse_batch_size, errors=_Failed)
+        except Exception:
+            # something outside any one text, run each text alone so only the ones that raise fail
+            log.exception("batch of %d texts failed, running them one by one", len(jobs))
+            results = [self._run_alone(groups, job) for job in jobs]
+        for job, result in zip(jobs, results):
+            if isinstance(result, _Failed):
+                self._count("failed")
+                job.error = result.error
+            else:
+                job.result = {feature: result[feature] for feature in job.plan.columns}
+
+    def _run_alone(self, groups, job):
+        try:
+            return extractor.extract_many(
+                [job.text], groups=list(groups), parse_batch_size=self.parse_batch_size, errors=_Failed)[0]
+        except Exception as e:
+            return _Failed(e)
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self.counters)
+        counters["queued"] = self.queue.qsize()
+        counters["mean_batch"] = counters["batched_texts"] / counters["batches"] if counters["batches"] else 0.0
+        return counters
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # set on the subclass made by ExtractionServer
+    batcher = None
+    request_timeout = None
+
+    def _reply(self, status, body, headers=()):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok", "queued": self.batcher.queue.qsize()})
+        elif self.path == "/stats":
+            body = {"server": self.batcher.snapshot()}
+            if stats.STATS.enabled:
+                body["stats"] = stats.snapshot()
+            if cache.active() is not None:
+                body["cache"] = cache.active().stats()
+            self._reply(200, body)
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/extract":
+            self._reply(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._reply(413, {"error": "request body over {} bytes".format(MAX_BODY_BYTES)})
+            return
+        try:
+            request = json.loads(self.rfile.read(length).decode('utf-8'))
+            text = request["text"]
+            if not isinstance(text, str):
+                raise ValueError("text must be a string")
+            plan = Plan(request.get("groups"), request.get("features"))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._reply(400, {"error": "bad request: {}".format(e)})
+            return
+        max_length = models.get(models.spacy_name(plan.stages)).max_length
+        if len(text) > max_length:
+            self._reply(413, {"error": "text over {} characters, spacy's max_length".format(max_length)})
+            return
+
+        try:
+            job = self.batcher.submit(text, plan)
+        except queue.Full:
+            self._reply(503, {"error": "overloaded, try again"}, headers=(("Retry-After", "1"),))
+            return
+        if not job.done.wait(self.request_timeout):
+            self._reply(504, {"error": "timed out"})
+        elif job.error is not None:
+            self._reply(500, {"error": job.error})
+        else:
+            self._reply(200, {"features": job.result})
+
+    def log_message(self, format, *args):
+        log.debug("%s - %s", self.address_string(), format % args)
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer, which needs python 3.7
+    daemon_threads = True
+    # listen backlog, so bursts reach the bounded queue and get 503 instead of a reset
+    request_queue_size = 1024
+
+
+class ExtractionServer:
+    """
+    input :
+    - host (default "127.0.0.1"), port (default 8080): address to listen on, port 0 picks a free one
+    - max_batch, max_wait_ms, max_queue, parse_batch_size: see Batcher
+    - request_timeout (default 300): seconds a request waits for its result before 504
+    - warmup_groups (default None): subgroups whose models are loaded before serving
+
+    saves :
+    - self.address: (host, port) actually listened on
+    """
+    def __init__(self, host="127.0.0.1", port=8080, max_batch=64, max_wait_ms=5, max_queue=1024,
+                 parse_batch_size=extractor.PARSE_BATCH_SIZE, request_timeout=300, warmup_groups=None):
+        if warmup_groups:
+            extractor.warmup(warmup_groups)
+        self.batcher = Batcher(max_batch, max_wait_ms, max_queue, parse_batch_size)
+        handler = type("Handler", (_Handler,), {"batcher": self.batcher, "request_timeout": request_timeout})
+        self.httpd = _ThreadingHTTPServer((host, port), handler)
+        self.address = self.httpd.server_address[:2]
+
+    def serve_forever(self):
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+            self.batcher.stop()
+
+    def shutdown(self):
+        """Stop serve_forever, from another thread."""
+        self.httpd.shutdown()
@@ -0,0 +1,216 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: stats.py (Instrumentation)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+Wall time and call count per stage (spacy, scan, preprocess, supar, each subgroup, model
+loads) and counters (documents, tokens, sentences parsed, models loaded, cache hits).
+Off by default: while disabled, stage() hands back one shared do-nothing context manager
+and count() returns at once.
+** stages can nest: a subgroup's time includes stages it triggers, e.g. PhrF the first SuPar parse
+"""
+import json
+import time
+import hashlib
+import logging
+import threading
+
+# slow documents are logged here as one JSON object per message
+slow_log = logging.getLogger("lingfeat.slow")
+
+
+class Stats:
+    """
+    saves :
+    - self.enabled
+    - self.seconds: stage -> total wall time in seconds
+    - self.calls: stage -> number of times it ran
+    - self.counters: counter -> total
+    - self.slow_seconds: documents taking longer are logged, None for no log
+    - self.callbacks: functions called with every event dictionary
+    """
+    def __init__(self):
+        self.enabled = False
+        self.slow_seconds = None
+        self.callbacks = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.seconds = {}
+            self.calls = {}
+            self.counters = {}
+
+    def snapshot(self):
+        """Copy of everything recorded so far."""
+        with self._lock:
+            return {
+                "stages": {name: {"seconds": self.seconds[name], "calls": self.calls[name]} for name in self.seconds},
+                "counters": dict(self.counters),
+            }
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def add_count(self, name, n):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def emit(self, event):
+        for callback in self.callbacks:
+            callback(event)
+
+
+STATS = Stats()
+
+# per thread: the document being timed by document(), if any
+_local = threading.local()
+
+
+def enable(callback=None, slow_ms=None):
+    """
+    Start recording
+
+    input :
+    - callback (default None): function called with an event dictionary for every stage,
+    counter and slow document, e.g. {"event": "stage", "stage": "supar", "seconds": 0.2}
+    - slow_ms (default None): single-text extractions slower than this are written to the
+    "lingfeat.slow" logger with their length and per-stage times
+    """
+    STATS.enabled = True
+    STATS.slow_seconds = None if slow_ms is None else slow_ms / 1000
+    if callback is not None and callback not in STATS.callbacks:
+        STATS.callbacks.append(callback)
+    return STATS
+
+
+def disable():
+    STATS.enabled = False
+    STATS.slow_seconds = None
+    STATS.callbacks = []
+
+
+def snapshot():
+    return STATS.snapshot()
+
+
+def reset():
+    STATS.reset()
+
+
+class _Null:
+    # shared stand-in while disabled
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL = _Null()
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def stage(name):
+    """Context manager timing one run of stage `name`."""
+    if not STATS.enabled:
+        return _NULL
+    return _Stage(name)
+
+
+def record(name, seconds):
+    STATS.add_time(name, seconds)
+    document = getattr(_local, "document", None)
+    if document is not None:
+        document["stages"][name] = document["stages"].get(name, 0.0) + seconds
+    if STATS.callbacks:
+        STATS.emit({"event": "stage", "stage": name, "seconds": seconds})
+
+
+def count(name, n=1):
+    if not STATS.enabled:
+        return
+    STATS.add_count(name, n)
+    if STATS.callbacks:
+        STATS.emit({"event": "count", "counter": name, "n": n})
+
+
+def timed_iter(name, iterable):
+    """Iterate over iterable, timing each step as stage `name`, e.g. the Docs of NLP.pipe."""
+    if not STATS.enabled:
+        return iterable
+    return _timed_iter(name, iterable)
+
+
+def _timed_iter(name, iterable):
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        record(name, time.perf_counter() - start)
+        yield item
+
+
+class _Document:
+    def __init__(self, text):
+        self.text = text
+
+    def __enter__(self):
+        _local.document = {"stages": {}, "length": {"n_chars": len(self.text)}}
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        document = _local.document
+        _local.document = None
+        record("document", seconds)
+        if STATS.slow_seconds is not None and seconds >= STATS.slow_seconds:
+            event = {"event": "slow_document", "seconds": seconds,
+                     "sha256": hashlib.sha256(self.text.encode('utf-8')).hexdigest()}
+            event.update(document["length"])
+            event["stages"] = document["stages"]
+            slow_log.warning(json.dumps(event))
+            STATS.emit(event)
+        return False
+
+
+def document(text):
+    """Context manager timing one single-text extraction, the outermost one if nested."""
+    if not STATS.enabled or getattr(_local, "document", None) is not None:
+        return _NULL
+    return _Document(text)
+
+
+def describe(**length):
+    """Add length statistics (n_tokens, n_sents, ...) to the document being timed."""
+    document = getattr(_local, "document", None)
+    if document is not None:
+        document["length"].update(length)
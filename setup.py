@@ -31,6 +31,8 @@ setup(
           'supar',
           'gensim',
           'pandas',
+          'numpy',
+          'scipy',
           'python-Levenshtein'
       ],
   classifiers=[
@@ -45,4 +47,10 @@ setup(
     'Programming Language :: Python :: 3.9',
   ],
   include_package_data=True,
+  extras_require={
+    'parquet': ['pyarrow'],
+  },
+  entry_points={
+    'console_scripts': ['lingfeat=lingfeat.cli:main'],
+  },
 )
\ No newline at end of file
@@ -0,0 +1,194 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: conftest.py (Shared Test Fixtures)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+
+The tests check that the incremental, chunked, per-sentence, batched and resumable
+paths give what extractor.extract gives for the same text. That holds whatever the
+models say, so they run on small rule-based stand-ins for en_core_web_sm, SuPar and
+the AoA lexicon: fast, deterministic, and with nothing to download.
+"""
+import math
+
+import pytest
+
+from lingfeat import models
+
+TEXTS = [
+    "The quick brown fox jumps over the lazy dog. It was a sunny day in the park, and the children played happily.",
+    "Readability assessment is hard. Some sentences are long and winding, while others are short. "
+    "This one is medium sized anyway.",
+    "Bruce lives in Seoul.\nBruce reads many books slowly because books are difficult.\n"
+    "When the weather is cold, Bruce stays inside and writes books about the weather.",
+]
+
+# subgroups computed without LDA models, which are not shipped with the source tree
+GROUPS = ["TraF", "ShaF", "POSF", "PhrF", "TrSF", "WorF", "PsyF", "TTRF", "VarF", "EnDF", "EnGF"]
+
+_POS = {
+    "the": "DET", "a": "DET", "this": "DET", "some": "DET", "many": "DET",
+    "it": "PRON", "he": "PRON", "they": "PRON", "others": "PRON", "one": "PRON",
+    "is": "AUX", "are": "AUX", "was": "AUX",
+    "and": "CCONJ", "while": "SCONJ", "because": "SCONJ", "when": "SCONJ",
+    "in": "ADP", "over": "ADP", "inside": "ADV", "anyway": "ADV",
+    "quick": "ADJ", "brown": "ADJ", "lazy": "ADJ", "sunny": "ADJ", "hard": "ADJ", "long": "ADJ",
+    "short": "ADJ", "difficult": "ADJ", "cold": "ADJ", "medium": "ADJ",
+}
+
+_AOA_WORDS = ["the", "quick", "brown", "fox", "dog", "day", "park", "children", "book", "weather",
+              "hard", "long", "short", "read", "write", "cold", "sunny", "lazy", "sentence", "difficult"]
+
+
+def _stand_in_pos(doc):
+    # rules look only inside the sentence, as chunked and incremental paths cut at sentence ends
+    for sent in doc.sents:
+        previous = None
+        for token in sent:
+            word = token.text.lower()
+            if token.is_space:
+                token.pos_ = "SPACE"
+            elif token.is_punct:
+                token.pos_ = "PUNCT"
+            elif word in _POS:
+                token.pos_ = _POS[word]
+            elif token.text[0].isupper() and previous is not None:
+                token.pos_ = "PROPN"
+            elif word.endswith("ly"):
+                token.pos_ = "ADV"
+            elif word.endswith(("s", "ed")) and previous is not None and previous.pos_ in ("NOUN", "PROPN", "PRON"):
+                token.pos_ = "VERB"
+            else:
+                token.pos_ = "NOUN"
+            token.lemma_ = word
+            if not token.is_space:
+                previous = token
+    # a flat tree per sentence, so copies of the Doc keep its sentences; entity grid roles:
+    # the first noun of a sentence is its subject, a noun after a verb its object
+    for sent in list(doc.sents):
+        root = sent[0]
+        root.dep_ = "ROOT"
+        seen_subject = False
+        for token in sent:
+            if token.i != root.i:
+                token.head = root
+                token.dep_ = "dep"
+            if token.pos_ not in ("NOUN", "PROPN", "PRON"):
+                continue
+            if not seen_subject:
+                token.dep_ = "nsubj"
+                seen_subject = True
+            elif token.i > 0 and doc[token.i - 1].pos_ == "VERB":
+                token.dep_ = "dobj"
+            else:
+                token.dep_ = "pobj"
+    return doc
+
+
+def _stand_in_spacy(senter=False):
+    import spacy
+    from spacy.language import Language
+    if not Language.has_factory("lingfeat_test_pos"):
+        Language.component("lingfeat_test_pos", func=_stand_in_pos)
+    NLP = spacy.blank("en")
+    # the senter stand-in also splits at commas, so the two splitters give different values
+    NLP.add_pipe("sentencizer", config={"punct_chars": [".", ","]} if senter else {})
+    NLP.add_pipe("lingfeat_test_pos")
+    NLP.add_pipe("entity_ruler").add_patterns(
+        [{"label": "PERSON", "pattern": "Bruce"}, {"label": "GPE", "pattern": "Seoul"}])
+    return NLP
+
+
+class _Tree:
+    # bracketed tree whose shape depends on the words of the sentence
+    def __init__(self, words):
+        self.words = words
+
+    def __str__(self):
+        leaves = []
+        for word in self.words:
+            leaf = "(_ {})".format(word)
+            if word.endswith("ly"):
+                leaf = "(ADVP {})".format(leaf)
+            elif word.lower() in _POS and _POS[word.lower()] == "ADJ":
+                leaf = "(ADJP {})".format(leaf)
+            leaves.append(leaf)
+        half = max(1, len(leaves) // 2)
+        tail = " ".join(leaves[half + 1:])
+        if len(leaves) > 8:
+            tail = "(SBAR (S {}))".format(tail)
+        if len(leaves) > 4:
+            tail = "(PP {})".format(tail)
+        return "(TOP (S (NP {}) (VP {} {})))".format(" ".join(leaves[:half]), leaves[half] if len(leaves) > 1 else "", tail)
+
+
+class _Dataset:
+    def __init__(self, sentences):
+        self.sentences = sentences
+
+
+class StandInSuPar:
+    """Counts predict calls and parsed sentences, so tests can check what was parsed."""
+    def __init__(self):
+        self.calls = 0
+        self.sentences = 0
+
+    def predict(self, data, **kwargs):
+        self.calls += 1
+        self.sentences += len(data)
+        return _Dataset([_Tree(words) for words in data])
+
+
+@pytest.fixture(scope="session")
+def aoa_path(tmp_path_factory):
+    # columns 7, 9, 11, 12 and 13 are the ones PsyF reads
+    path = tmp_path_factory.mktemp("lexicon") / "AoAKuperman.csv"
+    lines = ["Word," + ",".join("c{}".format(i) for i in range(14))]
+    for i, word in enumerate(_AOA_WORDS):
+        values = ["none" if (i + j) % 5 == 0 else "{:.2f}".format(2 + (i * 7 + j * 3) % 13) for j in range(14)]
+        lines.append(word + "," + ",".join(values))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stand_in_models(aoa_path):
+    from lingfeat._LexicoSemantic.lexicon import Lexicon
+    saved_loaders = dict(models._loaders)
+    saved_spacy_loader = models._spacy_loader
+    models.evict()
+
+    parser = StandInSuPar()
+    models._loaders["spacy"] = _stand_in_spacy
+    models._loaders["supar"] = lambda: parser
+    models._loaders["lexicon/aoakuperman"] = lambda: Lexicon(aoa_path, 'Word', (7, 9, 11, 12, 13))
+    models._spacy_loader = lambda components: lambda: _stand_in_spacy("senter" in components)
+    for name in list(models._loaders):
+        if name.startswith("spacy/"):
+            models._loaders[name] = models._spacy_loader(models.pipeline_components(name))
+    yield parser
+
+    models.evict()
+    models._loaders.clear()
+    models._loaders.update(saved_loaders)
+    models._spacy_loader = saved_spacy_loader
+
+
+@pytest.fixture
+def supar(stand_in_models):
+    stand_in_models.calls = 0
+    stand_in_models.sentences = 0
+    return stand_in_models
+
+
+def assert_same(result, expected):
+    assert sorted(result) == sorted(expected)
+    different = [feature for feature in expected
+                 if not math.isclose(result[feature], expected[feature], rel_tol=1e-9, abs_tol=1e-9)]
+    assert not different, {feature: (result[feature], expected[feature]) for feature in different}
@@ -0,0 +1,168 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: test_cli.py (Command Line Interface checkpoint and resume)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import csv
+import json
+import math
+import multiprocessing
+
+import pytest
+
+from conftest import TEXTS, assert_same
+from lingfeat import cli
+from lingfeat import extractor
+
+GROUPS = ["TraF", "POSF", "TTRF"]
+TEXT_LIST = [TEXTS[i % len(TEXTS)] + " Number {} is here.".format(i) for i in range(25)]
+# an empty text makes TTRF divide by zero
+FAILING = 7
+TEXT_LIST[FAILING] = ""
+
+
+def _read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def _check_rows(rows, texts):
+    assert [int(row["index"]) for row in rows] == list(range(len(texts)))
+    for row, text in zip(rows, texts):
+        if row["error"]:
+            assert math.isnan(float(row["FleschG_S"]))
+            continue
+        expected = extractor.extract(text, GROUPS)
+        assert_same({feature: float(row[feature]) for feature in expected}, expected)
+
+
+@pytest.fixture
+def jsonl(tmp_path):
+    path = tmp_path / "in.jsonl"
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, text in enumerate(TEXT_LIST):
+            f.write(json.dumps({"id": "d{}".format(i), "text": text}) + "\n")
+    return str(path)
+
+
+def _extract(input_path, output_path, *options):
+    cli.main(["extract", input_path, output_path, "--groups", ",".join(GROUPS), "--batch-size", "4",
+              "--commit-every", "5", "--quiet"] + list(options))
+
+
+def test_failing_text_gets_error_row(jsonl, tmp_path):
+    output = str(tmp_path / "out.csv")
+    _extract(jsonl, output, "--id-field", "id")
+    rows = _read_rows(output)
+    assert [row["id"] for row in rows] == ["d{}".format(i) for i in range(len(TEXT_LIST))]
+    assert [i for i, row in enumerate(rows) if row["error"]] == [FAILING]
+    _check_rows(rows, TEXT_LIST)
+
+
+def test_killed_run_resumes_from_checkpoint(jsonl, tmp_path, monkeypatch):
+    output = str(tmp_path / "out.csv")
+    extract_many = extractor.extract_many
+    calls = []
+    def dying(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        return extract_many(*args, **kwargs)
+    monkeypatch.setattr(extractor, "extract_many", dying)
+    with pytest.raises(KeyboardInterrupt):
+        _extract(jsonl, output, "--id-field", "id")
+    with open(output + ".checkpoint", encoding='utf-8') as f:
+        done = json.load(f)["done"]
+    # three batches of 4 ran, only the first 10 texts were committed
+    assert done == 10
+
+    monkeypatch.setattr(extractor, "extract_many", extract_many)
+    _extract(jsonl, output, "--id-field", "id")
+    rows = _read_rows(output)
+    assert [row["id"] for row in rows] == ["d{}".format(i) for i in range(len(TEXT_LIST))]
+    _check_rows(rows, TEXT_LIST)
+
+    # a finished run starts nothing again
+    _extract(jsonl, output, "--id-field", "id")
+    assert _read_rows(output) == rows
+
+
+def test_resume_refuses_other_columns(jsonl, tmp_path):
+    output = str(tmp_path / "out.csv")
+    _extract(jsonl, output)
+    with pytest.raises(SystemExit):
+        cli.main(["extract", jsonl, output, "--features", "FleschG_S", "--quiet"])
+
+
+def test_csv_fields_over_default_limit(tmp_path):
+    path = tmp_path / "in.csv"
+    texts = [TEXT_LIST[0], " ".join([TEXT_LIST[1]] * 1500), TEXT_LIST[2]]
+    assert len(texts[1]) > 131072
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["text"])
+        writer.writerows([text] for text in texts)
+    output = str(tmp_path / "out.csv")
+    _extract(str(path), output)
+    rows = _read_rows(output)
+    assert len(rows) == 3
+    assert not any(row["error"] for row in rows)
+    assert float(rows[0]["FleschG_S"]) == pytest.approx(extractor.extract(texts[0], GROUPS)["FleschG_S"])
+
+
+def test_text_lines_with_a_blank_line(tmp_path):
+    path = tmp_path / "in.txt"
+    path.write_text("\n".join([TEXT_LIST[0], "", TEXT_LIST[1]]) + "\n", encoding='utf-8')
+    output = str(tmp_path / "out.csv")
+    _extract(str(path), output)
+    rows = _read_rows(output)
+    assert [bool(row["error"]) for row in rows] == [False, True, False]
+
+
+def test_texts_spacy_refuses_get_error_rows(tmp_path):
+    # a line over spacy's max_length and a JSONL null text fail alone, and the run commits them
+    path = tmp_path / "in.txt"
+    path.write_text("\n".join([TEXT_LIST[0], "word " * 250000, TEXT_LIST[1]]) + "\n", encoding='utf-8')
+    output = str(tmp_path / "out.csv")
+    _extract(str(path), output)
+    rows = _read_rows(output)
+    assert "max_length" in rows[1]["error"]
+    _check_rows(rows, [TEXT_LIST[0], None, TEXT_LIST[1]])
+    with open(output + ".checkpoint", encoding='utf-8') as f:
+        assert json.load(f)["done"] == 3
+
+    path = tmp_path / "in.jsonl"
+    path.write_text("\n".join(json.dumps({"text": text}) for text in [TEXT_LIST[0], None, TEXT_LIST[1]]) + "\n",
+                    encoding='utf-8')
+    output = str(tmp_path / "out2.csv")
+    _extract(str(path), output)
+    rows = _read_rows(output)
+    assert rows[1]["error"].startswith("TypeError")
+    _check_rows(rows, [TEXT_LIST[0], None, TEXT_LIST[1]])
+
+
+def test_workers_keep_going_past_failing_texts(tmp_path):
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("workers see the stand-in models only when forked")
+    path = tmp_path / "in.jsonl"
+    texts = [TEXT_LIST[0], None, "word " * 250000, TEXT_LIST[1]]
+    path.write_text("\n".join(json.dumps({"text": text}) for text in texts) + "\n", encoding='utf-8')
+    output = str(tmp_path / "out.csv")
+    _extract(str(path), output, "--workers", "2")
+    rows = _read_rows(output)
+    assert [bool(row["error"]) for row in rows] == [False, True, True, False]
+    _check_rows(rows, texts)
+
+
+def test_resume_refuses_other_sentence_splitter(jsonl, tmp_path):
+    output = str(tmp_path / "out.csv")
+    _extract(jsonl, output, "--sentence-splitter", "senter")
+    with pytest.raises(SystemExit):
+        _extract(jsonl, output)
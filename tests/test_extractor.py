@@ -0,0 +1,58 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: test_extractor.py (Batch extraction and per-text failures)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import math
+
+import numpy as np
+import pytest
+
+from conftest import TEXTS, assert_same
+from lingfeat import extractor
+
+GROUPS = ["TraF", "POSF", "TTRF"]
+# over spacy's default max_length of 1,000,000 characters
+TOO_LONG = "word " * 250000
+
+
+def test_many_matches_extract():
+    results = extractor.extract_many(TEXTS, GROUPS, batch_size=2)
+    for text, result in zip(TEXTS, results):
+        assert_same(result, extractor.extract(text, GROUPS))
+
+
+def test_texts_spacy_refuses_fail_alone():
+    texts = [TEXTS[0], TOO_LONG, TEXTS[1], None, TEXTS[2]]
+    results = extractor.extract_many(texts, GROUPS, batch_size=2, errors="nan")
+    for i in (1, 3):
+        assert all(math.isnan(value) for value in results[i].values())
+    for i in (0, 2, 4):
+        assert_same(results[i], extractor.extract(texts[i], GROUPS))
+
+    errors = []
+    results = extractor.extract_many(texts, GROUPS, errors=errors.append)
+    assert [type(error) for error in errors] == [ValueError, TypeError]
+    assert extractor.extract_many(texts, GROUPS, errors="skip")[1::2] == [None, None]
+
+
+def test_texts_spacy_refuses_raise():
+    with pytest.raises(ValueError):
+        extractor.extract_many([TEXTS[0], TOO_LONG], GROUPS)
+    with pytest.raises(TypeError):
+        extractor.extract_many([None], GROUPS)
+    with pytest.raises(ValueError):
+        extractor.extract(TOO_LONG, GROUPS)
+
+
+def test_array_row_of_failing_text():
+    array, columns = extractor.extract_array([TEXTS[0], None, TEXTS[1]], GROUPS, errors="nan")
+    assert np.isnan(array[1]).all()
+    assert not np.isnan(array[[0, 2]]).any()
@@ -0,0 +1,74 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: test_incremental.py (IncrementalDocument against extract)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import pytest
+
+from conftest import GROUPS, TEXTS, assert_same
+from lingfeat import extractor
+from lingfeat.incremental import IncrementalDocument
+
+BASE = " ".join(TEXTS * 3)
+
+
+def _edits():
+    # replace, insert, delete, append, prepend, then back to where it started
+    text = BASE.replace("sunny", "rather cloudy", 1)
+    yield text
+    text = text[:100] + " Inserted sentence goes right here now. " + text[100:]
+    yield text
+    text = text.replace("Readability assessment is hard. ", "", 1)
+    yield text
+    text = text + " And a final appended sentence for good measure."
+    yield text
+    text = "Brand new start sentence that is long. " + text
+    yield text
+    yield "Tiny sentence here now. And another one."
+    yield BASE
+
+
+def test_first_text_matches_extract():
+    document = IncrementalDocument(BASE)
+    assert "".join(document.sentences) == BASE
+    assert_same(document.extract(GROUPS), extractor.extract(BASE, GROUPS))
+
+
+def test_every_edit_matches_extract():
+    document = IncrementalDocument(BASE)
+    document.extract(GROUPS)
+    for text in _edits():
+        document.update(text)
+        assert "".join(document.sentences) == text
+        assert_same(document.extract(GROUPS), extractor.extract(text, GROUPS))
+
+
+def test_small_edit_parses_only_around_it(supar):
+    document = IncrementalDocument(BASE)
+    document.extract(["PhrF", "TrSF"])
+    supar.sentences = 0
+    annotated = document.update(BASE.replace("sunny", "rather cloudy", 1))
+    assert annotated < len(document)
+    document.extract(["PhrF", "TrSF"])
+    assert supar.sentences == 1
+
+
+def test_features_and_repeated_extract():
+    document = IncrementalDocument(BASE)
+    features = ["FleschG_S", "to_NoTag_C"]
+    expected = extractor.extract(BASE, features=features)
+    assert document.extract(features=features) == document.extract(features=features)
+    assert_same(document.extract(features=features), expected)
+
+
+def test_pruned_pipeline_refuses_other_groups():
+    document = IncrementalDocument(BASE, groups=["TraF"])
+    with pytest.raises(ValueError):
+        document.extract(["POSF"])
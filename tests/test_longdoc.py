@@ -0,0 +1,55 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: test_longdoc.py (extract_long against extract)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import io
+
+import pytest
+
+from conftest import GROUPS, TEXTS, assert_same
+from lingfeat import extractor
+from lingfeat.longdoc import chunks, extract_long
+
+SENTENCES = [sentence.strip() for text in TEXTS for sentence in text.replace("\n", " ").split(". ")]
+SENTENCES = [sentence if sentence.endswith(".") else sentence + "." for sentence in SENTENCES] * 6
+
+
+def _pieces(text, size=7):
+    return (text[i:i + size] for i in range(0, len(text), size))
+
+
+@pytest.mark.parametrize("chunk_chars", [300, 1000, 100000])
+def test_paragraphs_match_extract(chunk_chars):
+    text = "\n\n".join(TEXTS * 8)
+    assert "".join(chunks(text, chunk_chars)) == text
+    assert_same(extract_long(text, GROUPS, chunk_chars=chunk_chars), extractor.extract(text, GROUPS))
+
+
+@pytest.mark.parametrize("separator", [" ", "\n", "  ", " \n"])
+@pytest.mark.parametrize("chunk_chars", [200, 700])
+def test_cuts_inside_whitespace_match_extract(separator, chunk_chars):
+    # chunks end at sentence ends, and the whitespace after them arrives split across pieces
+    text = separator.join(SENTENCES)
+    assert "".join(chunks(_pieces(text), chunk_chars)) == text
+    assert len(list(chunks(text, chunk_chars))) > 1
+    assert_same(extract_long(_pieces(text), GROUPS, chunk_chars=chunk_chars), extractor.extract(text, GROUPS))
+
+
+def test_file_source_and_features():
+    text = "\n".join(SENTENCES)
+    features = ["FleschG_S", "to_NoTag_C", "SimpTTR_S"]
+    result = extract_long(io.StringIO(text), features=features, chunk_chars=250)
+    assert_same(result, extractor.extract(text, features=features))
+
+
+def test_cut_without_whitespace():
+    text = "x" * 1000
+    assert [len(chunk) for chunk in chunks(text, 300)] == [300, 300, 300, 100]
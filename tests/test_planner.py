@@ -0,0 +1,78 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: test_planner.py (Pruned spacy pipelines and sentence splitters)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import pytest
+
+from conftest import GROUPS, TEXTS, assert_same
+from lingfeat import cache
+from lingfeat import extractor
+from lingfeat import models
+from lingfeat.planner import Plan
+
+TEXT = " ".join(TEXTS)
+
+
+@pytest.mark.parametrize("group", GROUPS)
+def test_default_sentences_come_from_the_parser_for_any_group(group):
+    components = models.spacy_components(Plan([group]).stages)
+    assert {"tok2vec", "parser"} <= components
+    assert "senter" not in components
+
+
+def test_default_values_do_not_depend_on_other_groups():
+    everything = extractor.extract(TEXT, GROUPS)
+    for group in GROUPS:
+        result = extractor.extract(TEXT, [group])
+        assert_same(result, {feature: everything[feature] for feature in result})
+    assert_same(extractor.extract(TEXT, ["TraF", "POSF"], features=["to_EntiM_C"]),
+                {feature: everything[feature] for feature in Plan(["TraF", "POSF"], ["to_EntiM_C"]).columns})
+
+
+def test_senter_is_an_other_pipeline():
+    shallow = Plan(["TraF", "ShaF"], sentence_splitter="senter")
+    assert models.spacy_components(shallow.stages) >= {"senter"}
+    assert "parser" not in models.spacy_components(shallow.stages)
+    without_engf = [group for group in GROUPS if group != "EnGF"]
+    for groups in (["TraF"], ["POSF", "EnDF"], without_engf):
+        default = models.spacy_name(Plan(groups).stages)
+        senter = models.spacy_name(Plan(groups, sentence_splitter="senter").stages)
+        assert default != senter
+        assert "senter" in models.pipeline_components(senter)
+        assert "parser" not in models.pipeline_components(senter)
+    with pytest.raises(ValueError):
+        Plan(["TraF"], sentence_splitter="sentencizer")
+    # the parser EnGF needs would split the senter's sentences again
+    with pytest.raises(ValueError):
+        Plan(["TraF", "EnGF"], sentence_splitter="senter")
+
+
+def test_senter_values_are_their_own(tmp_path):
+    cache.enable(str(tmp_path / "cache.sqlite"))
+    try:
+        default = extractor.extract(TEXT, ["TraF"])
+        senter = extractor.extract(TEXT, ["TraF"], sentence_splitter="senter")
+        # cached under another pipeline, neither is served for the other
+        assert senter != default
+        assert extractor.extract(TEXT, ["TraF"]) == default
+        assert extractor.extract_many([TEXT], ["TraF"], sentence_splitter="senter") == [senter]
+    finally:
+        cache.disable()
+
+
+def test_stored_annotations_keep_their_splitter(tmp_path):
+    from lingfeat.annotations import AnnotationStore
+    store = AnnotationStore(str(tmp_path / "annotations"))
+    extractor.extract_many([TEXT], ["TraF"], store=store, sentence_splitter="senter")
+    assert [result for text, result in extractor.extract_stored(store, ["TraF"], sentence_splitter="senter")] \
+        == [extractor.extract(TEXT, ["TraF"], sentence_splitter="senter")]
+    with pytest.raises(ValueError):
+        list(extractor.extract_stored(store, ["TraF"]))
@@ -0,0 +1,66 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: test_sentences.py (extract_sentences against extract)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import numpy as np
+import pytest
+
+from conftest import TEXTS, assert_same
+from lingfeat import extractor
+from lingfeat.sentences import SENTENCE_GROUPS, extract_sentences
+
+GROUPS = list(SENTENCE_GROUPS)
+TEXT = " ".join(TEXTS * 3) + "\n\nShort one. Yet another sentence with many words in it for SMOG."
+
+
+@pytest.fixture(scope="module")
+def result():
+    return extract_sentences(TEXT, GROUPS)
+
+
+def test_sentences_join_back(result):
+    assert "".join(result.sentences) == TEXT
+    assert result.array.shape == (len(result.sentences), len(result.columns))
+    assert result.counts.shape == (len(result.sentences), len(result.count_columns))
+
+
+def test_document_matches_extract(result):
+    assert_same(result.document(), extractor.extract(TEXT, GROUPS))
+
+
+def test_each_sentence_matches_extract(result):
+    for sentence, row in zip(result.sentences, result.array):
+        assert_same(dict(zip(result.columns, row.tolist())), extractor.extract(sentence, GROUPS))
+
+
+def test_rows_match_extract_of_their_text(result):
+    assert_same(result.document(slice(2, 5)), extractor.extract("".join(result.sentences[2:5]), GROUPS))
+    mask = np.zeros(len(result.sentences), dtype=bool)
+    mask[:4] = True
+    assert_same(result.document(mask), extractor.extract("".join(result.sentences[:4]), GROUPS))
+
+
+def test_one_parse_call(supar):
+    extract_sentences(TEXT, ["PhrF", "TrSF"])
+    assert supar.calls == 1
+
+
+def test_features_and_dtype():
+    features = ["FleschG_S", "to_SbFrQ_C"]
+    result = extract_sentences(TEXT, features=features, dtype="float32")
+    assert sorted(result.columns) == sorted(features)
+    assert result.array.dtype == np.float32
+    assert_same(result.document(), extractor.extract(TEXT, features=features))
+
+
+def test_groups_not_summed_over_sentences():
+    with pytest.raises(ValueError):
+        extract_sentences(TEXT, ["TTRF"])
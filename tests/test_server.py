@@ -0,0 +1,151 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: test_server.py (Batched serving against extract)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import TEXTS, assert_same
+from lingfeat import extractor
+from lingfeat.planner import Plan
+from lingfeat.server import Batcher, ExtractionServer
+
+TEXT_LIST = [TEXTS[i % len(TEXTS)] + " Number {} is here.".format(i) for i in range(12)]
+REQUESTS = [
+    (["TraF"], None),
+    (["TraF", "POSF", "PhrF"], None),
+    (None, ["to_NoTag_C", "FleschG_S"]),
+    (["WorF", "TTRF"], None),
+]
+
+
+@pytest.fixture
+def batcher():
+    # a long wait, so every job submitted in a loop lands in the same batch
+    batcher = Batcher(max_batch=64, max_wait_ms=500)
+    yield batcher
+    batcher.stop()
+
+
+def test_batch_matches_extract(batcher, monkeypatch):
+    calls = []
+    extract_many = extractor.extract_many
+    def counting(texts, groups=None, *args, **kwargs):
+        calls.append(tuple(groups))
+        return extract_many(texts, groups, *args, **kwargs)
+    monkeypatch.setattr(extractor, "extract_many", counting)
+
+    jobs = []
+    for i, text in enumerate(TEXT_LIST):
+        groups, features = REQUESTS[i % len(REQUESTS)]
+        jobs.append((batcher.submit(text, Plan(groups, features)), text, groups, features))
+    for job, text, groups, features in jobs:
+        assert job.done.wait(60)
+        assert job.error is None
+        assert_same(job.result, extractor.extract(text, groups, features))
+
+    # one extract_many call per distinct subgroup set, each only with its own subgroups
+    assert batcher.snapshot()["batches"] == 1
+    assert sorted(calls) == sorted({Plan(groups, features).groups for groups, features in REQUESTS})
+
+
+def test_failing_text_fails_alone(batcher):
+    plan = Plan(["TraF", "TTRF"])
+    texts = [TEXT_LIST[0], "", TEXT_LIST[1]]
+    jobs = [batcher.submit(text, plan) for text in texts]
+    for job in jobs:
+        assert job.done.wait(60)
+    assert jobs[1].error is not None and jobs[1].result is None
+    assert_same(jobs[0].result, extractor.extract(texts[0], ["TraF", "TTRF"], None))
+    assert_same(jobs[2].result, extractor.extract(texts[2], ["TraF", "TTRF"], None))
+    assert batcher.snapshot()["failed"] == 1
+
+
+def test_over_long_text_fails_alone(batcher):
+    plan = Plan(["TraF"])
+    texts = [TEXT_LIST[0], "word " * 250000, TEXT_LIST[1]]
+    jobs = [batcher.submit(text, plan) for text in texts]
+    for job in jobs:
+        assert job.done.wait(60)
+    assert "max_length" in jobs[1].error
+    assert_same(jobs[0].result, extractor.extract(texts[0], ["TraF"]))
+    assert_same(jobs[2].result, extractor.extract(texts[2], ["TraF"]))
+
+
+def test_batch_error_fails_only_its_text(batcher, monkeypatch):
+    # an error the batch call raises as a whole is retried text by text
+    extract_many = extractor.extract_many
+    def failing(texts, *args, **kwargs):
+        if "boom" in texts:
+            raise RuntimeError("boom")
+        return extract_many(texts, *args, **kwargs)
+    monkeypatch.setattr(extractor, "extract_many", failing)
+    plan = Plan(["TraF"])
+    jobs = [batcher.submit(text, plan) for text in [TEXT_LIST[0], "boom", TEXT_LIST[1]]]
+    for job in jobs:
+        assert job.done.wait(60)
+    assert jobs[1].error == "RuntimeError: boom"
+    assert_same(jobs[0].result, extractor.extract(TEXT_LIST[0], ["TraF"]))
+    assert_same(jobs[2].result, extractor.extract(TEXT_LIST[1], ["TraF"]))
+
+
+@pytest.fixture
+def server():
+    server = ExtractionServer(port=0, max_batch=16, max_wait_ms=50)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield "http://{}:{}".format(*server.address)
+    server.shutdown()
+    thread.join()
+
+
+def _post(url, body):
+    request = urllib.request.Request(url + "/extract", data=json.dumps(body).encode('utf-8'),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_concurrent_requests(server):
+    bodies = []
+    for i, text in enumerate(TEXT_LIST):
+        groups, features = REQUESTS[i % len(REQUESTS)]
+        bodies.append({"text": text, "groups": groups, "features": features})
+    bodies.append({"text": "", "groups": ["TraF", "TTRF"]})
+    with ThreadPoolExecutor(len(bodies)) as pool:
+        replies = list(pool.map(lambda body: _post(server, body), bodies))
+
+    for body, (status, reply) in zip(bodies[:-1], replies):
+        assert status == 200
+        assert_same(reply["features"], extractor.extract(body["text"], body["groups"], body["features"]))
+    assert replies[-1][0] == 500 and "error" in replies[-1][1]
+
+
+def test_over_long_text_next_to_a_good_one(server):
+    bodies = [{"text": TEXT_LIST[0], "groups": ["TraF"]}, {"text": "word " * 250000, "groups": ["TraF"]}]
+    with ThreadPoolExecutor(len(bodies)) as pool:
+        replies = list(pool.map(lambda body: _post(server, body), bodies))
+    assert replies[0][0] == 200
+    assert_same(replies[0][1]["features"], extractor.extract(TEXT_LIST[0], ["TraF"]))
+    assert replies[1][0] == 413
+
+
+def test_bad_requests(server):
+    assert _post(server, {"text": "x", "groups": ["nope"]})[0] == 400
+    assert _post(server, {"nottext": 1})[0] == 400
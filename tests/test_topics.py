@@ -0,0 +1,119 @@
+# -*- coding: UTF-8 -*-
+"""
+Software: LingFeat - Comprehensive Linguistic Features for Readability Assessment
+Page: test_topics.py (Topic inference of WoKF, WBKF and OSKF)
+License: CC-BY-SA 4.0
+
+Original Author: Bruce W. Lee (이웅성) @brucewlee
+Affiliation 1: LXPER AI, Seoul, South Korea
+Affiliation 2: University of Pennsylvania, PA, USA
+Contributing Author: -
+Affiliation : -
+"""
+import re
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from conftest import TEXTS
+from lingfeat import extractor
+from lingfeat import models
+from lingfeat._AdvancedSemantic import OSKF, WBKF, WoKF, topics
+
+# topics of the stand-in model registered under each of models.LDA_N_TOPICS, all different
+N_TOPICS = dict(zip(models.LDA_N_TOPICS, (3, 4, 5, 6)))
+
+DOCUMENTS = [[word for word in re.findall(r"[a-z]+", sentence.lower()) if len(word) >= 3]
+             for text in TEXTS for sentence in re.split(r"[.\n]", text) if sentence.strip()]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def lda_models():
+    # tiny LDA models in place of the shipped ones, converged tightly so inference
+    # ends at the same point whichever random gamma it starts from
+    from gensim.corpora import Dictionary
+    from gensim.models import LdaModel
+    dictionary = Dictionary(DOCUMENTS)
+    corpus = [dictionary.doc2bow(document) for document in DOCUMENTS]
+    names = {models.lda_name(name, n_topic): n_topic for name in models.LDA_CORPORA for n_topic in models.LDA_N_TOPICS}
+    saved = {name: models._loaders[name] for name in names}
+    models.evict(list(names))
+    for seed, (name, n_topic) in enumerate(names.items()):
+        lda = LdaModel(corpus, id2word=dictionary, num_topics=N_TOPICS[n_topic], random_state=seed, passes=5)
+        lda.gamma_threshold = 1e-12
+        lda.iterations = 10000
+        models._loaders[name] = lambda lda=lda: lda
+    yield
+    models.evict(list(names))
+    models._loaders.update(saved)
+
+
+def _close(a, b, rel=1e-6):
+    assert len(a) == len(b)
+    for x, y in zip(a, b):
+        assert x == pytest.approx(y, rel=rel, abs=1e-9)
+
+
+@pytest.mark.parametrize("module", [WoKF, WBKF, OSKF])
+def test_retrieve_many_matches_retrieve(module):
+    results = module.retrieve_many(DOCUMENTS)
+    for document, result in zip(DOCUMENTS, results):
+        expected = module.retrieve(document)
+        assert sorted(result) == sorted(expected)
+        _close([result[feature] for feature in sorted(result)], [expected[feature] for feature in sorted(result)])
+
+
+def test_distributions_match_get_document_topics():
+    lda = models.get(models.lda_name("enwiki", models.LDA_N_TOPICS[0]))
+    array = topics.topic_distributions(lda, DOCUMENTS)
+    for document, row in zip(DOCUMENTS, array):
+        expected = lda.get_document_topics(lda.id2word.doc2bow(document), minimum_probability=0)
+        _close(row.tolist(), [probability for topic, probability in expected])
+
+
+def test_unknown_and_empty_documents_are_uniform():
+    lda = models.get(models.lda_name("weebit", models.LDA_N_TOPICS[1]))
+    array = topics.topic_distributions(lda, [["zzzunknown", "qqqnever"], []])
+    assert np.allclose(array, 1 / lda.num_topics)
+    assert topics.topic_distributions(lda, []).shape == (0, lda.num_topics)
+    for module in (WoKF, WBKF, OSKF):
+        module.retrieve([])
+        module.retrieve(["zzzunknown"])
+
+
+def test_counts_give_what_token_lists_give():
+    # longdoc passes token -> count mappings instead of token lists
+    token_list = [token for document in DOCUMENTS for token in document]
+    lda = models.get(models.lda_name("onestop", models.LDA_N_TOPICS[2]))
+    assert topics.bag_of_words(lda, Counter(token_list)) == topics.bag_of_words(lda, token_list)
+    _close(topics.probability_lists("onestop", [Counter(token_list)])[0][2],
+           topics.probability_lists("onestop", [token_list])[0][2])
+
+
+def test_each_list_holds_only_its_models_topics():
+    for corpus in models.LDA_CORPORA:
+        arrays = topics.distributions(corpus, DOCUMENTS)
+        for i, lists in enumerate(topics.probability_lists(corpus, DOCUMENTS)):
+            assert len(lists) == len(models.LDA_N_TOPICS)
+            for n_topic, probability_list in zip(models.LDA_N_TOPICS, lists):
+                lda = models.get(models.lda_name(corpus, n_topic))
+                row = arrays[n_topic][i]
+                assert len(row) == N_TOPICS[n_topic]
+                expected = sorted((p for p in row.tolist() if p >= max(lda.minimum_probability, 1e-8)), reverse=True)
+                _close(probability_list, expected)
+                assert sum(probability_list) <= 1 + 1e-6
+    # asking again gives the same lists, nothing carries over from call to call
+    _close(topics.probability_lists("enwiki", DOCUMENTS[:1])[0][3],
+           topics.probability_lists("enwiki", DOCUMENTS[:1])[0][3])
+
+
+def test_batched_extraction_matches_extract():
+    groups = ["WoKF", "WBKF", "OSKF"]
+    results = extractor.extract_many(TEXTS, groups, batch_size=2)
+    for text, result in zip(TEXTS, results):
+        expected = extractor.extract(text, groups)
+        assert sorted(result) == sorted(expected)
+        # gensim infers in float32, a text in another batch can move in the last digits
+        _close([result[feature] for feature in sorted(result)], [expected[feature] for feature in sorted(result)],
+               rel=1e-5)